@@ -6,6 +6,9 @@ config = Config('flexx', '~appdata/.flexx.cfg',
         # General
         log_level=('info', str, 'The log level to use (DEBUG, INFO, WARNING, ERROR)'),
         browser_stacktrace=(True, bool, 'Show server stack traces in browser window'),
+        production=(False, bool, 'Production mode: skip checks and debug '
+                    'logging that are only useful during development, both in '
+                    'Python and JS. Applied when the server starts.'),
 
         # flexx.app
         hostname=('localhost', str, 'The default hostname to serve apps.'),
@@ -14,9 +17,29 @@ config = Config('flexx', '~appdata/.flexx.cfg',
                         'values to pass cross-origin checks.'),
         ws_timeout=(20, int, 'If the websocket is idle for this amount of seconds, '
                  'it is closed.'),
+        ws_resume_grace=(0, int, 'The number of seconds that a session is kept '
+                         'alive after its websocket is lost, so that the client '
+                         'can reconnect and resume. Zero means no resuming.'),
+        ws_resume_buffer=(1000, int, 'The maximum number of sent commands to keep '
+                          'for replay when a session resumes.'),
         ssl_certfile=('', str, 'The cert file for https server.'),
         ssl_keyfile=('', str, 'The key file for https server.'),
         cookie_secret=('flexx_secret', str, 'The secret key to encode cookies.'),
+        data_memory_limit=(0, int, 'The maximum number of bytes of served data '
+                           'to keep in memory. Least recently used data is '
+                           'spilled to a temporary directory. Zero means no limit.'),
+        gc_policy=('full', str, 'The garbage collection to do when a session '
+                   'closes: "full", "young" (generation 0 and 1 only), '
+                   '"batched" (one full collection for multiple sessions, '
+                   'when idle), or "never".'),
+        gc_interval=(10.0, float, 'For the "batched" gc_policy: the minimum '
+                     'number of seconds between full collections.'),
+        gc_sessions=(100, int, 'For the "batched" gc_policy: collect as soon '
+                     'as this many sessions have closed since the last '
+                     'collection, regardless of gc_interval.'),
+        loop_time_budget=(0.0, float, 'The maximum number of seconds that an '
+                          'event loop iteration spends on actions and reactions '
+                          'before yielding to the server. Zero means no limit.'),
 
         # flexx.webruntime
         webruntime=('', str, 'The default web runtime to use. '
@@ -6,6 +6,7 @@ import io
 import os
 import sys
 import time
+import asyncio
 import weakref
 import zipfile
 from base64 import encodebytes
@@ -17,6 +18,7 @@ from .. import config, event
 from ._component2 import PyComponent, JsComponent
 from ._server import current_server
 from ._session import Session, get_page_for_export
+from ._gcpolicy import gc_policy
 from ._assetstore import assets
 from . import logger
 
@@ -58,6 +60,7 @@ class App:
         self.kwargs = kwargs
         self._path = cls.__name__  # can be overloaded by serve()
         self._is_served = False
+        self._prewarm = 0  # can be set by serve()
 
         # Handle good defaults
         if hasattr(cls, 'title') and self.kwargs.get('title', None) is None:
@@ -115,7 +118,7 @@ class App:
         """
         return self._path or '__main__'
 
-    def serve(self, name=None):
+    def serve(self, name=None, prewarm=0):
         """ Start serving this app.
 
         This registers the given class with the internal app manager. The
@@ -125,12 +128,18 @@ class App:
             name (str, optional): the relative URL path to serve the app on.
                 If this is ``''`` (the empty string), this will be the main app.
                 If not given or None, the name of the component class is used.
+            prewarm (int): the number of sessions to keep instantiated in
+                advance, so that the page can be served instantly. The pool is
+                refilled in the background. Note that the request and cookies
+                are set on the session only after the app is instantiated.
+                Default 0.
         """
         # Note: this talks to the manager; it has nothing to do with the server
         if self._is_served:
             raise RuntimeError('This app (%s) is already served.' % self.name)
         if name is not None:
             self._path = name
+        self._prewarm = int(prewarm)
         manager.register_app(self)
         self._is_served = True
 
@@ -472,6 +481,11 @@ class AppManager(event.Component):
         self._appinfo = {}
         self._session_map = weakref.WeakValueDictionary()
         self._last_check_time = time.time()
+        # id -> (session, timer) - sessions that await a resume from the client
+        self._lost_sessions = {}
+        # name -> list of pre-instantiated sessions, and stats on these pools
+        self._pools = {}
+        self._pool_stats = {}
 
     def register_app(self, app):
         """ Register an app (an object that wraps a Component class plus init args).
@@ -488,6 +502,14 @@ class AppManager(event.Component):
             if app.cls is not old_app.cls:  # if app is not old_app:
                 logger.warning('Re-defining app class %r' % name)
         self._appinfo[name] = app, pending, connected
+        # (Re)create the pool of pre-instantiated sessions
+        for session in self._pools.pop(name, []):
+            session.close()
+        if app._prewarm > 0:
+            self._pools[name] = []
+            self._pool_stats[name] = dict(target=app._prewarm, hits=0, misses=0,
+                                          refills=0, refill_time=0.0)
+            self._schedule_refill(name)
 
     def create_default_session(self, cls=None):
         """ Create a default session for interactive use (e.g. the notebook).
@@ -581,14 +603,26 @@ class AppManager(event.Component):
 
         app, pending, connected = self._appinfo[name]
 
-        # Create the session
-        session = Session(name, request=request)
-        if id is not None:
-            session._id = id  # use custom id (export() used to use this)
-        self._session_map[session.id] = session
-        # Instantiate the component
-        # This represents the "instance" of the App object (Component class + args)
-        app(flx_session=session, flx_is_app=True)
+        pool = self._pools.get(name, None) if id is None else None
+        if pool:
+            # Use a pre-instantiated session
+            session = pool.pop(0)
+            self._pool_stats[name]['hits'] += 1
+            session._creation_time = time.time()
+            session._request = request
+            if request and request.cookies:
+                session._set_cookies(request.cookies)
+            self._session_map[session.id] = session
+        else:
+            # Create the session
+            if pool is not None:
+                self._pool_stats[name]['misses'] += 1
+            session = self._instantiate_session(app, name, request)
+            if id is not None:
+                session._id = id  # use custom id (export() used to use this)
+            self._session_map[session.id] = session
+        if pool is not None:
+            self._schedule_refill(name)
 
         # Now wait for the client to connect. The client will be served
         # a page that contains the session_id. Upon connecting, the id
@@ -598,10 +632,110 @@ class AppManager(event.Component):
         logger.debug('Instantiate app client %s' % session.app_name)
         return session
 
-    def connect_client(self, ws, name, session_id, cookies=None):
+    def _instantiate_session(self, app, name, request=None):
+        session = Session(name, request=request)
+        # Instantiate the component
+        # This represents the "instance" of the App object (Component class + args)
+        app(flx_session=session, flx_is_app=True)
+        return session
+
+    def _schedule_refill(self, name):
+        """ Schedule refilling the pool of the given app. This goes via
+        the event loop, which holds on to the call until it iterates on the
+        asyncio loop that it is integrated with, i.e. the loop of the server,
+        which may not exist yet when the app is served.
+        """
+        event.loop.call_soon(self._refill_pool_soon, name)
+
+    def _refill_pool_soon(self, name):
+        # Leave the current iteration of the event loop first
+        event.loop._asyncio_loop.call_soon(self._refill_pool, name)
+
+    def _refill_pool(self, name):
+        """ Add one session to the pool of the given app, and schedule
+        another call if the pool is not yet full. This is done one session
+        per iteration of the asyncio loop, and is postponed while the event
+        loop has work to do, so that serving requests takes precedence.
+        """
+        pool = self._pools.get(name, None)
+        stats = self._pool_stats.get(name, None)
+        if pool is None or len(pool) >= stats['target']:
+            return
+        if event.loop.has_pending():
+            event.loop._asyncio_loop.call_later(0.01, self._refill_pool, name)
+            return
+        t0 = time.perf_counter()
+        app = self._appinfo[name][0]
+        pool.append(self._instantiate_session(app, name))
+        stats['refill_time'] += time.perf_counter() - t0
+        stats['refills'] += 1
+        if len(pool) < stats['target']:
+            event.loop._asyncio_loop.call_soon(self._refill_pool, name)
+
+    def get_pool_stats(self, name):
+        """ Get a dict with metrics on the pool of pre-instantiated sessions
+        of the given app: its current 'size', the 'target' size, the number
+        of 'hits' and 'misses', the number of 'refills', and the
+        'refill_rate' (sessions instantiated per second of refilling).
+        Returns None if the app does not use a pool.
+        """
+        stats = self._pool_stats.get(name, None)
+        if stats is None:
+            return None
+        d = dict(size=len(self._pools.get(name, ())))
+        d.update(stats)
+        refill_time = d.pop('refill_time')
+        d['refill_rate'] = d['refills'] / refill_time if refill_time else 0.0
+        return d
+
+    def get_gc_stats(self):
+        """ Get a dict with metrics on the garbage collection that is done
+        when sessions close (see ``flexx.config.gc_policy``): the 'policy',
+        the number of 'sessions_closed', the number of sessions that are
+        'pending' a batched collection, the number of 'collections', the
+        total number of 'objects_freed', and the 'total_time' and
+        'max_time' spent collecting (in seconds).
+        """
+        return gc_policy.get_stats()
+
+    def connect_client(self, ws, name, session_id, cookies=None, last_seq=None):
         """ Connect a client to a session that was previously created.
+        If last_seq is given (and sessions can be resumed), the client tries
+        to resume a session that lost its connection.
         """
         _, pending, connected = self._appinfo[name]
+
+        if last_seq is not None and config.ws_resume_grace > 0:
+            # Find the session. The client may reconnect before we noticed
+            # that its old connection dropped, so also look in connected.
+            session, timer = self._lost_sessions.get(session_id, (None, None))
+            if session is None:
+                for session in connected:
+                    if session.id == session_id:
+                        break
+                else:
+                    session = None
+            if session is None or session.app_name != name:
+                raise RuntimeError('Asked to resume session id %r, but could '
+                                   'not find it' % session_id)
+            # Check before changing anything, so that a failed resume only
+            # rejects the new connection.
+            session._check_resume(last_seq)
+            if timer is not None:
+                self._lost_sessions.pop(session_id)
+                timer.cancel()
+            else:
+                # Move the session from the old connection to the new one
+                connected.remove(session)
+                old_ws = session._ws
+                session._detach_ws()
+                old_ws._session = None  # don't report the session as lost
+                old_ws.close(1000, 'Session resumed on another connection')
+            session._resume_ws(ws, last_seq)
+            logger.info('Resumed session %s %s' % (name, session_id))
+            connected.append(session)
+            self.connections_changed(session.app_name)
+            return session
         # Search for the session with the specific id
         for session in pending:
             if session.id == session_id:
@@ -638,10 +772,29 @@ class AppManager(event.Component):
             connected.remove(session)
         except ValueError:
             pass
-        logger.info('Session closed %s %s' %(session.app_name, session.id))
-        session.close()
+
+        # Keep the session alive for a while, so the client can resume?
+        grace = config.ws_resume_grace
+        if grace > 0 and not session._closed:
+            logger.info('Session lost connection %s %s' %
+                        (session.app_name, session.id))
+            session._detach_ws()
+            timer = asyncio.get_event_loop().call_later(
+                grace, self._expire_lost_session, session.id)
+            self._lost_sessions[session.id] = session, timer
+        else:
+            logger.info('Session closed %s %s' %(session.app_name, session.id))
+            session.close()
         self.connections_changed(session.app_name)
 
+    def _expire_lost_session(self, session_id):
+        """ Close a session that was not resumed within the grace period.
+        """
+        session, _ = self._lost_sessions.pop(session_id, (None, None))
+        if session is not None:
+            logger.info('Session closed %s %s' % (session.app_name, session.id))
+            session.close()
+
     def has_app_name(self, name):
         """ Returns the case-corrected name if the given name matches
         a registered appliciation (case insensitive). Returns None if the
@@ -14,6 +14,7 @@ from ..util.getresource import get_resoure_path
 from ._component2 import AppComponentMeta
 from ._asset import Asset, Bundle, HEADER
 from ._modules import JSModule
+from ._datastore import DataStore
 from . import logger
 
 
@@ -187,7 +188,7 @@ class AssetStore:
         self._modules = {}
         self._assets = {}
         self._associated_assets = {}
-        self._data = {}
+        self._data = DataStore()
         self._used_assets = set()  # between all sessions (for dump)
 
         # Create asset to reset CSS
@@ -322,7 +323,13 @@ class AssetStore:
         """ Get the data (as bytes) corresponding to the given name or None
         if it not known.
         """
-        return self._data.get(name, None)
+        return self._data.get(name)
+
+    def _get_data_entry(self, name):
+        """ Like get_data(), but returns a DataEntry, so that large data can
+        be served without copying it, and its hash can be used as ETag.
+        """
+        return self._data.get_entry(name)
 
     def get_asset_names(self):
         """ Get a list of all asset names.
@@ -332,7 +339,7 @@ class AssetStore:
     def get_data_names(self):
         """ Get a list of all data names.
         """
-        return list(self._data.keys())
+        return self._data.names()
 
     def add_shared_asset(self, asset_name, source=None):
         """ Add an asset to the store so that the client can load it from the
@@ -422,7 +429,9 @@ class AssetStore:
 
         Parameters:
             name (str): the name of the data, e.g. 'icon.png'.
-            data (bytes): the data blob.
+            data: the data blob as bytes, or a ``pathlib.Path`` to a file, an
+                mmap, or a callable that returns bytes when the data is first
+                requested.
 
         Returns:
             str: the (relative) url at which the data can be retrieved.
@@ -432,9 +441,10 @@ class AssetStore:
             raise TypeError('add_shared_data() name must be a str.')
         if name in self._data:
             raise ValueError('add_shared_data() got existing name %r.' % name)
-        if not isinstance(data, bytes):
-            raise TypeError('add_shared_data() data must be bytes.')
-        self._data[name] = data
+        try:
+            self._data.add(name, data)
+        except (TypeError, ValueError) as err:
+            raise type(err)('add_shared_data() %s' % err)
         return 'flexx/data/shared/%s' % name  # relative path so it works /w export
 
     def _dump_data(self):
@@ -229,6 +229,15 @@ class JsSession:
         self._asset_count = 0
         self._ws = None
         self.last_msg = None
+        # To resume the session when the connection is lost
+        self._received_count = 0  # number of commands received
+        self._resume_grace = 0  # set by server
+        self._lost_time = 0  # nonzero while trying to resume
+        self._resume_attempts = 0
+        self._outgoing = []  # commands to send when resumed
+        # Consecutive DISPOSE commands are combined into one command
+        self._dispose_batch = []
+        self._receiving_dispose = False
         # self.classes = {}
         self.instances = {}
         self.instances_to_check_size = {}
@@ -242,6 +251,7 @@ class JsSession:
         window.setInterval(self._check_size_of_objects, 1000)
 
     def exit(self):
+        self._resume_grace = 0  # Don't try to resume
         if self._ws:  # is not null or undefined
             self._ws.close()
             self._ws = None
@@ -250,14 +260,53 @@ class JsSession:
             # but perhaps not that much need, and leaving is nice for debugging.
 
     def send_command(self, *command):
-        if self._ws is not None:
+        if command[0] == 'DISPOSE':
+            if len(self._dispose_batch) == 0:
+                window.setTimeout(self._flush_dispose_batch, 0)
+            self._dispose_batch.push(command[1])
+            return
+        elif len(self._dispose_batch) > 0:
+            self._flush_dispose_batch()
+        self._send_command_now(command)
+
+    def _send_command_now(self, command):
+        if self._ws is not None or self._lost_time > 0:
             try:
                 bb = serializer.encode(command)
             except Exception as err:
                 print('Command that failed to encode:')
                 print(command)
                 raise err
-            self._ws.send(bb)
+            if self._lost_time > 0:
+                self._outgoing.push(bb)  # Send when the session is resumed
+            else:
+                self._ws.send(bb)
+
+    def _flush_dispose_batch(self):
+        ids = self._dispose_batch
+        if len(ids) == 0:
+            return
+        self._dispose_batch = []
+        if len(ids) == 1:
+            self._send_command_now(['DISPOSE', ids[0]])
+        else:
+            self._send_command_now(['DISPOSE_MANY', ids])
+
+    def _dispose_proxies(self, ids):
+        # Dispose the (proxy) components with the given ids in one sweep
+        components = []
+        for id in ids:
+            c = self.instances.get(id, None)
+            if c is not None and c._disposed is False:  # else: no need to warn
+                components.push(c)
+        self._receiving_dispose = True  # no need to tell the other side
+        try:
+            loop = window.flexx.require('flexx.event.js').loop
+            loop._dispose_many(components)
+        finally:
+            self._receiving_dispose = False
+        for id in ids:
+            self.instances.pop(id, None)  # Drop local reference now
 
     def instantiate_component(self, module, cname, id, args, kwargs, active_components):
         # Maybe we still have the instance?
@@ -281,6 +330,23 @@ class JsSession:
                 ac.__exit__()
         return c
 
+    def instantiate_components(self, classes, names, actives, rows):
+        # Instantiate a batch of components in a single pass. The rows
+        # are [class_index, id, names_index, values, active_index].
+        for row in rows:
+            module, cname = classes[row[0]]
+            prop_names = names[row[2]]
+            values = row[3]
+            kwargs = {}
+            for i in range(len(prop_names)):
+                kwargs[prop_names[i]] = values[i]
+            active_components = None
+            if row[4] >= 0:
+                active_components = [self.get_component_instance(id)
+                                     for id in actives[row[4]]]
+            self.instantiate_component(module, cname, row[1], [], kwargs,
+                                       active_components)
+
     def _register_component(self, c, id=None):
         if self.app is None:
             self.app = c  # Set our root component; is the first to register
@@ -331,9 +397,13 @@ class JsSession:
 
         def on_ws_open(evt):
             window.console.info('Socket opened with session id ' + self.id)
-            self.send_command('HI_FLEXX', self.id)
+            if self._lost_time > 0:
+                self._resume()
+            else:
+                self.send_command('HI_FLEXX', self.id)
         def on_ws_message(evt):
             msg = evt.data  # bsdf-encoded command
+            self._received_count += 1  # the server counts each command it sends
             if not msg:
                 pass  # ? drop glitchy message :/
             elif self._pending_commands is None:
@@ -347,6 +417,24 @@ class JsSession:
         def on_ws_close(evt):
             self._ws = None
             self.status = 0
+            # The server could not resume the session, so start a new one
+            if evt.code == 4001 and not window.flexx.is_notebook:
+                window.console.info('Could not resume session, reloading')
+                window.location.reload()
+                return
+            # Try to resume, unless the server closed or refused the connection
+            if self._resume_grace > 0 and evt.code not in (1000, 1001, 1003):
+                if self._lost_time == 0:
+                    self._lost_time = time()
+                    window.console.info('Lost connection with server, resuming')
+                if time() - self._lost_time < self._resume_grace:
+                    self.status = 1
+                    delay = min(2.0, 0.1 * 2 ** self._resume_attempts)
+                    self._resume_attempts += 1
+                    window.setTimeout(self.init_socket, delay * 1000)
+                    return
+            self._lost_time = 0
+            self._outgoing = []
             msg = 'Lost connection with server'
             if evt and evt.reason:
                 msg += ': %s (%i)' % (evt.reason, evt.code)
@@ -366,6 +454,19 @@ class JsSession:
         ws.onclose = on_ws_close
         ws.onerror = on_ws_error
 
+    def _resume(self):
+        """ Resume the session after the connection was lost. The server
+        replays the commands that we missed.
+        """
+        self._ws.send(serializer.encode(('HI_FLEXX', self.id, self._received_count)))
+        outgoing = self._outgoing
+        self._outgoing = []
+        self._lost_time = 0
+        self._resume_attempts = 0
+        for bb in outgoing:
+            self._ws.send(bb)
+        window.console.info('Resumed session ' + self.id)
+
     def _process_commands(self):
         """ A less direct way to process commands, which gives the
         browser time to draw about every other JS asset. This is a
@@ -401,6 +502,8 @@ class JsSession:
                 self._receive_raw_command(self._pending_commands.pop(0))
             self._pending_commands = None
             # print('init took', time() - self._init_time)
+        elif cmd == 'RESUME_GRACE':
+            self._resume_grace = command[1]
         elif cmd == 'PRINT':
             (window.console.ori_log or window.console.log)(command[1])
         elif cmd == 'EXEC':
@@ -431,15 +534,19 @@ class JsSession:
                 ob[name](*args)
         elif cmd == 'INSTANTIATE':
             self.instantiate_component(*command[1:])  # module, cname, id, args, kwargs
+        elif cmd == 'INSTANTIATE_MANY':
+            self.instantiate_components(*command[1:])
         elif cmd == 'DISPOSE':
-            id = command[1]
-            c = self.instances.get(id, None)
-            if c is not None and c._disposed is False:  # else: no need to warn
-                c._dispose()
+            self._dispose_proxies([command[1]])
             self.send_command('DISPOSE_ACK', command[1])
-            self.instances.pop(id, None)  # Drop local reference now
+        elif cmd == 'DISPOSE_MANY':
+            self._dispose_proxies(command[1])
+            self.send_command('DISPOSE_ACK_MANY', command[1])
         elif cmd == 'DISPOSE_ACK':
             self.instances.pop(command[1], None)  # Drop reference
+        elif cmd == 'DISPOSE_ACK_MANY':
+            for id in command[1]:
+                self.instances.pop(id, None)  # Drop references
         elif cmd == 'DEFINE':
             #and command[1] == 'JS' or command[1] == 'DEFINE-JS-EVAL '):
             kind, name, code = command[1:]
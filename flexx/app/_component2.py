@@ -145,9 +145,28 @@ class AppComponentMeta(ComponentMeta):
         if issubclass(cls, LocalComponent):
             cls.__proxy_properties__ = cls.JS.__properties__
             cls.JS.__emitters__ = cls.__emitters__
+            local_cls = cls
         else:
             cls.JS.__proxy_properties__ = cls.__properties__
             cls.__emitters__ = cls.JS.__emitters__
+            local_cls = cls.JS
+
+        # Set __property_sync__ for the properties that are not synced eagerly
+        default_sync = getattr(local_cls, 'PROPERTY_SYNC', 'eager')
+        if default_sync not in ('eager', 'on_demand', 'never'):
+            raise ValueError('%s.PROPERTY_SYNC must be "eager", "on_demand" '
+                             'or "never", not %r.' % (cls_name, default_sync))
+        property_sync = {}
+        property_diff = []
+        for name in local_cls.__proxy_properties__:
+            prop = getattr(local_cls, name)
+            sync = prop._sync or default_sync
+            if sync != 'eager':
+                property_sync[name] = sync
+            if prop._diff:
+                property_diff.append(name)
+        local_cls.__property_sync__ = property_sync
+        local_cls.__property_diff__ = property_diff
 
         # Set JS on the JS class
         cls.JS.CODE = cls._get_js()
@@ -349,6 +368,9 @@ class LocalComponent(BaseAppComponent):
     Base class for PyComponent in Python and JsComponent in JavaScript.
     """
 
+    __property_sync__ = {}  # name -> 'on_demand' or 'never', set by the meta class
+    __property_diff__ = []  # names of properties with diff=True, set by the meta class
+
     def _comp_init_property_values(self, property_values):
         # This is a good time to register with the session, and
         # instantiate the proxy class. Property values have been set at this
@@ -404,7 +426,8 @@ class LocalComponent(BaseAppComponent):
                 props = {}
                 if include_props:
                     for name in self.__proxy_properties__:
-                        props[name] = getattr(self, name)
+                        if self.__property_sync__.get(name, 'eager') == 'eager':
+                            props[name] = getattr(self, name)
                 self._session.send_command('INSTANTIATE', self.__jsmodule__,
                                            self.__class__.__name__,
                                            self._id, [], props)
@@ -416,7 +439,14 @@ class LocalComponent(BaseAppComponent):
         if self._has_proxy is True and self._session.status > 0:
             # implicit: and self._disposed is False:
             if type in self.__proxy_properties__:
-                self._session.send_command('INVOKE', self._id, '_emit_at_proxy', [ev])
+                sync = self.__property_sync__.get(type, 'eager')
+                if sync == 'eager' or (sync == 'on_demand' and
+                                       type in self.__event_types_at_proxy):
+                    if ev.mutation == 'set' and type in self.__property_diff__:
+                        ev = self._flx_diff_event(ev)
+                    if ev is not None:
+                        self._session.send_command('INVOKE', self._id,
+                                                   '_emit_at_proxy', [ev])
             elif type in self.__event_types_at_proxy:
                 self._session.send_command('INVOKE', self._id, '_emit_at_proxy', [ev])
 
@@ -431,11 +461,95 @@ class LocalComponent(BaseAppComponent):
             if self._session.status > 0:
                 self._session.send_command('DISPOSE', self._id)
 
+    def _flx_diff_event(self, ev):
+        # Turn a set-event into an event with a patch for the proxy. If the
+        # old and new value are the same object, this is the initial value,
+        # which the proxy may not have, so we send it in full.
+        if ev.old_value is ev.new_value:
+            return ev
+        patch = self._flx_diff_value(ev.old_value, ev.new_value)
+        if patch is None:
+            return ev
+        elif len(patch) == 0:
+            return None
+        return dict(type=ev.type, mutation='set', patch=patch)
+
+    def _flx_diff_value(self, old_value, new_value):
+        """ Get a list of partial mutations (mutation, index, objects) to
+        turn the old value into the new value, or None if sending the new
+        value is cheaper. Lists are diffed by their common prefix and suffix,
+        and dicts by key.
+        """
+        if isinstance(new_value, dict):
+            if not isinstance(old_value, dict):
+                return None
+            changed = {}
+            removed = []
+            for key in new_value.keys():
+                if key not in old_value or old_value[key] != new_value[key]:
+                    changed[key] = new_value[key]
+            for key in old_value.keys():
+                if key not in new_value:
+                    removed.append(key)
+            if len(changed.keys()) >= len(new_value.keys()):
+                return None
+            patch = []
+            if len(removed) > 0:
+                patch.append(('remove', -1, removed))
+            if len(changed.keys()) > 0:
+                patch.append(('replace', -1, changed))
+            return patch
+        else:
+            if isinstance(old_value, dict):
+                return None
+            n_old, n_new = len(old_value), len(new_value)
+            n = min(n_old, n_new)
+            i0 = 0
+            while i0 < n and old_value[i0] == new_value[i0]:
+                i0 += 1
+            i1 = 0
+            while (i1 < n - i0 and
+                   old_value[n_old - 1 - i1] == new_value[n_new - 1 - i1]):
+                i1 += 1
+            if i0 + i1 == 0:
+                return None
+            n_remove = n_old - i0 - i1
+            objects = list(new_value[i0:n_new - i1])
+            patch = []
+            if n_remove == len(objects):
+                if n_remove > 0:
+                    patch.append(('replace', i0, objects))
+            else:
+                if n_remove > 0:
+                    patch.append(('remove', i0, n_remove))
+                if len(objects) > 0:
+                    patch.append(('insert', i0, objects))
+            return patch
+
     def _flx_set_has_proxy(self, has_proxy):
         self._has_proxy = has_proxy
 
     def _flx_set_event_types_at_proxy(self, event_types):
+        # Send the on_demand properties that the proxy now reacts to
+        names = [name for name in event_types
+                 if self.__property_sync__.get(name, None) == 'on_demand' and
+                 name not in self.__event_types_at_proxy]
         self.__event_types_at_proxy = event_types
+        self._flx_send_property_values(names)
+
+    def _flx_send_property_values(self, names):
+        # Send the current values of the given properties to the proxy.
+        # Called when needed for on_demand properties, and via fetch_properties().
+        if self._has_proxy is False or self._disposed is True:
+            return
+        for name in names:
+            if (name in self.__proxy_properties__ and
+                    self.__property_sync__.get(name, 'eager') != 'never'):
+                value = getattr(self, name)
+                ev = dict(type=name, source=self, mutation='set',
+                          new_value=value, old_value=value)
+                self._session.send_command('INVOKE', self._id,
+                                           '_emit_at_proxy', [ev])
 
 
 class ProxyComponent(BaseAppComponent):
@@ -490,8 +604,18 @@ class ProxyComponent(BaseAppComponent):
 
     def _comp_apply_property_values(self, values):
         # Apply props in silence
-        for name, value in values:
-            setattr(self, '_' + name + '_value', value)
+        if this_is_js():
+            for name, value in values:
+                setattr(self, '_' + name + '_value', value)
+        else:
+            # Keep sharing the defaults of the class if we can
+            prop_values = self.__property_values__
+            for name, value in values:
+                i = self.__property_index__[name]
+                if value is not prop_values[i]:
+                    if prop_values is self.__class__.__property_values__:
+                        prop_values = self.__property_values__ = list(prop_values)
+                    prop_values[i] = value
 
     def _proxy_action(self, name, *args, **kwargs):
         """ To invoke actions on the real object.
@@ -500,6 +624,17 @@ class ProxyComponent(BaseAppComponent):
         # if self._session.status > 0, mmm, or rather error?
         self._session.send_command('INVOKE', self._id, name, args)
 
+    def fetch_properties(self, *names):
+        """ Ask the component at the other side to send the current values
+        of the given properties. This is intended for properties with sync
+        policy 'on_demand' that this proxy has no reactions for. The values
+        arrive asynchronously, i.e. in a later iteration of the event loop.
+        Properties with sync policy 'never' are not send.
+        """
+        if self._session.status > 0:
+            self._session.send_command('INVOKE', self._id,
+                                       '_flx_send_property_values', [names])
+
     def _proxy_emitter(self, name, *args, **kwargs):
         """ To handle use of placeholder emitters.
         """
@@ -545,12 +680,44 @@ class ProxyComponent(BaseAppComponent):
         if ev.type in self.__properties__ and hasattr(ev, 'mutation'):
             # Mutate the property - this will cause an emit
             if ev.mutation == 'set':
-                super()._mutate(ev.type, ev.new_value)
+                if hasattr(ev, 'patch'):
+                    value = self._flx_apply_patch(ev.type, ev.patch)
+                    super()._mutate(ev.type, value)
+                else:
+                    super()._mutate(ev.type, ev.new_value)
             else:
                 super()._mutate(ev.type, ev.objects, ev.mutation, ev.index)
         else:
             self.emit(ev.type, ev)
 
+    def _flx_apply_patch(self, name, patch):
+        """ Get a new value for the given property by applying a patch
+        as produced by the local component's ``_flx_diff_value()``.
+        """
+        value = getattr(self, name)
+        if isinstance(value, dict):
+            new_value = {}
+            for key in value.keys():
+                new_value[key] = value[key]
+            for mutation, index, objects in patch:
+                if mutation == 'remove':
+                    for key in objects:
+                        new_value.pop(key)
+                else:
+                    for key in objects.keys():
+                        new_value[key] = objects[key]
+        else:
+            new_value = list(value)
+            for mutation, index, objects in patch:
+                if mutation == 'remove':
+                    new_value = new_value[:index] + new_value[index + objects:]
+                elif mutation == 'insert':
+                    new_value = new_value[:index] + list(objects) + new_value[index:]
+                else:
+                    new_value = (new_value[:index] + list(objects) +
+                                 new_value[index + len(objects):])
+        return new_value
+
     def dispose(self):
         if this_is_js():
             # The server is leading ...
@@ -570,8 +737,10 @@ class ProxyComponent(BaseAppComponent):
         super()._dispose()
         if was_disposed is False and self._session is not None:
             self._session._unregister_component(self)
-            if self._session.status > 0:
-                # Let other side know that we no longer exist.
+            receiving_dispose = getattr(self._session, '_receiving_dispose', False)
+            if self._session.status > 0 and not receiving_dispose:
+                # Let other side know that we no longer exist (unless it
+                # told us to dispose).
                 self._session.send_command('INVOKE', self._id,
                                            '_flx_set_has_proxy', [False])
 
@@ -0,0 +1,303 @@
+"""
+Storage for the data that is served to the client, as provided via
+``Session.add_data()`` and ``AssetStore.add_shared_data()``.
+
+Data can be given as bytes, as a ``pathlib.Path`` of a file, as an mmap,
+or as a callable that produces the bytes when the data is first needed. Data
+that lives in memory is subject to a memory budget that is shared by all
+stores (``flexx.config.data_memory_limit``): when it is exceeded, the
+least recently used data is spilled to a temporary directory, from
+where it is served via mmap.
+
+Data given as bytes is content-addressed: identical data that is added
+to different stores (e.g. the same logo in each session) is stored once,
+and freed when the last store releases it. The content hash is also
+used for the ETag in HTTP responses, so that browsers can cache data
+across sessions. For data given as a file, the ETag is based on the
+file's size and modification time instead (and for an mmap on its
+identity), so that serving it does not require reading all of it.
+"""
+
+import os
+import mmap
+import hashlib
+import atexit
+import shutil
+import tempfile
+import itertools
+import threading
+from pathlib import PurePath
+from collections import OrderedDict
+
+from .. import config
+from . import logger
+
+_mmap_ids = itertools.count(1)  # to give each mmap a unique ETag
+
+
+def hash_data(data):
+    """ Get the content hash of the given bytes (or mmap) as a hex string.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class DataEntry:
+    """ A single piece of data in a DataStore. The data is either in
+    memory (bytes), still to be produced (callable), or backed by a file
+    that is mapped into memory on first use. Entries can be shared
+    between stores; ``refs`` counts the number of names referring to it.
+    """
+
+    __slots__ = ('_bytes', '_func', '_path', '_mmap', '_own_path', '_own_mmap',
+                 '_hash', 'refs')
+
+    def __init__(self, data, hash=None):
+        self._bytes = self._func = self._path = self._mmap = None
+        self._own_path = False  # whether we created the file (i.e. spilled)
+        self._own_mmap = False  # whether we created the map
+        self._hash = hash
+        self.refs = 1
+        if isinstance(data, bytes):
+            self._bytes = data
+            _budget.add(self)
+        elif isinstance(data, mmap.mmap):
+            self._mmap = data
+        elif isinstance(data, PurePath) or hasattr(data, '__fspath__'):
+            # Note that str is deliberately not accepted as a file path, to
+            # avoid serving local files by accident. On Python 3.5, pathlib
+            # objects do not have __fspath__ yet.
+            path = data.__fspath__() if hasattr(data, '__fspath__') else str(data)
+            if not (isinstance(path, str) and os.path.isfile(path)):
+                raise ValueError('data path %r is not an existing file.' % path)
+            self._path = path
+        elif callable(data):
+            self._func = data
+        else:
+            raise TypeError('data must be bytes, a pathlib.Path, an mmap '
+                            'or a callable.')
+
+    @property
+    def in_memory(self):
+        """ Whether the data is held in memory as a bytes object.
+        """
+        return self._bytes is not None
+
+    def get_hash(self):
+        """ Get a hash of the data, for use as ETag. For data in memory this
+        is the content hash. For a file it is based on the file's size and
+        modification time, and for an mmap on its size and identity, so that
+        the data does not have to be read.
+        """
+        if self._hash is None:
+            if self._path is not None:
+                st = os.stat(self._path)
+                self._hash = 'f%x-%x' % (st.st_size, st.st_mtime_ns)
+            elif self._mmap is not None:
+                self._hash = 'm%x-%x' % (len(self._mmap), next(_mmap_ids))
+            else:
+                self._hash = hash_data(self.get_buffer())
+        return self._hash
+
+    def get_bytes(self):
+        """ Get the data as bytes. For file-backed data this makes a copy.
+        """
+        buffer = self.get_buffer()
+        return buffer if isinstance(buffer, bytes) else buffer[:]
+
+    def get_buffer(self):
+        """ Get the data as an object that supports the buffer protocol
+        (bytes or mmap), so that it can be served without copying.
+        """
+        if self._func is not None:
+            data, self._func = self._func(), None
+            if not isinstance(data, bytes):
+                raise TypeError('Data callable must return bytes, not %s.' %
+                                type(data).__name__)
+            self._bytes = data
+            _budget.add(self)
+        if self._bytes is not None:
+            _budget.touch(self)
+            return self._bytes
+        if self._mmap is None:
+            if os.path.getsize(self._path) == 0:
+                return b''  # Cannot map an empty file
+            with open(self._path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._own_mmap = True
+        return self._mmap
+
+    def spill(self, path):
+        """ Move in-memory data to a file at the given path.
+        """
+        with open(path, 'wb') as f:
+            f.write(self._bytes)
+        self._path, self._own_path = path, True
+        self._bytes = None
+
+    def release(self):
+        """ Release any resources held by this entry.
+        """
+        _budget.discard(self)
+        self._bytes = self._func = None
+        if self._mmap is not None and self._own_mmap:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Still being served; the map is closed when collected
+        self._mmap = None
+        if self._path is not None and self._own_path:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass  # e.g. on Windows when still mapped; cleaned up at exit
+        self._path = None
+
+
+class DataStore:
+    """ A mapping of names to data, used by the Session and AssetStore.
+    Data given as bytes is stored in a pool that is shared by all stores.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def names(self):
+        """ Get a list of the names of all data in this store.
+        """
+        return list(self._entries.keys())
+
+    def add(self, name, data):
+        """ Add data by name. See ``DataEntry`` for the supported types.
+        """
+        if isinstance(data, bytes):
+            entry = _pool.acquire(data)
+        else:
+            entry = DataEntry(data)
+        self.remove(name)
+        self._entries[name] = entry
+
+    def remove(self, name):
+        """ Remove the data by the given name, if present.
+        """
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            _pool.release(entry)
+
+    def clear(self):
+        """ Remove all data.
+        """
+        while self._entries:
+            _pool.release(self._entries.popitem()[1])
+
+    def get(self, name):
+        """ Get the data corresponding to the given name as bytes, or None.
+        """
+        entry = self.get_entry(name)
+        return None if entry is None else entry.get_bytes()
+
+    def get_entry(self, name):
+        """ Get the DataEntry corresponding to the given name, or None.
+        Data produced by a callable is evaluated and deduplicated here.
+        """
+        entry = self._entries.get(name, None)
+        if entry is not None and entry._func is not None:
+            data = entry.get_buffer()
+            _pool.release(entry)
+            entry = self._entries[name] = _pool.acquire(data)
+        return entry
+
+
+class DataPool:
+    """ Keeps a single reference-counted entry for each unique bytes
+    object (by content hash) that is added to any store.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # hash -> entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def acquire(self, data):
+        hash = hash_data(data)
+        with self._lock:
+            entry = self._entries.get(hash, None)
+            if entry is None:
+                entry = self._entries[hash] = DataEntry(data, hash)
+            else:
+                entry.refs += 1
+            return entry
+
+    def release(self, entry):
+        with self._lock:
+            entry.refs -= 1
+            if entry.refs <= 0:
+                if self._entries.get(entry._hash, None) is entry:
+                    self._entries.pop(entry._hash)
+                entry.release()
+
+
+class MemoryBudget:
+    """ Keeps track of the in-memory data of all stores, and spills the
+    least recently used data to a temporary directory when the total
+    exceeds ``flexx.config.data_memory_limit``.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # id -> entry, least recent first
+        self._nbytes = 0
+        self._dir = None
+        self._count = 0
+
+    @property
+    def nbytes(self):
+        """ The total number of bytes held in memory.
+        """
+        return self._nbytes
+
+    def add(self, entry):
+        with self._lock:
+            self._entries[id(entry)] = entry
+            self._nbytes += len(entry._bytes)
+            self._check()
+
+    def touch(self, entry):
+        with self._lock:
+            try:
+                self._entries.move_to_end(id(entry))
+            except KeyError:
+                pass
+
+    def discard(self, entry):
+        with self._lock:
+            if self._entries.pop(id(entry), None) is not None:
+                self._nbytes -= len(entry._bytes)
+
+    def _check(self):
+        limit = config.data_memory_limit
+        if limit <= 0:
+            return
+        while self._nbytes > limit and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._nbytes -= len(entry._bytes)
+            entry.spill(self._new_path())
+
+    def _new_path(self):
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix='flexx_data_')
+            atexit.register(shutil.rmtree, self._dir, True)
+            logger.info('Spilling data to %s' % self._dir)
+        self._count += 1
+        return os.path.join(self._dir, 'data%i' % self._count)
+
+
+_budget = MemoryBudget()
+_pool = DataPool()
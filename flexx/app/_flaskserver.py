@@ -34,6 +34,7 @@ from ._flaskhelpers import register_blueprints, flexxBlueprint, flexxWS
 
 from . import logger
 from .. import config
+from ..event import _loop
 
 app = Flask(__name__)
 # app.debug = True
@@ -260,7 +261,8 @@ class AppHandler(RequestHandler):
 
     def get(self, full_path):
 
-        logger.debug('Incoming request at %r' % full_path)
+        if not config.production:
+            logger.debug('Incoming request at %r', full_path)
 
         ok_app_names = '__main__', '__default__', '__index__'
         parts = [p for p in full_path.split('/') if p]
@@ -371,7 +373,8 @@ class MainHandler(RequestHandler):
 
     def get(self, full_path):
 
-        logger.debug('Incoming request at %s' % full_path)
+        if not config.production:
+            logger.debug('Incoming request at %s', full_path)
 
         # Analyze path to derive components
         # Note: invalid app name can mean its a path relative to the main app
@@ -478,6 +481,14 @@ class MainHandler(RequestHandler):
         info.append('Runtime: %1.1f s' % runtime)
         info.append('Number of apps: %i' % napps)
         info.append('Number of sessions: %i' % nsessions)
+        for name in manager.get_app_names():
+            stats = manager.get_pool_stats(name)
+            if stats is not None:
+                info.append('Session pool of %s: %i/%i, %i hits, %i misses, '
+                            '%i refills at %0.1f/s' %
+                            (name, stats['size'], stats['target'], stats['hits'],
+                             stats['misses'], stats['refills'],
+                             stats['refill_rate']))
 
         info = '\n'.join(['<li>%s</li>' % i for i in info])
         self.write('<ul>' + info + '</ul>')
@@ -496,8 +507,14 @@ class MainHandler(RequestHandler):
                         app_names=manager.get_app_names(),
                         nsessions=sum([len(manager.get_connections(x))
                                         for x in manager.get_app_names()]),
+                        pools={x: manager.get_pool_stats(x)
+                               for x in manager.get_app_names()
+                               if manager.get_pool_stats(x) is not None},
                         )
             self.write(json.dumps(info))
+        elif path == 'profile':
+            # Stats of the event loop, see loop.start_profiling()
+            self.write(json.dumps(_loop.loop.get_profile_stats()))
         elif path == 'stop':
             asyncio.get_event_loop().stop()
             # loop = IOLoop.current()
@@ -596,6 +613,7 @@ class WSHandler(MyWebSocketHandler):
                      1001: 'client closed',
                      1002: 'protocol error',
                      1003: 'could not accept data',
+                     4001: 'could not resume session',
                      }
 
     # --- callbacks
@@ -640,12 +658,18 @@ class WSHandler(MyWebSocketHandler):
         if self._session is None:
             if command[0] == 'HI_FLEXX':
                 session_id = command[1]
+                last_seq = command[2] if len(command) > 2 else None  # resume
                 try:
                     self._session = manager.connect_client(self, self.app_name,
                                                            session_id,
-                                                           cookies=self.cookies)
+                                                           cookies=self.cookies,
+                                                           last_seq=last_seq)
                 except Exception as err:
-                    self.close(1003, "Could not launch app: %r" % err)
+                    if last_seq is not None:
+                        # The client starts a new session on this code
+                        self.close(4001, "Could not resume session: %r" % err)
+                    else:
+                        self.close(1003, "Could not launch app: %r" % err)
                     raise
         else:
             try:
@@ -207,8 +207,8 @@ def init_notebook():
 # Keep serve and launch, they are still quite nice shorthands to quickly
 # get something done.
 
-def serve(cls, name=None, properties=None):
-    """ Shorthand for ``app.App(cls).serve(name)``.
+def serve(cls, name=None, properties=None, prewarm=0):
+    """ Shorthand for ``app.App(cls).serve(name, prewarm)``.
     """
     if properties is not None:
         raise RuntimeError('serve(... properties) is deprecated, '
@@ -216,7 +216,7 @@ def serve(cls, name=None, properties=None):
     # Note: this talks to the manager; it has nothing to do with the server
     assert (isinstance(cls, type) and issubclass(cls, (PyComponent, JsComponent)))
     a = App(cls)
-    a.serve(name)
+    a.serve(name, prewarm)
     return cls
 
 
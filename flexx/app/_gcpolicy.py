@@ -0,0 +1,137 @@
+"""
+The garbage collection that is done when a session closes.
+
+A closed session leaves behind a graph of components, reactions and
+events with circular references, which only the garbage collector can
+free. What is done is determined by ``flexx.config.gc_policy``:
+
+* 'full': do a full collection each time that a session closes (the default).
+* 'young': only collect generations 0 and 1, which is much faster, and
+  leave older objects for Python's own collections.
+* 'batched': do one full collection for multiple closed sessions, when
+  the server is idle. The collection is done ``gc_interval`` seconds
+  after the previous one, or as soon as ``gc_sessions`` sessions have
+  closed since then.
+* 'never': leave it to Python.
+
+An invalid value results in a warning, and the 'full' policy is used.
+"""
+
+import gc
+import time
+
+from ..event import loop
+from .. import config
+from . import logger
+
+GC_POLICIES = 'full', 'young', 'batched', 'never'
+
+
+class GCPolicy:
+    """ Applies ``flexx.config.gc_policy`` when sessions close, and keeps
+    metrics on the collections that it does.
+    """
+
+    def __init__(self):
+        self._pending = 0  # number of sessions closed since last collection
+        self._handle = None  # scheduled (batched) collection
+        self._due = 0  # time at which the scheduled collection is due
+        self._sessions_closed = 0
+        self._collections = 0
+        self._objects_freed = 0
+        self._total_time = 0.0
+        self._max_time = 0.0
+        self._last_time = time.perf_counter()  # time of last collection
+        self._invalid_policy = None  # the last invalid value that we warned for
+
+    def _get_policy(self):
+        policy = str(config.gc_policy).lower()
+        if policy not in GC_POLICIES:
+            if policy != self._invalid_policy:
+                self._invalid_policy = policy
+                logger.warning('Invalid gc_policy %r, must be one of %s; '
+                               'using "full".' % (config.gc_policy,
+                                                  ', '.join(GC_POLICIES)))
+            policy = 'full'
+        return policy
+
+    def session_closed(self):
+        """ Called by ``Session.close()``.
+        """
+        policy = self._get_policy()
+        self._sessions_closed += 1
+        if policy == 'full':
+            self.collect()
+        elif policy == 'young':
+            self.collect(1)
+        elif policy == 'batched':
+            self._pending += 1
+            if self._pending >= max(1, config.gc_sessions):
+                self._schedule(0)
+            elif self._handle is None:
+                delay = self._last_time + config.gc_interval - time.perf_counter()
+                self._schedule(max(0, delay))
+
+    def collect(self, generation=2):
+        """ Do a collection of the given generation now, and record how
+        long it took and how many objects it freed.
+        """
+        self._cancel()
+        t0 = time.perf_counter()
+        freed = gc.collect(generation)
+        t1 = time.perf_counter()
+        self._pending = 0
+        self._collections += 1
+        self._objects_freed += freed
+        self._total_time += t1 - t0
+        self._max_time = max(self._max_time, t1 - t0)
+        self._last_time = t1
+        if loop._production is False:
+            logger.debug('GC of generation %i freed %i objects in %0.3f s' %
+                         (generation, freed, t1 - t0))
+        return freed
+
+    def _schedule(self, delay):
+        # Schedule a collection, unless an earlier one is already scheduled
+        due = time.perf_counter() + delay
+        if self._handle is not None:
+            if self._due <= due:
+                return
+            self._cancel()
+        self._due = due
+        # Use the asyncio loop that the event system is integrated with
+        self._handle = loop._asyncio_loop.call_later(delay,
+                                                     self._collect_when_idle)
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _collect_when_idle(self):
+        # Postpone while the event loop has work to do, but not for longer
+        # than one interval, so that busy servers still free their memory.
+        self._handle = None
+        if self._pending == 0:
+            return
+        overdue = time.perf_counter() - self._due
+        if loop.has_pending() and overdue < config.gc_interval:
+            self._handle = loop._asyncio_loop.call_later(0.1,
+                                                         self._collect_when_idle)
+        else:
+            self.collect()
+
+    def get_stats(self):
+        """ Get a dict with the metrics. See ``AppManager.get_gc_stats()``.
+        """
+        return dict(policy=self._get_policy(),
+                    sessions_closed=self._sessions_closed,
+                    pending=self._pending,
+                    collections=self._collections,
+                    objects_freed=self._objects_freed,
+                    total_time=self._total_time,
+                    max_time=self._max_time,
+                    )
+
+
+gc_policy = GCPolicy()
@@ -124,6 +124,7 @@ class AbstractServer:
             self._loop = loop
         asyncio.set_event_loop(self._loop)
         _loop.loop.integrate(self._loop, reset=False)
+        _loop.loop.set_time_budget(config.loop_time_budget)
 
         self._serving = None
         if host is not False:
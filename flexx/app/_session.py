@@ -3,7 +3,6 @@ Definition of the Session class.
 """
 
 import re
-import gc
 import sys
 import time
 import json
@@ -13,11 +12,16 @@ import hashlib
 import asyncio
 import weakref
 import datetime
+from collections import deque
 from http.cookies import SimpleCookie
 
+from ..event import loop
 from ..event._component import new_type
 
-from ._component2 import PyComponent, JsComponent, AppComponentMeta
+from ._component2 import (BaseAppComponent, PyComponent, JsComponent,
+                          StubComponent, AppComponentMeta)
+from ._datastore import DataStore
+from ._gcpolicy import gc_policy
 from ._asset import Asset, Bundle, solve_dependencies
 from ._assetstore import AssetStore, INDEX
 from ._assetstore import assets as assetstore
@@ -87,12 +91,20 @@ class Session:
         self._assets_to_ignore = set()  # user settable
 
         # Data for this session (in addition to the data provided by the store)
-        self._data = {}
+        self._data = DataStore()
 
         # More vars
         self._runtime = None  # init web runtime, will be set when used
         self._ws = None  # init websocket, will be set when a connection is made
         self._closing = False  # Flag to help with shutdown
+        self._closed = False  # Whether close() was called
+
+        # Count the commands written to the websocket, and keep the most
+        # recent ones, so that missed commands can be replayed on resume
+        self._sent_count = 0
+        self._sent_buffer = None
+        if config.ws_resume_grace > 0:
+            self._sent_buffer = deque(maxlen=config.ws_resume_buffer)
 
         # PyComponent or JsComponent instance, can be None if app_name is __default__
         self._component = None
@@ -113,6 +125,13 @@ class Session:
         # commands, which are send to the client as soon as it connects
         self._pending_commands = []
 
+        # Consecutive INSTANTIATE commands are combined into one command
+        self._instantiate_batch = []
+        self._instantiate_batch_ids = set()
+        # Likewise, DISPOSE commands are combined (and the acks too)
+        self._dispose_batch = []
+        self._receiving_dispose = False
+
         # request related information
         self._request = request
         if request and request.cookies:
@@ -166,6 +185,8 @@ class Session:
         * status 0: closed
         """
         if self._ws is None:
+            if self._closed:
+                return self.STATUS.CLOSED  # closed while (re)connecting
             return self.STATUS.PENDING  # not connected yet
         elif self._ws.close_code is None:
             return self.STATUS.CONNECTED  # alive and kicking
@@ -189,24 +210,36 @@ class Session:
     def close(self):
         """ Close the session: close websocket, close runtime, dispose app.
         """
+        socket_closed = self._ws is None or self._ws.close_code is not None
         # Stop guarding objects to break down any circular refs
         self._ping_calls = []
         self._closing = True  # suppress warnings for session being closed.
+        self._closed = True
+        self._sent_buffer = None
+        self._instantiate_batch = []
+        self._instantiate_batch_ids = set()
+        self._dispose_batch = []
         try:
             # Close the websocket
-            if self._ws:
+            if self._ws and not socket_closed:
                 self._ws.close_this()
             # Close the runtime
             if self._runtime:
                 self._runtime.close()
-            # Dispose the component and break the circular reference
-            if self._component is not None:
+            # Dispose the component and break the circular reference. If
+            # the connection is gone, there is no one to notify, so we
+            # dispose all components in one sweep, without sending commands.
+            if socket_closed:
+                loop._dispose_many(list(self._component_instances.values()))
+                self._component_instances.clear()
+                self._dead_component_ids.clear()
+            elif self._component is not None:
                 self._component.dispose()
-                self._component = None
+            self._component = None
             # Discard data
-            self._data = {}
-            # This might be a good time to invoke the gc
-            gc.collect()
+            self._data.clear()
+            # This might be a good time to invoke the gc (see config.gc_policy)
+            gc_policy.session_closed()
         finally:
             self._closing = False
 
@@ -220,13 +253,66 @@ class Session:
         """
         if self._ws is not None:
             raise RuntimeError('Session is already connected.')
+        self._flush_batches()  # add to the pending commands
         # Set websocket object - this is what changes the status to CONNECTED
         self._ws = ws
-        self._ws.write_command(("PRINT", "Flexx session says hi"))
+        self._write_command(("PRINT", "Flexx session says hi"))
+        if config.production:
+            self._write_command(('EXEC', 'flexx.require("flexx.event.js")'
+                                         '.loop._production = true;'))
+        if self._sent_buffer is not None:
+            self._write_command(('RESUME_GRACE', config.ws_resume_grace))
         # Send pending commands
-        for command in self._pending_commands:
-            self._ws.write_command(command)
-        self._ws.write_command(('INIT_DONE', ))
+        pending, self._pending_commands = self._pending_commands, []
+        for command in pending:
+            self._write_command(command)
+        self._write_command(('INIT_DONE', ))
+
+    def _detach_ws(self):
+        """ Called by the app manager when the websocket is lost, but the
+        session is kept alive so that the client can resume. Until then,
+        the status is pending and commands are queued.
+        """
+        self._ws = None
+
+    def _resume_ws(self, ws, last_seq):
+        """ Called by the app manager when a client reconnects to a lost
+        session. The commands that the client missed (i.e. those after
+        sequence number last_seq) are replayed, followed by the commands
+        that were queued in the meantime.
+        """
+        if self._ws is not None:
+            raise RuntimeError('Session is already connected.')
+        self._check_resume(last_seq)
+        buffer = self._sent_buffer
+        missed = self._sent_count - last_seq
+        self._flush_batches()  # add to the pending commands
+        self._ws = ws
+        for command in list(buffer)[len(buffer) - missed:]:
+            self._ws.write_command(command)  # already counted
+        pending, self._pending_commands = self._pending_commands, []
+        for command in pending:
+            self._write_command(command)
+
+    def _check_resume(self, last_seq):
+        """ Raise a RuntimeError if a client that received last_seq
+        commands cannot resume this session.
+        """
+        if self._closed or self._sent_buffer is None:
+            raise RuntimeError('Cannot resume session %s: it does not keep '
+                               'the commands that it sent.' % self.id)
+        missed = self._sent_count - last_seq
+        if missed < 0 or missed > len(self._sent_buffer):
+            raise RuntimeError('Cannot resume session %s: the missed commands '
+                               'are no longer available.' % self.id)
+
+    def _write_command(self, command):
+        """ Write a command to the websocket, keeping count.
+        """
+        self._sent_count += 1
+        if self._sent_buffer is not None:
+            self._sent_buffer.append(command)
+        self._ws.write_command(command)
 
     def _set_cookies(self, cookies=None):
         """ To set cookies, must be an http.cookie.SimpleCookie object.
@@ -325,7 +411,9 @@ class Session:
         Parameters:
             name (str): the name of the data, e.g. 'icon.png'. If data has
                 already been set on this name, it is overwritten.
-            data (bytes): the data blob.
+            data: the data blob as bytes, or a ``pathlib.Path`` to a file, an
+                mmap, or a callable that returns bytes when the data is first
+                requested.
 
         Returns:
             str: the (relative) url at which the data can be retrieved.
@@ -334,9 +422,10 @@ class Session:
             raise TypeError('Session.add_data() name must be a str.')
         if name in self._data:
             raise ValueError('Session.add_data() got existing name %r.' % name)
-        if not isinstance(data, bytes):
-            raise TypeError('Session.add_data() data must be bytes.')
-        self._data[name] = data
+        try:
+            self._data.add(name, data)
+        except (TypeError, ValueError) as err:
+            raise type(err)('Session.add_data() %s' % err)
         return 'flexx/data/%s/%s' % (self.id, name)  # relative path for  export
 
     def remove_data(self, name):
@@ -344,12 +433,12 @@ class Session:
         consider using actions instead. Note that data is automatically
         released when the session is closed.
         """
-        self._data.pop(name, None)
+        self._data.remove(name)
 
     def get_data_names(self):
         """ Get a list of names of the data provided by this session.
         """
-        return list(self._data.keys())
+        return self._data.names()
 
     def get_data(self, name):
         """ Get the data corresponding to the given name. This can be
@@ -357,11 +446,20 @@ class Session:
         by that name is unknown.
         """
         if True:
-            data = self._data.get(name, None)
+            data = self._data.get(name)
         if data is None:
             data = self._store.get_data(name)
         return data
 
+    def _get_data_entry(self, name):
+        """ Like get_data(), but returns a DataEntry, so that large data can
+        be served without copying it, and its hash can be used as ETag.
+        """
+        entry = self._data.get_entry(name)
+        if entry is None:
+            entry = self._store._get_data_entry(name)
+        return entry
+
     def _dump_data(self):
         """ Get a dictionary that contains all data specific to this session.
         The keys represent relative paths, the values are all bytes.
@@ -409,6 +507,40 @@ class Session:
         """
         return self._component_instances.get(id, None)
 
+    def create_remote(self, cls, **property_values):
+        """ Instantiate a JsComponent in JavaScript without creating a proxy
+        instance in Python. Returns a ``StubComponent`` that represents the
+        remote component; it can be used as a property value or as an
+        argument to actions of other components.
+
+        This is intended for (large amounts of) components that Python
+        does not need to interact with, e.g. static parts of a UI. If the
+        component is active (i.e. inside a ``with`` block), it is
+        instantiated in JavaScript in that same context, like a normal
+        JsComponent. A proxy instance is created when JavaScript references
+        the component (e.g. in an event or property that is synced to Python),
+        after which it can be obtained via ``get_component_instance()``.
+        """
+        if not (isinstance(cls, type) and issubclass(cls, JsComponent)):
+            raise TypeError('create_remote() needs a JsComponent subclass.')
+        for name, value in property_values.items():
+            if callable(value):
+                raise TypeError('create_remote() cannot set property %r '
+                                'using a function.' % name)
+            elif name in cls.__attributes__:
+                raise AttributeError('%s.%s is an attribute, not a property' %
+                                     (cls.__name__, name))
+        # Register the class so that the client has the needed definitions
+        self._register_component_class(cls)
+        self._component_counter += 1
+        id = cls.__name__ + '_' + str(self._component_counter)
+        # Instantiate in JS, in the context of the active components
+        active_components = [c for c in loop.get_active_components()
+                             if isinstance(c, (PyComponent, JsComponent))]
+        self.send_command('INSTANTIATE', cls.__jsmodule__, cls.__name__, id,
+                          [], property_values, active_components)
+        return StubComponent(self, id)
+
     ## JIT asset definitions
 
     def _register_component_class(self, cls):
@@ -525,16 +657,130 @@ class Session:
         argument (a string representing the type of command).
         """
         assert len(command) >= 1
+        if command[0] == 'INSTANTIATE':
+            self._flush_dispose_batch()
+            if self._add_to_instantiate_batch(command):
+                return
+        elif command[0] == 'DISPOSE':
+            self._flush_instantiate_batch()
+            if not self._dispose_batch:
+                loop.call_soon(self._flush_dispose_batch)
+            self._dispose_batch.append(command[1])
+            return
+        else:
+            self._flush_batches()
+        self._send_command_now(command)
+
+    def _send_command_now(self, command):
         if self._closing:
             pass
         elif self.status == self.STATUS.CONNECTED:
-            self._ws.write_command(command)
+            self._write_command(command)
         elif self.status == self.STATUS.PENDING:
             self._pending_commands.append(command)
         else:
             #raise RuntimeError('Cannot send commands; app is closed')
             logger.warning('Cannot send commands; app is closed')
 
+    def _add_to_instantiate_batch(self, command):
+        """ Add an INSTANTIATE command to the batch. Returns False if the
+        command must be send as-is (after the current batch), i.e. when it
+        has init args, or when its property values refer to components in the
+        batch (these would be decoded before being instantiated).
+        """
+        args, property_values = command[4], command[5]
+        if len(args) > 0 or self._refers_to_batch(property_values):
+            self._flush_instantiate_batch()
+            return False
+        if not self._instantiate_batch:
+            loop.call_soon(self._flush_instantiate_batch)
+        self._instantiate_batch.append(command)
+        self._instantiate_batch_ids.add(command[3])
+        return True
+
+    def _refers_to_batch(self, value):
+        if isinstance(value, BaseAppComponent):
+            return value.id in self._instantiate_batch_ids
+        elif isinstance(value, (tuple, list)):
+            return any(self._refers_to_batch(v) for v in value)
+        elif isinstance(value, dict):
+            return any(self._refers_to_batch(v) for v in value.values())
+        return False
+
+    def _flush_batches(self):
+        # At most one of these is non-empty
+        self._flush_instantiate_batch()
+        self._flush_dispose_batch()
+
+    def _flush_dispose_batch(self):
+        """ Send the batched DISPOSE commands. Multiple commands are
+        combined in a DISPOSE_MANY command, which holds a list of ids.
+        """
+        ids = self._dispose_batch
+        if not ids:
+            return
+        self._dispose_batch = []
+        if len(ids) == 1:
+            self._send_command_now(('DISPOSE', ids[0]))
+        else:
+            self._send_command_now(('DISPOSE_MANY', ids))
+
+    def _dispose_proxies(self, ids):
+        """ Dispose the (proxy) components with the given ids, because
+        their local counterparts are disposed.
+        """
+        components = []
+        for id in ids:
+            c = self.get_component_instance(id)
+            if c and not c._disposed:  # no need to warn if component does not exist
+                components.append(c)
+        self._receiving_dispose = True  # no need to tell the other side
+        try:
+            loop._dispose_many(components)
+        finally:
+            self._receiving_dispose = False
+        for id in ids:
+            self._component_instances.pop(id, None)  # Drop local ref now
+
+    def _flush_instantiate_batch(self):
+        """ Send the batched INSTANTIATE commands. Multiple commands are
+        combined in an INSTANTIATE_MANY command, which holds a table of
+        component classes, a table of property names, a table of (ids of)
+        active components, and a row for each component:
+        ``[class_index, id, names_index, values, active_index]``.
+        """
+        batch = self._instantiate_batch
+        if not batch:
+            return
+        self._instantiate_batch = []
+        self._instantiate_batch_ids = set()
+        if len(batch) == 1:
+            self._send_command_now(batch[0])
+            return
+        tables = [], [], []  # classes, property names, active components
+        indices = {}, {}, {}
+        def intern(i, key, value):
+            index = indices[i].get(key, None)
+            if index is None:
+                index = indices[i][key] = len(tables[i])
+                tables[i].append(value)
+            return index
+        rows = []
+        for command in batch:
+            modulename, cname, id, args, property_values = command[1:6]
+            active_components = command[6] if len(command) > 6 else None
+            names = tuple(property_values.keys())
+            row = [intern(0, (modulename, cname), [modulename, cname]),
+                   id,
+                   intern(1, names, list(names)),
+                   [property_values[name] for name in names],
+                   -1]
+            if active_components:
+                ids = tuple(c.id for c in active_components)
+                row[4] = intern(2, ids, list(ids))
+            rows.append(row)
+        self._send_command_now(('INSTANTIATE_MANY', ) + tables + (rows, ))
+
     def _receive_command(self, command):
         """ Received a command from JS.
         """
@@ -592,15 +838,18 @@ class Session:
             assert len(args) == 0
             c = cls(**kwargs)  # calls keep_alive via _register_component()
         elif cmd == 'DISPOSE':  # Gets send from local to proxy
-            id = command[1]
-            c = self.get_component_instance(id)
-            if c and not c._disposed:  # no need to warn if component does not exist
-                c._dispose()
+            self._dispose_proxies([command[1]])
             self.send_command('DISPOSE_ACK', command[1])
-            self._component_instances.pop(id, None)  # Drop local ref now
+        elif cmd == 'DISPOSE_MANY':
+            self._dispose_proxies(command[1])
+            self.send_command('DISPOSE_ACK_MANY', command[1])
         elif cmd == 'DISPOSE_ACK':  # Gets send from proxy to local
             self._component_instances.pop(command[1], None)
             self._dead_component_ids.discard(command[1])
+        elif cmd == 'DISPOSE_ACK_MANY':
+            for id in command[1]:
+                self._component_instances.pop(id, None)
+                self._dead_component_ids.discard(id)
         else:
             logger.error('Unknown command received from JS:\n%s' % command)
 
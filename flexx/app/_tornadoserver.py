@@ -17,6 +17,7 @@ from tornado import gen, netutil
 from tornado.web import Application, RequestHandler
 from tornado.ioloop import IOLoop
 from tornado.websocket import WebSocketHandler, WebSocketClosedError
+from tornado.iostream import StreamClosedError
 from tornado.httpserver import HTTPServer
 from tornado.platform.asyncio import AsyncIOMainLoop
 
@@ -28,6 +29,7 @@ from ._clientcore import serializer
 
 from . import logger
 from .. import config
+from ..event import _loop
 
 if tornado.version_info < (4, ):
     raise RuntimeError('Flexx requires Tornado v4.0 or higher.')
@@ -40,12 +42,47 @@ if tornado.version_info < (4, ):
 
 IMPORT_TIME = time.time()
 
+# Data is written in chunks of this size, flushing in between, so that
+# serving large data does not stall the loop for other sessions.
+DATA_CHUNK_SIZE = 2 ** 16
+
 
 def is_main_thread():
     """ Get whether this is the main thread. """
     return isinstance(threading.current_thread(), threading._MainThread)
 
 
+def parse_range_header(header, size):
+    """ Parse the value of an HTTP Range header for data of the given size.
+    Returns None if the header should be ignored (absent, malformed, or
+    multiple ranges), a tuple (start, end) with end exclusive, or False
+    if the range cannot be satisfied.
+    """
+    unit, _, spec = header.strip().partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        first = int(first) if first.strip() else None
+        last = int(last) if last.strip() else None
+    except ValueError:
+        return None
+    if first is None:
+        if last is None:
+            return None
+        elif last == 0:
+            return False
+        return max(0, size - last), size  # suffix range
+    elif last is not None and last < first:
+        return None
+    elif first >= size:
+        return False
+    end = size if last is None else min(last + 1, size)
+    return first, end
+
+
 class TornadoServer(AbstractServer):
     """ Flexx Server implemented in Tornado.
     """
@@ -201,7 +238,8 @@ class AppHandler(FlexxHandler):
     @gen.coroutine
     def get(self, full_path):
 
-        logger.debug('Incoming request at %r' % full_path)
+        if not config.production:
+            logger.debug('Incoming request at %r', full_path)
 
         ok_app_names = '__main__', '__default__', '__index__'
         parts = [p for p in full_path.split('/') if p]
@@ -305,7 +343,8 @@ class MainHandler(RequestHandler):
     @gen.coroutine
     def get(self, full_path):
 
-        logger.debug('Incoming request at %s' % full_path)
+        if not config.production:
+            logger.debug('Incoming request at %s', full_path)
 
         # Analyze path to derive components
         # Note: invalid app name can mean its a path relative to the main app
@@ -316,7 +355,7 @@ class MainHandler(RequestHandler):
         path = '/'.join(parts[1:])
 
         if selector in ('assets', 'assetview', 'data'):
-            self._get_asset(selector, path)  # JS, CSS, or data
+            yield self._get_asset(selector, path)  # JS, CSS, or data
         elif selector == 'info':
             self._get_info(selector, path)
         elif selector == 'cmd':
@@ -324,6 +363,7 @@ class MainHandler(RequestHandler):
         else:
             return self.write('Invalid url path "%s".' % full_path)
 
+    @gen.coroutine
     def _get_asset(self, selector, path):
 
         # Get session id and filename
@@ -384,19 +424,59 @@ class MainHandler(RequestHandler):
             return self.write('\n'.join(lines))
 
         elif selector == 'data':
-            # todo: can/do we async write in case the data is large?
 
             # Retrieve data
-            res = asset_provider.get_data(filename)
+            res = asset_provider._get_data_entry(filename)
             if res is None:
                 return self.send_error(404)
             else:
                 self._guess_mime_type(filename)  # so that images show up
-                return self.write(res)
+                yield self._write_data(res.get_buffer(), res.get_hash())
 
         else:
             raise RuntimeError('Invalid asset type %r' % selector)
 
+    @gen.coroutine
+    def _write_data(self, data, hash):
+        """ Write (part of) the given bytes or mmap, taking the ETag and
+        Range headers into account. The data is streamed in chunks.
+        """
+        size = len(data)
+        etag = '"%s"' % hash
+        self.set_header('Etag', etag)
+        self.set_header('Accept-Ranges', 'bytes')
+
+        # Client already has it?
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        # Only serve a range if the client's copy is still valid
+        start, end = 0, size
+        range_header = self.request.headers.get('Range', None)
+        if_range = self.request.headers.get('If-Range', None)
+        if range_header and (if_range is None or if_range == etag):
+            rng = parse_range_header(range_header, size)
+            if rng is False:
+                self.set_status(416)  # Range Not Satisfiable
+                self.set_header('Content-Range', 'bytes */%i' % size)
+                return
+            elif rng is not None:
+                start, end = rng
+                self.set_status(206)
+                self.set_header('Content-Range',
+                                'bytes %i-%i/%i' % (start, end - 1, size))
+
+        # Stream it
+        self.set_header('Content-Length', end - start)
+        view = memoryview(data)
+        try:
+            for i in range(start, end, DATA_CHUNK_SIZE):
+                self.write(bytes(view[i:min(i + DATA_CHUNK_SIZE, end)]))
+                yield self.flush()
+        except StreamClosedError:
+            pass  # Client went away
+
     def _get_info(self, selector, info):
         """ Provide some rudimentary information about the server.
         Note that this is publicly accesible.
@@ -410,6 +490,14 @@ class MainHandler(RequestHandler):
         info.append('Runtime: %1.1f s' % runtime)
         info.append('Number of apps: %i' % napps)
         info.append('Number of sessions: %i' % nsessions)
+        for name in manager.get_app_names():
+            stats = manager.get_pool_stats(name)
+            if stats is not None:
+                info.append('Session pool of %s: %i/%i, %i hits, %i misses, '
+                            '%i refills at %0.1f/s' %
+                            (name, stats['size'], stats['target'], stats['hits'],
+                             stats['misses'], stats['refills'],
+                             stats['refill_rate']))
 
         info = '\n'.join(['<li>%s</li>' % i for i in info])
         self.write('<ul>' + info + '</ul>')
@@ -428,8 +516,14 @@ class MainHandler(RequestHandler):
                         app_names=manager.get_app_names(),
                         nsessions=sum([len(manager.get_connections(x))
                                         for x in manager.get_app_names()]),
+                        pools={x: manager.get_pool_stats(x)
+                               for x in manager.get_app_names()
+                               if manager.get_pool_stats(x) is not None},
                         )
             self.write(json.dumps(info))
+        elif path == 'profile':
+            # Stats of the event loop, see loop.start_profiling()
+            self.write(json.dumps(_loop.loop.get_profile_stats()))
         elif path == 'stop':
             asyncio.get_event_loop().stop()
             # loop = IOLoop.current()
@@ -492,6 +586,7 @@ class WSHandler(WebSocketHandler):
                      1001: 'client closed',
                      1002: 'protocol error',
                      1003: 'could not accept data',
+                     4001: 'could not resume session',
                      }
 
     # --- callbacks
@@ -539,12 +634,18 @@ class WSHandler(WebSocketHandler):
         if self._session is None:
             if command[0] == 'HI_FLEXX':
                 session_id = command[1]
+                last_seq = command[2] if len(command) > 2 else None  # resume
                 try:
                     self._session = manager.connect_client(self, self.app_name,
                                                            session_id,
-                                                           cookies=self.cookies)
+                                                           cookies=self.cookies,
+                                                           last_seq=last_seq)
                 except Exception as err:
-                    self.close(1003, "Could not launch app: %r" % err)
+                    if last_seq is not None:
+                        # The client starts a new session on this code
+                        self.close(4001, "Could not resume session: %r" % err)
+                    else:
+                        self.close(1003, "Could not launch app: %r" % err)
                     raise
         else:
             try:
@@ -21,6 +21,7 @@ import struct
 import sys
 import zlib
 from io import BytesIO
+from collections.abc import Mapping
 
 logger = logging.getLogger(__name__)
 
@@ -191,7 +192,7 @@ class BsdfLiteSerializer(object):
             f.write(x(b'l', ext_id) + lencode(len(value)))  # L for list
             for v in value:
                 self._encode(f, v, None)
-        elif isinstance(value, dict):
+        elif isinstance(value, dict) or isinstance(value, Mapping):
             f.write(x(b'm', ext_id) + lencode(len(value)))  # M for mapping
             for key, v in value.items():
                 assert isinstance(key, str)
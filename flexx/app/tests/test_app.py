@@ -2,6 +2,8 @@ from flexx.util.testing import run_tests_if_main, raises
 
 from flexx import app, event
 
+from test_session import FakeWS
+
 
 class MyPropClass1(app.PyComponent):
     foo = event.IntProp(1, settable=True)
@@ -36,4 +38,118 @@ def test_launching_with_init_args():
     m.session.close()
 
 
+class MyPooledApp(app.PyComponent):
+    count = 0
+    def init(self):
+        MyPooledApp.count += 1
+
+
+def test_prewarmed_session_pool():
+    import asyncio
+    loop = asyncio.get_event_loop()
+
+    a = app.App(MyPooledApp)
+    a.serve('pooled_app', prewarm=2)
+    assert app.manager.get_pool_stats('pooled_app')['size'] == 0
+    assert app.manager.get_pool_stats('foo_does_not_exist') is None
+
+    # The pool is filled in the background
+    loop.run_until_complete(asyncio.sleep(0.1))
+    stats = app.manager.get_pool_stats('pooled_app')
+    assert stats['size'] == 2 and stats['target'] == 2
+    assert stats['refills'] == 2 and stats['refill_rate'] > 0
+    assert MyPooledApp.count == 2
+
+    # Sessions are handed out, and the pool is refilled
+    s1 = app.manager.create_session('pooled_app')
+    s2 = app.manager.create_session('pooled_app')
+    s3 = app.manager.create_session('pooled_app')
+    assert MyPooledApp.count == 3
+    assert app.manager.get_session_by_id(s1.id) is s1
+    stats = app.manager.get_pool_stats('pooled_app')
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    loop.run_until_complete(asyncio.sleep(0.1))
+    assert app.manager.get_pool_stats('pooled_app')['size'] == 2
+    assert MyPooledApp.count == 5
+
+    # Sessions with a custom id don't use the pool
+    s4 = app.manager.create_session('pooled_app', id='pooled_app_x')
+    assert s4.id == 'pooled_app_x'
+    assert app.manager.get_pool_stats('pooled_app')['size'] == 2
+
+    for s in (s1, s2, s3, s4):
+        s.close()
+
+
+def test_prewarmed_session_pool_on_server_loop():
+    import asyncio
+
+    # The pool is filled on the loop that the event system is integrated
+    # with, even if that happens after the app was served
+    a = app.App(MyPooledApp)
+    a.serve('pooled_app2', prewarm=1)
+    ori_aio_loop = event.loop._asyncio_loop
+    aio_loop = asyncio.new_event_loop()
+    event.loop.integrate(aio_loop, reset=False)
+    try:
+        aio_loop.run_until_complete(asyncio.sleep(0.1))
+        assert app.manager.get_pool_stats('pooled_app2')['size'] == 1
+    finally:
+        event.loop.integrate(ori_aio_loop, reset=False)
+        aio_loop.close()
+        for s in app.manager._pools.pop('pooled_app2'):
+            s.close()
+
+
+def test_resuming_attached_session():
+    from flexx import config
+
+    a = app.App(MyPropClass1)
+    a.serve('resumed_app')
+    config.ws_resume_grace = 10
+    try:
+        s = app.manager.create_session('resumed_app')
+        ws1 = FakeWS()
+        ws1._session = app.manager.connect_client(ws1, 'resumed_app', s.id)
+        n = len(ws1.commands)
+        s.send_command('EXEC', 'missed')
+
+        # A failed resume only rejects the new connection
+        for last_seq in (n + 2, -1):
+            with raises(RuntimeError):
+                app.manager.connect_client(FakeWS(), 'resumed_app', s.id,
+                                           last_seq=last_seq)
+        assert ws1.close_code is None and ws1._session is s
+        assert s.status == s.STATUS.CONNECTED
+
+        # The client reconnects before the old connection is known to be lost
+        ws2 = FakeWS()
+        assert app.manager.connect_client(ws2, 'resumed_app', s.id,
+                                          last_seq=n) is s
+        assert ws1.close_code == 1000 and ws1._session is None
+        assert ws2.commands == [('EXEC', 'missed')]
+        assert s.status == s.STATUS.CONNECTED
+
+        # Unknown sessions cannot be resumed, nor those of another app
+        with raises(RuntimeError):
+            app.manager.connect_client(FakeWS(), 'resumed_app', 'xx', last_seq=0)
+        a2 = app.App(MyPropClass1)
+        a2.serve('resumed_app2')
+        with raises(RuntimeError):
+            app.manager.connect_client(FakeWS(), 'resumed_app2', s.id,
+                                       last_seq=n + 1)
+        assert ws2.close_code is None
+    finally:
+        config.ws_resume_grace = 0
+
+    # Without a grace period, there is no resuming, nor taking over a session
+    with raises(RuntimeError):
+        app.manager.connect_client(FakeWS(), 'resumed_app', s.id, last_seq=n + 1)
+    assert ws2.close_code is None
+    assert s.status == s.STATUS.CONNECTED
+
+    s.close()
+    assert ws2.close_code == 1000
+
+
 run_tests_if_main()
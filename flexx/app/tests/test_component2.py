@@ -230,6 +230,187 @@ def test_generated_css1():
     assert MyJComponent2.CSS == ''
 
 
+class MyPComponent3(PyComponent):
+
+    PROPERTY_SYNC = 'on_demand'
+
+    foo = event.IntProp(settable=True)
+    bar = event.IntProp(settable=True, sync='eager')
+    spam = event.IntProp(settable=True, sync='never')
+
+
+class MyJComponent3(JsComponent):
+
+    foo = event.IntProp(settable=True, sync='on_demand')
+    bar = event.IntProp(settable=True)
+
+
+def test_property_sync():
+
+    assert MyPComponent2.__property_sync__ == {}
+    assert MyPComponent3.__property_sync__ == {'foo': 'on_demand', 'spam': 'never'}
+    assert MyJComponent3.JS.__property_sync__ == {'foo': 'on_demand'}
+    assert '__property_sync__ = {"foo": "on_demand"}' in MyJComponent3.JS.CODE
+
+    with raises(ValueError):
+        event.IntProp(sync='lazy')
+    with raises(ValueError):
+        class MyPComponent4(PyComponent):
+            PROPERTY_SYNC = 'lazy'
+
+    session = StubSession()
+    commands = []
+    session.send_command = lambda *command: commands.append(command)
+    c = MyPComponent3(flx_session=session)
+    event.loop.iter()
+
+    def sent():
+        x = [(cmd[3][0]['type'], cmd[3][0]['new_value']) for cmd in commands
+             if cmd[0] == 'INVOKE' and cmd[2] == '_emit_at_proxy']
+        commands[:] = []
+        return x
+
+    # Initially, only the eager property is send
+    assert sent() == [('bar', 0)]
+    c.set_foo(1)
+    c.set_bar(1)
+    c.set_spam(1)
+    event.loop.iter()
+    assert sent() == [('bar', 1)]
+
+    # When the proxy reacts to foo, it gets the current value, and updates
+    c._flx_set_event_types_at_proxy(['foo', 'spam'])
+    assert sent() == [('foo', 1)]
+    c.set_foo(2)
+    c.set_spam(2)
+    event.loop.iter()
+    assert sent() == [('foo', 2)]
+
+    # The proxy can fetch properties explicitly, but not those with "never"
+    c._flx_set_event_types_at_proxy([])
+    c.set_foo(3)
+    event.loop.iter()
+    assert sent() == []
+    c._flx_send_property_values(['foo', 'spam'])
+    assert sent() == [('foo', 3)]
+
+    # Which is what fetch_properties() on a proxy does
+    j = MyJComponent3(flx_session=session)
+    commands[:] = []
+    j.fetch_properties('foo')
+    assert commands == [('INVOKE', j.id, '_flx_send_property_values', [('foo', )])]
+
+
+def test_emit_event_with_reserved_keys():
+    from flexx.app._component2 import serializer
+
+    session = StubSession()
+    commands = []
+    session.send_command = lambda *command: commands.append(command)
+    c = MyPComponent3(flx_session=session)
+    event.loop.iter()
+    c._flx_set_event_types_at_proxy(['eggs'])
+    commands[:] = []
+
+    # Keys that are also method names of the event are sent as usual
+    c.emit('eggs', {'items': [1, 2], 'keys': 3})
+    assert len(commands) == 1
+    ev = commands[0][3][0]
+    assert isinstance(ev, event.Event)
+    assert 'items=[1, 2]' in repr(ev)
+    bb = serializer.encode(commands[0])
+    assert b'items' in bb and b'keys' in bb
+
+
+class MyPComponent5(PyComponent):
+
+    items = event.ListProp(settable=True, diff=True)
+    pair = event.TupleProp(settable=True, diff=True)
+    info = event.DictProp(settable=True, diff=True)
+    other = event.ListProp(settable=True)
+
+
+def test_property_diff():
+
+    assert MyPComponent5.__property_diff__ == ['info', 'items', 'pair']
+    assert MyPComponent2.__property_diff__ == []
+    with raises(TypeError):
+        event.IntProp(diff=True)
+
+    # Diffs of lists
+    diff = MyPComponent5._flx_diff_value
+    assert diff(None, [1, 2, 3], [1, 2, 3, 4]) == [('insert', 3, [4])]
+    assert diff(None, [1, 2, 3], [0, 1, 2, 3]) == [('insert', 0, [0])]
+    assert diff(None, [1, 2, 3], [1, 3]) == [('remove', 1, 1)]
+    assert diff(None, [1, 2, 3], [1, 5, 3]) == [('replace', 1, [5])]
+    assert diff(None, [1, 2, 3], [1, 5, 6, 3]) == [('remove', 1, 1),
+                                                   ('insert', 1, [5, 6])]
+    assert diff(None, (1, 1), (1, 1, 1)) == [('insert', 2, [1])]
+    assert diff(None, [1, 2, 3], [4, 5]) is None  # send in full
+    assert diff(None, [], [1]) is None
+    # Diffs of dicts
+    d = dict(a=1, b=2, c=3)
+    assert diff(None, d, dict(a=1, b=2, c=4)) == [('replace', -1, {'c': 4})]
+    assert diff(None, d, dict(a=1, b=2)) == [('remove', -1, ['c'])]
+    assert diff(None, d, dict(a=1, b=3, d=4)) == [('remove', -1, ['c']),
+                                                  ('replace', -1, {'b': 3, 'd': 4})]
+    assert diff(None, d, dict(x=1)) is None
+
+    # Connect a local component with a proxy
+    session = StubSession()
+    c = MyPComponent5(flx_session=session)
+    proxy = MyPComponent5.JS(flx_session=session, flx_id=c.id)
+    sent = []
+    def send_command(*command):
+        if command[0] == 'INVOKE' and command[2] == '_emit_at_proxy':
+            sent.append(command[3][0])
+            proxy._emit_at_proxy(*command[3])
+    session.send_command = send_command
+    events = []
+    proxy.reaction(lambda *evs: events.extend(evs), 'items', 'pair', 'info')
+    event.loop.iter()
+    sent[:] = []
+
+    # Changes from an empty value are send in full
+    c.set_items([1, 2, 3])
+    c.set_pair((1, 2))
+    c.set_info(dict(a=1, b=2))
+    event.loop.iter()
+    event.loop.iter()
+    assert [ev.get('patch', None) for ev in sent] == [None, None, None]
+    assert proxy.items == [1, 2, 3] and proxy.pair == (1, 2)
+
+    # Following mutations are send as a patch, and result in set events
+    sent[:] = []
+    events[:] = []
+    c.set_items([1, 2, 4, 3])
+    c.set_pair((1, 2, 3))
+    c.set_info(dict(a=1, b=3))
+    c.set_other([1])
+    event.loop.iter()
+    event.loop.iter()
+    assert [ev.get('patch', None) for ev in sent] == [
+        [('insert', 2, [4])], [('insert', 2, [3])], [('replace', -1, {'b': 3})],
+        None]
+    assert 'new_value' not in sent[0]
+    assert proxy.items == [1, 2, 4, 3]
+    assert proxy.pair == (1, 2, 3)
+    assert proxy.info == {'a': 1, 'b': 3}
+    assert proxy.other == [1]
+    assert [(ev.type, ev.mutation) for ev in events] == [
+        ('items', 'set'), ('pair', 'set'), ('info', 'set')]
+    assert events[0].old_value == [1, 2, 3]
+    assert events[0].new_value == [1, 2, 4, 3]
+
+    # Changes that are not smaller than the value are send in full
+    sent[:] = []
+    c.set_items([5])
+    event.loop.iter()
+    event.loop.iter()
+    assert sent[0]['new_value'] == [5]
+    assert proxy.items == [5]
+
+
 def test_misc():
     clss = app.get_component_classes()
     assert PyComponent in clss and JsComponent in clss
@@ -241,4 +422,76 @@ def test_misc():
     assert PyComponent in app.get_component_classes()
 
 
+class MyJComponent6(JsComponent):
+
+    a1 = event.IntProp(settable=True)
+    a2 = event.IntProp(settable=True)
+    a3 = event.FloatProp(settable=True)
+    a4 = event.FloatProp(settable=True)
+    a5 = event.StringProp(settable=True)
+    a6 = event.StringProp(settable=True)
+    a7 = event.BoolProp(settable=True)
+    a8 = event.BoolProp(settable=True)
+    a9 = event.TupleProp(settable=True)
+    a10 = event.TupleProp(settable=True)
+    a11 = event.ListProp(settable=True)
+    a12 = event.ListProp(settable=True)
+    a13 = event.AnyProp(settable=True)
+    a14 = event.AnyProp(settable=True)
+    a15 = event.ComponentProp(settable=True)
+    a16 = event.ComponentProp(settable=True)
+
+
+class OldLayout:
+    pass
+
+
+def old_layout(c):
+    # Mimic how a component stored its state before: each property value in
+    # an attribute, and a list in the handler dict per property and emitter.
+    ob = OldLayout()
+    for key, val in c.__dict__.items():
+        if key != '__property_values__':
+            setattr(ob, key, val)
+    for name in c.__properties__:
+        setattr(ob, '_' + name + '_value', getattr(c, name))
+    ob._Component__handlers = {type: [] for type in
+                               c.__properties__ + c.__emitters__}
+    return ob
+
+
+def test_proxy_memory():
+    import gc
+    import tracemalloc
+
+    def measure(func, n=500):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            m0 = tracemalloc.get_traced_memory()[0]
+            obs = [func() for i in range(n)]
+            event.loop.iter()  # handle the initial events
+            gc.collect()
+            return (tracemalloc.get_traced_memory()[0] - m0) / n, obs
+        finally:
+            tracemalloc.stop()
+
+    session = StubSession()
+    MyJComponent6(flx_session=session)
+    proxy_bytes, proxies = measure(lambda: MyJComponent6(flx_session=session))
+    assert proxies[0].__property_values__ is MyJComponent6.__property_values__
+
+    # Values that are not the default are stored per instance
+    c = MyJComponent6(flx_session=session)
+    c._emit_at_proxy(dict(type='a1', new_value=3, mutation='set'))
+    event.loop.iter()
+    assert c.a1 == 3 and proxies[0].a1 == 0
+    assert c.__property_values__ is not MyJComponent6.__property_values__
+
+    # Compared to the old layout, a proxy takes at least 3x less memory
+    proxy_iter = iter(proxies)
+    old_bytes, _ = measure(lambda: old_layout(next(proxy_iter)))
+    assert old_bytes / proxy_bytes >= 3
+
+
 run_tests_if_main()
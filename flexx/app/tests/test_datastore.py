@@ -0,0 +1,193 @@
+""" Test the data store.
+"""
+
+import os
+import mmap
+import tempfile
+from pathlib import Path
+
+from flexx.util.testing import run_tests_if_main, raises
+
+from flexx import config
+from flexx.app import _datastore
+from flexx.app._datastore import DataStore, MemoryBudget
+
+
+def test_datastore_types():
+
+    s = DataStore()
+    assert len(s) == 0
+
+    # Bytes
+    s.add('a', b'aaaa')
+    assert s.get('a') == b'aaaa'
+    assert s.get_entry('a').get_buffer() == b'aaaa'
+
+    # File path
+    filename = os.path.join(tempfile.gettempdir(), 'flexx_test_data.bin')
+    with open(filename, 'wb') as f:
+        f.write(b'bbbb')
+    s.add('b', Path(filename))
+    assert s.get('b') == b'bbbb'
+    assert isinstance(s.get_entry('b').get_buffer(), mmap.mmap)
+
+    # Or another object that represents a path
+    class MyPath:
+        def __fspath__(self):
+            return filename
+    s.add('b2', MyPath())
+    assert s.get('b2') == b'bbbb'
+    s.remove('b2')
+
+    # Mmap
+    m = mmap.mmap(-1, 4)
+    m.write(b'cccc')
+    s.add('c', m)
+    assert s.get('c') == b'cccc'
+    assert s.get_entry('c').get_buffer() is m
+
+    # Callable, is called only once, when needed
+    calls = []
+    def func():
+        calls.append(1)
+        return b'dddd'
+    s.add('d', func)
+    assert calls == []
+    assert s.get('d') == b'dddd'
+    assert s.get('d') == b'dddd'
+    assert calls == [1]
+
+    assert len(s) == 4
+    assert s.names() == ['a', 'b', 'c', 'd']
+    assert 'a' in s and 'x' not in s
+    assert s.get('x') is None and s.get_entry('x') is None
+
+    # Remove
+    s.remove('b')
+    s.remove('x')  # no-op
+    assert s.names() == ['a', 'c', 'd']
+    assert os.path.isfile(filename)  # we don't own this file
+    s.clear()
+    assert len(s) == 0
+    assert not m.closed  # nor this map
+    os.remove(filename)
+
+    # Wrong types
+    with raises(TypeError):
+        s.add('x', 3)
+    with raises(TypeError):
+        s.add('x', filename)  # str is not accepted as a path
+    with raises(ValueError):
+        s.add('x', Path(filename))  # not an existing file
+    s.add('x', lambda: 'not bytes')
+    with raises(TypeError):
+        s.get('x')
+
+
+def test_datastore_memory_budget():
+
+    # Use a fresh budget, so that data from other tests does not interfere
+    budget_ori, _datastore._budget = _datastore._budget, MemoryBudget()
+    config.data_memory_limit = 25
+    try:
+        s = DataStore()
+        s.add('a', b'a' * 10)
+        s.add('b', b'b' * 10)
+        assert _datastore._budget.nbytes == 20
+        assert s._entries['a'].in_memory and s._entries['b'].in_memory
+
+        # Touch a, so that b is the least recently used
+        assert s.get('a') == b'a' * 10
+        s.add('c', b'c' * 10)
+        assert s._entries['a'].in_memory and s._entries['c'].in_memory
+        assert not s._entries['b'].in_memory
+        assert _datastore._budget.nbytes == 20
+
+        # Spilled data is served from disk
+        path = s._entries['b']._path
+        assert os.path.isfile(path)
+        assert isinstance(s.get_entry('b').get_buffer(), mmap.mmap)
+        assert s.get('b') == b'b' * 10
+
+        # Clearing releases memory and spilled files
+        s.clear()
+        assert _datastore._budget.nbytes == 0
+        assert not os.path.isfile(path)
+
+    finally:
+        config.data_memory_limit = 0
+        _datastore._budget = budget_ori
+
+
+def test_datastore_dedup():
+
+    n = len(_datastore._pool)
+    data = b'shared data ' * 10
+    stores = [DataStore() for i in range(10)]
+    for s in stores:
+        s.add('logo.png', bytes(bytearray(data)))  # a new bytes object
+        s.add('other.png', data)
+    assert len(_datastore._pool) == n + 1
+
+    # All refer to the same entry
+    entry = stores[0].get_entry('logo.png')
+    assert entry.refs == 20
+    assert entry.get_hash() == _datastore.hash_data(data)
+    for s in stores:
+        assert s.get_entry('logo.png') is entry
+        assert s.get_entry('other.png') is entry
+
+    # Generated data is deduplicated when it is produced
+    stores[0].add('gen.png', lambda: data)
+    assert stores[0].get('gen.png') == data
+    assert stores[0].get_entry('gen.png') is entry
+    assert entry.refs == 21
+
+    # Freed when no longer used
+    for s in stores:
+        s.clear()
+    assert entry.refs == 0
+    assert not entry.in_memory
+    assert len(_datastore._pool) == n
+
+    # Different data gets a different hash
+    s = DataStore()
+    s.add('a', b'aaa')
+    s.add('b', b'bbb')
+    assert s.get_entry('a').get_hash() != s.get_entry('b').get_hash()
+    s.clear()
+
+
+def test_datastore_file_hash():
+
+    filename = os.path.join(tempfile.gettempdir(), 'flexx_test_data.bin')
+    with open(filename, 'wb') as f:
+        f.write(b'bbbb')
+    s = DataStore()
+    try:
+        # The hash of a file is obtained without reading the file
+        s.add('b', Path(filename))
+        entry = s.get_entry('b')
+        h = entry.get_hash()
+        assert entry._mmap is None
+        assert h != _datastore.hash_data(b'bbbb')
+        assert entry.get_hash() == h
+
+        # A changed file gets another hash
+        with open(filename, 'wb') as f:
+            f.write(b'bbbbb')
+        s.add('b', Path(filename))
+        assert s.get_entry('b').get_hash() != h
+
+        # Maps with the same content get another hash too
+        for name in 'cd':
+            m = mmap.mmap(-1, 4)
+            m.write(b'cccc')
+            s.add(name, m)
+        assert s.get_entry('c').get_hash() != s.get_entry('d').get_hash()
+    finally:
+        s.clear()
+        os.remove(filename)
+
+
+run_tests_if_main()
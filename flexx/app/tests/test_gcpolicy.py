@@ -0,0 +1,96 @@
+""" Test the garbage collection policy for closing sessions.
+"""
+
+import asyncio
+
+from flexx.util.testing import run_tests_if_main
+
+from flexx import config, event
+from flexx.app._gcpolicy import GCPolicy
+
+
+class Cycle:
+
+    def __init__(self):
+        self.me = self
+
+
+def run_briefly(aio_loop, t=0.05):
+    aio_loop.run_until_complete(asyncio.sleep(t))
+
+
+def test_gc_policy_immediate():
+
+    p = GCPolicy()
+    try:
+        config.gc_policy = 'full'
+        Cycle()
+        p.session_closed()
+        stats = p.get_stats()
+        assert stats['policy'] == 'full'
+        assert stats['sessions_closed'] == 1
+        assert stats['collections'] == 1
+        assert stats['objects_freed'] >= 1
+        assert stats['total_time'] >= stats['max_time'] > 0
+
+        config.gc_policy = 'young'
+        p.session_closed()
+        assert p.get_stats()['collections'] == 2
+
+        config.gc_policy = 'never'
+        p.session_closed()
+        stats = p.get_stats()
+        assert stats['sessions_closed'] == 3
+        assert stats['collections'] == 2
+
+        # An invalid policy does not break closing sessions
+        config.gc_policy = 'sometimes'
+        p.session_closed()
+        stats = p.get_stats()
+        assert stats['policy'] == 'full'
+        assert stats['collections'] == 3
+    finally:
+        config.gc_policy = 'full'
+
+
+def test_gc_policy_batched():
+
+    ori_aio_loop = event.loop._asyncio_loop
+    aio_loop = asyncio.new_event_loop()
+    event.loop.integrate(aio_loop, reset=False)
+    p = GCPolicy()
+    try:
+        config.gc_policy = 'batched'
+        config.gc_interval = 0.1
+        config.gc_sessions = 3
+
+        # One collection, one interval after the previous one
+        event.loop.iter()  # the collection waits for the loop to be idle
+        p.session_closed()
+        p.session_closed()
+        assert p.get_stats()['pending'] == 2
+        run_briefly(aio_loop)
+        assert p.get_stats()['collections'] == 0
+        run_briefly(aio_loop, 0.1)
+        stats = p.get_stats()
+        assert stats['collections'] == 1
+        assert stats['pending'] == 0
+
+        # Or as soon as enough sessions have closed
+        config.gc_interval = 10
+        for i in range(3):
+            p.session_closed()
+        run_briefly(aio_loop)
+        stats = p.get_stats()
+        assert stats['collections'] == 2
+        assert stats['sessions_closed'] == 5
+    finally:
+        p._cancel()
+        config.gc_policy = 'full'
+        config.gc_interval = 10.0
+        config.gc_sessions = 100
+        event.loop.integrate(ori_aio_loop, reset=False)
+        aio_loop.close()
+
+
+run_tests_if_main()
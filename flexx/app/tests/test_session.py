@@ -5,7 +5,7 @@ import sys
 import weakref
 import asyncio
 
-from flexx import app
+from flexx import app, event
 from flexx.app import Session
 from flexx.app._assetstore import assets, AssetStore as _AssetStore
 
@@ -60,7 +60,7 @@ def test_session_assets_data():
     # get_data()
     assert s.get_data('xx') == b'xxxx'
     assert s.get_data('zz') is None
-    assert s.get_data('ww') is b'wwww'
+    assert s.get_data('ww') == b'wwww'
 
     # # Add url data
     # s.add_data('readme', 'https://github.com/flexxui/flexx/blob/master/README.md')
@@ -85,12 +85,84 @@ def test_session_assets_data():
         s.add_data(4, b'zzzz')  # name not a str
 
     # get_data()
-    assert s.get_data('xx') is b'xxxx'
+    assert s.get_data('xx') == b'xxxx'  # may be a shared copy
     assert s.get_data('ww') is store.get_data('ww')
     assert s.get_data('ww') == b'wwww'
     assert s.get_data('bla') is None
 
 
+class FakeWS:
+
+    def __init__(self):
+        self.close_code = None
+        self.commands = []
+        self._session = None
+
+    def write_command(self, cmd):
+        self.commands.append(cmd)
+
+    def close(self, code=1000, reason=''):
+        self.close_code = code
+
+    def close_this(self):
+        self.close(1000)
+
+
+def test_session_resume():
+
+    from flexx import config
+    config.ws_resume_grace = 10
+    config.ws_resume_buffer = 5
+    try:
+        s = Session('', AssetStore())
+    finally:
+        config.ws_resume_grace = 0
+        config.ws_resume_buffer = 1000
+
+    s.send_command('EXEC', 'pending')
+    ws1 = FakeWS()
+    s._set_ws(ws1)
+    assert [c[0] for c in ws1.commands] == ['PRINT', 'RESUME_GRACE', 'EXEC', 'INIT_DONE']
+    for i in range(3):
+        s.send_command('EXEC', i)
+    assert len(ws1.commands) == 7
+
+    # Connection lost after the client received 5 commands
+    s._detach_ws()
+    assert s.status == s.STATUS.PENDING
+    s.send_command('EXEC', 'queued')
+
+    # Resume: replay the missed commands, then the queued ones
+    ws2 = FakeWS()
+    s._resume_ws(ws2, 5)
+    assert s.status == s.STATUS.CONNECTED
+    assert ws2.commands == [('EXEC', 1), ('EXEC', 2), ('EXEC', 'queued')]
+    with raises(RuntimeError):
+        s._resume_ws(FakeWS(), 8)  # already connected
+
+    # Lose it again, but now the client missed more than we kept
+    s._detach_ws()
+    for i in range(5):
+        s.send_command('EXEC', i)  # these are queued, not counted
+    assert s._sent_count == 8
+    with raises(RuntimeError):
+        s._resume_ws(FakeWS(), 2)
+    with raises(RuntimeError):
+        s._resume_ws(FakeWS(), 9)  # client cannot be ahead
+    ws3 = FakeWS()
+    s._resume_ws(ws3, 8)
+    assert len(ws3.commands) == 5
+    assert s._sent_count == 13
+
+    # Without grace, nothing is kept
+    s = Session('', AssetStore())
+    s._set_ws(FakeWS())
+    assert s._sent_buffer is None
+    s._detach_ws()
+    with raises(RuntimeError):
+        s._resume_ws(FakeWS(), 1)
+
+
 def test_session_registering_component_classes():
     try:
         from flexx import ui
@@ -121,6 +193,132 @@ def test_session_registering_component_classes():
          s._register_component_class(3)
 
 
+def test_session_create_remote():
+    try:
+        from flexx import ui
+    except ImportError:
+        skip('no flexx.ui')
+
+    store = AssetStore()
+    store.update_modules()
+
+    s = Session('', store)
+    commands = []
+    s.send_command = lambda *command: commands.append(command)
+
+    with raises(TypeError):
+        s.create_remote(Fooo1)
+    with raises(TypeError):
+        s.create_remote(ui.Label, text=lambda: 'x')
+    with raises(AttributeError):
+        s.create_remote(ui.Label, session=s)
+    assert not commands
+
+    stub = s.create_remote(ui.Label, text='hi')
+    assert isinstance(stub, app.StubComponent)
+    assert stub.session is s
+    assert ui.Label in s._present_classes
+
+    # No proxy instance is kept in Python
+    assert s.get_component_instance(stub.id) is None
+    instantiate = [c for c in commands if c[0] == 'INSTANTIATE']
+    assert instantiate == [('INSTANTIATE', ui.Label.__jsmodule__, 'Label',
+                            stub.id, [], {'text': 'hi'}, [])]
+
+
+def test_session_instantiate_many():
+    try:
+        from flexx import ui
+    except ImportError:
+        skip('no flexx.ui')
+
+    store = AssetStore()
+    store.update_modules()
+
+    s = Session('', store)
+    with ui.VBox(flx_session=s) as box:
+        labels = [ui.Label(text=str(i)) for i in range(3)]
+        ui.Label(text='x', parent=labels[0])  # must be send separately
+        ui.Label()
+
+    ws = FakeWS()
+    s._set_ws(ws)
+    commands = [c for c in ws.commands if c[0].startswith('INSTANTIATE')]
+    assert [c[0] for c in commands] == ['INSTANTIATE', 'INSTANTIATE_MANY',
+                                        'INSTANTIATE', 'INSTANTIATE']
+    assert commands[0][3] == box.id
+
+    _, classes, names, actives, rows = commands[1]
+    assert classes == [[ui.Label.__jsmodule__, 'Label']]
+    assert names == [['text', 'flx_has_proxy']]
+    assert actives == [[box.id]]
+    assert rows == [[0, labels[i].id, 0, [str(i), True], 0] for i in range(3)]
+
+    # A single component is send as a normal INSTANTIATE
+    assert commands[2][5]['parent'] is labels[0]
+    assert commands[3][5] == {'flx_has_proxy': True}
+
+    # Once connected, the batch is send at the end of the loop iteration
+    n = len(ws.commands)
+    with ui.VBox(flx_session=s) as box:
+        ui.Label()
+        ui.Label()
+    assert len(ws.commands) == n
+    event.loop.iter()
+    assert ws.commands[-1][0] == 'INSTANTIATE_MANY'
+    assert len(ws.commands[-1][4]) == 3
+
+
+def test_session_dispose_many():
+    try:
+        from flexx import ui
+    except ImportError:
+        skip('no flexx.ui')
+
+    store = AssetStore()
+    store.update_modules()
+
+    s = Session('', store)
+    ws = FakeWS()
+    s._set_ws(ws)
+
+    # Consecutive DISPOSE commands are combined
+    components = [Fooo1(flx_session=s) for i in range(3)]
+    event.loop.iter()
+    n = len(ws.commands)
+    for c in components:
+        c.dispose()
+    assert len(ws.commands) == n
+    event.loop.iter()
+    ids = [c.id for c in components]
+    assert ws.commands[n:] == [('DISPOSE_MANY', ids)]
+    assert all(id in s._dead_component_ids for id in ids)
+
+    s._receive_command(['DISPOSE_ACK_MANY', ids])
+    assert not any(id in s._dead_component_ids for id in ids)
+
+    # Proxies that are disposed by the other side are acked in one go
+    with ui.VBox(flx_session=s):
+        labels = [ui.Label() for i in range(3)]
+    event.loop.iter()
+    n = len(ws.commands)
+    ids = [label.id for label in labels]
+    s._receive_command(['DISPOSE_MANY', ids])
+    assert all(label._disposed for label in labels)
+    assert ws.commands[n:] == [('DISPOSE_ACK_MANY', ids)]
+    assert not any(s.get_component_instance(id) for id in ids)
+
+    # Closing a session when the socket is closed does not send anything
+    components = [Fooo1(flx_session=s) for i in range(3)]
+    event.loop.iter()
+    n = len(ws.commands)
+    ws.close_code = 1000
+    s.close()
+    event.loop.iter()
+    assert len(ws.commands) == n
+    assert all(c._disposed for c in components)
+
+
 ## Prepare module loading tests
 
 from flexx.event._component import new_type
@@ -0,0 +1,31 @@
+""" Test parts of the Tornado server that can be tested without a browser.
+"""
+
+from flexx.util.testing import run_tests_if_main
+
+from flexx.app._tornadoserver import parse_range_header
+
+
+def test_parse_range_header():
+
+    # Normal ranges, end is exclusive and clipped
+    assert parse_range_header('bytes=0-99', 1000) == (0, 100)
+    assert parse_range_header('bytes=100-', 1000) == (100, 1000)
+    assert parse_range_header('bytes=900-2000', 1000) == (900, 1000)
+    assert parse_range_header(' bytes = 5-5 ', 1000) == (5, 6)
+
+    # Suffix ranges
+    assert parse_range_header('bytes=-100', 1000) == (900, 1000)
+    assert parse_range_header('bytes=-2000', 1000) == (0, 1000)
+
+    # Unsatisfiable
+    assert parse_range_header('bytes=1000-', 1000) is False
+    assert parse_range_header('bytes=-0', 1000) is False
+
+    # Ignored: malformed, other units, multiple ranges
+    for header in ('bytes=', 'bytes=-', 'bytes=a-b', 'bytes=10-5', 'items=0-9',
+                   'bytes=0-9,20-29', 'foo'):
+        assert parse_range_header(header, 1000) is None
+
+
+run_tests_if_main()
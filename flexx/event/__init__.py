@@ -11,7 +11,7 @@ assert sys.version_info > (3, 5), "Flexx.event needs Python 3.5+"
 del sys
 
 # flake8: noqa
-from ._dict import Dict
+from ._dict import Dict, Event
 from ._loop import Loop, loop
 from ._action import Action, action
 from ._reaction import Reaction, reaction
@@ -86,6 +86,22 @@ class BaseDescriptor:
             return '{}*{}* –{}{}\n'.format(prefix, kind, betweenfix, doc or name)
 
 
+class InstanceDoc:
+    """ Docstring descriptor for classes that use ``__slots__``, so that
+    their instances can still have their own docstring. The class docstring
+    is preserved.
+    """
+
+    def __init__(self, class_doc, get_doc):
+        self._class_doc = class_doc
+        self._get_doc = get_doc
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self._class_doc
+        return self._get_doc(instance)
+
+
 class ActionDescriptor(BaseDescriptor):
     """ Class descriptor for actions.
     """
@@ -94,6 +110,7 @@ class ActionDescriptor(BaseDescriptor):
         self._func = func
         self._name = name
         self.__doc__ = self._format_doc('action', name, doc, func)
+        self.is_autogenerated = func.__name__ == 'flx_setter'
 
     def __get__(self, instance, owner):
         # Return Action object, which we cache on the instance
@@ -123,6 +140,10 @@ class Action:
     directly; use ``event.action()`` instead.
     """
 
+    # Use slots, since there can be many instances
+    __slots__ = ('_ob1', '_func', '_func_once', '_name', '_doc', 'is_autogenerated',
+                 '__weakref__')
+
     def __init__(self, ob, func, name, doc):
         assert callable(func)
 
@@ -131,7 +152,7 @@ class Action:
         self._func = func
         self._func_once = func
         self._name = name
-        self.__doc__ = doc
+        self._doc = doc
         self.is_autogenerated = func.__name__ == 'flx_setter'  # also see _js.py
 
     def __repr__(self):
@@ -159,3 +180,6 @@ class Action:
             loop.add_action_invokation(self, args)
 
         return ob  # 'Actions are invoked asynchronously'
+
+
+Action.__doc__ = InstanceDoc(Action.__doc__, lambda ob: ob._doc)
@@ -6,7 +6,7 @@ events and changes in properties.
 
 import sys
 
-from ._dict import Dict
+from ._dict import Event
 from ._attribute import Attribute
 from ._action import ActionDescriptor, Action
 from ._reaction import ReactionDescriptor, Reaction, looks_like_method
@@ -120,6 +120,7 @@ class ComponentMeta(type):
                 actions[name] = val
             elif isinstance(val, ReactionDescriptor):
                 reactions[name] = val
+                val.get_connection_plan()  # precompile, once per class
             elif isinstance(val, EmitterDescriptor):
                 emitters[name] = val
             elif isinstance(val, (Action, Reaction)):  # pragma: no cover
@@ -132,6 +133,17 @@ class ComponentMeta(type):
         cls.__actions__ = [name for name in sorted(actions.keys())]
         cls.__emitters__ = [name for name in sorted(emitters.keys())]
         cls.__reactions__ = [name for name in sorted(reactions.keys())]
+        # Precompute what _mutate() needs (Python only). Property values are
+        # stored in a list, at the index of the property in __properties__.
+        # The list on the class holds the defaults. Instances share it until
+        # they set a value that is not the default.
+        cls.__property_index__ = {name: i
+                                  for i, name in enumerate(cls.__properties__)}
+        cls.__property_values__ = [properties[name]._default
+                                   for name in cls.__properties__]
+        cls.__property_info__ = {name: (cls.__property_index__[name],
+                                        getattr(cls, '_' + name + '_validate'))
+                                 for name in cls.__properties__}
 
 
 class Component(with_metaclass(ComponentMeta, object)):
@@ -186,10 +198,12 @@ class Component(with_metaclass(ComponentMeta, object)):
         Component._COUNT += 1
         self._id = self.__class__.__name__ + str(Component._COUNT)
         self._disposed = False
+        self.__property_values__ = self.__class__.__property_values__
 
         # Init some internal variables. Note that __reactions__ is a list of
         # reaction names for this class, and __handlers a dict of reactions
-        # registered to events of this object.
+        # registered to events of this object. The lists in __handlers are
+        # created when the first reaction registers for that event type.
         # The __pending_events makes that reactions that connect to this
         # component right after it initializes get the initial events.
         self.__handlers = {}
@@ -197,12 +211,6 @@ class Component(with_metaclass(ComponentMeta, object)):
         self.__anonymous_reactions = []
         self.__initial_mutation = False
 
-        # Prepare handlers with event types that we know
-        for name in self.__emitters__:
-            self.__handlers.setdefault(name, [])
-        for name in self.__properties__:
-            self.__handlers.setdefault(name, [])
-
         # With self as the active component (and thus mutable), init the
         # values of all properties, and apply user-defined initialization
         with self:
@@ -227,7 +235,6 @@ class Component(with_metaclass(ComponentMeta, object)):
         # First collect default property values (they come first)
         for name in self.__properties__:  # is sorted by name
             prop = getattr(self.__class__, name)
-            setattr(self, '_' + name + '_value', prop._default)
             if name not in property_values:
                 values.append((name, prop._default))
         # Then collect user-provided values
@@ -265,11 +272,15 @@ class Component(with_metaclass(ComponentMeta, object)):
         # of properties that have one (and that is not auto-generated)
         for name, value in values:
             setter_name = ('_set' if name.startswith('_') else 'set_') + name
-            setter = getattr(self, setter_name, None)
+            if this_is_js():
+                setter = getattr(self, setter_name, None)
+            else:
+                # Check the descriptor, so we don't create Action objects
+                setter = getattr(self.__class__, setter_name, None)
             if setter is not None:
                 if getattr(setter, 'is_autogenerated', None) is False:
                     # This is an action, and one that the user wrote
-                    setter(value)
+                    getattr(self, setter_name)(value)
         self.__initial_mutation = False
 
     def _comp_make_implicit_setter(self, prop_name, func):
@@ -293,12 +304,12 @@ class Component(with_metaclass(ComponentMeta, object)):
         for name in self.__reactions__:
             reaction = getattr(self, name)
             if reaction.get_mode() == 'auto':
-                ev = Dict(source=self, type='', label='')
+                ev = Event(source=self, type='', label='')
                 loop.add_reaction_event(reaction, ev)
         # Also invoke the anonymouse auto-reactions
         for reaction in self.__anonymous_reactions:
             if reaction.get_mode() == 'auto':
-                ev = Dict(source=self, type='', label='')
+                ev = Event(source=self, type='', label='')
                 loop.add_reaction_event(reaction, ev)
 
     def _comp_stop_capturing_events(self):
@@ -321,7 +332,8 @@ class Component(with_metaclass(ComponentMeta, object)):
 
     def __enter__(self):
         loop._activate_component(self)
-        loop.call_soon(self.__check_not_active)
+        if loop._production is False:
+            loop.call_soon(self.__check_not_active)
         return self
 
     def __exit__(self, type, value, traceback):
@@ -329,8 +341,7 @@ class Component(with_metaclass(ComponentMeta, object)):
 
     def __check_not_active(self):
         # Note: this adds overhead, especially during initialization, but it
-        # is a valuable check ... it is something that could potentially be
-        # disabled in "production mode".
+        # is a valuable check ... it is disabled in "production mode".
         active_components = loop.get_active_components()
         if self in active_components:
             raise RuntimeError('It seems that the event loop is processing '
@@ -369,10 +380,16 @@ class Component(with_metaclass(ComponentMeta, object)):
 
         self._disposed = True
         if not this_is_js():
-            logger.debug('Disposing Component %r' % self)
+            if loop._production is False:
+                logger.debug('Disposing Component %r', self)
+        sweep = loop._dispose_sweep
         for name, reactions in self.__handlers.items():
             for i in range(len(reactions)):
-                reactions[i][1]._clear_component_refs(self)
+                reaction = reactions[i][1]
+                if sweep is None:
+                    reaction._clear_component_refs(self)
+                else:
+                    sweep[reaction._id] = reaction  # cleaned up by the loop
             while len(reactions):
                 reactions.pop()  # no list.clear on legacy py
         for i in range(len(self.__reactions__)):
@@ -380,9 +397,11 @@ class Component(with_metaclass(ComponentMeta, object)):
 
     def _registered_reactions_hook(self):
         """ This method is called when the reactions change, can be overloaded
-        in subclasses. The original method returns a list of event types for
-        which there is at least one registered reaction. Overloaded methods
-        should return this list too.
+        in subclasses. It is called (at most once per component) at the end
+        of the event loop iteration in which the reactions changed. The
+        original method returns a list of event types for which there is at
+        least one registered reaction. Overloaded methods should return this
+        list too.
         """
         used_event_types = []
         for key, reactions in self.__handlers.items():
@@ -403,6 +422,8 @@ class Component(with_metaclass(ComponentMeta, object)):
             self.__handlers[type] = reactions
             if force:
                 pass
+            elif type in self.__properties__ or type in self.__emitters__:
+                pass
             elif type.startswith('mouse_'):
                 t = 'The event "{}" has been renamed to "pointer{}".'
                 logger.warning(t.format(type, type[5:]))
@@ -424,8 +445,8 @@ class Component(with_metaclass(ComponentMeta, object)):
         else:
             reactions.append((label, reaction))
 
-        # Call hook to keep (subclasses of) the component up to date
-        self._registered_reactions_hook()
+        # Schedule hook to keep (subclasses of) the component up to date
+        loop._add_reactions_hook(self)
 
     def disconnect(self, type, reaction=None):
         """ Disconnect reactions.
@@ -446,7 +467,7 @@ class Component(with_metaclass(ComponentMeta, object)):
             if not ((label and label != entry[0]) or
                     (reaction and reaction is not entry[1])):
                 reactions.pop(i)
-        self._registered_reactions_hook()
+        loop._add_reactions_hook(self)
 
     def emit(self, type, info=None):
         """ Generate a new event and dispatch to all event reactions.
@@ -454,7 +475,7 @@ class Component(with_metaclass(ComponentMeta, object)):
         Arguments:
             type (str): the type of the event. Should not include a label.
             info (dict): Optional. Additional information to attach to
-                the event object. Note that the actual event is a Dict object
+                the event object. Note that the actual event is an Event object
                 that allows its elements to be accesses as attributes.
         """
         info = {} if info is None else info
@@ -462,10 +483,10 @@ class Component(with_metaclass(ComponentMeta, object)):
         if len(label):
             raise ValueError('The type given to emit() should not include a label.')
         # Prepare event
-        if not isinstance(info, dict):
+        if not (isinstance(info, dict) or isinstance(info, Event)):
             raise TypeError('Info object (for %r) must be a dict, not %r' %
                             (type, info))
-        ev = Dict(info)  # make copy and turn into nicer Dict on py
+        ev = Event(info)  # make copy and turn into nicer Event on py
         ev.type = type
         ev.source = self
         # Push the event to the reactions (reactions use labels for dynamism)
@@ -481,7 +502,7 @@ class Component(with_metaclass(ComponentMeta, object)):
                 if label.startswith('reconnect_'):
                     if getattr(ev, 'allow_reconnect', True) is True:
                         index = int(label.split('_')[1])
-                        reaction.reconnect(index)
+                        reaction.reconnect(index, ev)
                 else:
                     loop.add_reaction_event(reaction, ev)
         return ev
@@ -513,7 +534,13 @@ class Component(with_metaclass(ComponentMeta, object)):
         if not isinstance(prop_name, str):
             raise TypeError("_mutate's first arg must be str, not %s" %
                              prop_name.__class__)
-        if prop_name not in self.__properties__:
+        if this_is_js():
+            info = None
+            if prop_name in self.__properties__:
+                info = '_' + prop_name + '_value', None
+        else:
+            info = self.__property_info__.get(prop_name, None)
+        if info is None:
             cname = self.__class__.__name__
             raise AttributeError('%s object has no property %r' % (cname, prop_name))
 
@@ -521,17 +548,28 @@ class Component(with_metaclass(ComponentMeta, object)):
             raise AttributeError('Trying to mutate property %s outside '
                                  'of an action or context.' % prop_name)
 
-        # Prepare
-        private_name = '_' + prop_name + '_value'
-        validator_name = '_' + prop_name + '_validate'
+        # Prepare - in Python, the validator is bound once per class, and
+        # the key is the index in the list of values instead of a name
+        key, validator = info
 
         # Set / Emit
-        old = getattr(self, private_name)
+        if this_is_js():
+            old = getattr(self, key)
+        else:
+            values = self.__property_values__
+            old = values[key]
 
         if mutation == 'set':
             # Normal setting of a property
-            value2 = getattr(self, validator_name)(value)
-            setattr(self, private_name, value2)
+            if validator is None:
+                validator = getattr(self, '_' + prop_name + '_validate')
+            value2 = validator(value)
+            if this_is_js():
+                setattr(self, key, value2)
+            elif value2 is not old:
+                if values is self.__class__.__property_values__:
+                    values = self.__property_values__ = list(values)  # copy
+                values[key] = value2
             # Emit?
             if this_is_js():  # pragma: no cover
                 is_equal = old == value2
@@ -543,13 +581,16 @@ class Component(with_metaclass(ComponentMeta, object)):
             if self.__initial_mutation is True:
                 old = value2
                 is_equal = False  # well, they are, but we want an event!
+            elif loop._transaction is not None and is_equal is False:
+                if loop._coalesce_mutation(self, prop_name, old) is True:
+                    return True  # the event is emitted when the transaction ends
             if not is_equal:
                 self.emit(prop_name,
                           dict(new_value=value2, old_value=old, mutation=mutation))
                 return True
         else:
             # Array mutations - value is assumed to be a sequence, or int for 'remove'
-            ev = Dict()
+            ev = Event()
             ev.objects = value
             ev.mutation = mutation
             ev.index = index
@@ -563,6 +604,9 @@ class Component(with_metaclass(ComponentMeta, object)):
                     raise IndexError('For insert, remove, and replace mutations, '
                                      'the index must be >= 0.')
                 mutate_array(old, ev)
+            if loop._transaction is not None:
+                if loop._coalesce_mutation(self, prop_name, old, True) is True:
+                    return True  # the event is emitted when the transaction ends
             self.emit(prop_name, ev)
             return True
 
@@ -572,8 +616,11 @@ class Component(with_metaclass(ComponentMeta, object)):
         property/emitter or for which any reactions are registered.
         Sorted alphabetically. Intended mostly for debugging purposes.
         """
-        types = list(self.__handlers)  # avoid using sorted (one less stdlib func)
-        types.sort()
+        types = self.__properties__ + self.__emitters__
+        for type in self.__handlers.keys():
+            if type not in types:
+                types.append(type)
+        types.sort()  # avoid using sorted (one less stdlib func)
         return types
 
     def get_event_handlers(self, type):
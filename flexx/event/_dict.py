@@ -1,8 +1,10 @@
 """
-Implementation of a dict class with attribute access.
+Implementation of a dict class with attribute access, and of the
+event class that is based on the same idea.
 """
 
 import re
+from collections.abc import MutableMapping
 
 try:  # pragma: no cover
     from collections import OrderedDict as _dict
@@ -42,8 +44,8 @@ class Dict(_dict):
 
     """
 
-    __reserved_names__ = dir(_dict())  # Also from OrderedDict
-    __pure_names__ = dir(dict())
+    __reserved_names__ = set(dir(_dict()))  # Also from OrderedDict
+    __pure_names__ = set(dir(dict()))
 
     __slots__ = []
 
@@ -61,14 +63,12 @@ class Dict(_dict):
         else:
             return 'Dict(%s)' % (', '.join(identifier_items))
 
-    def __getattribute__(self, key):
+    def __getattr__(self, key):
+        # Only called when normal attribute lookup fails
         try:
-            return object.__getattribute__(self, key)
-        except AttributeError:
-            if key in self:
-                return self[key]
-            else:
-                raise
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
 
     def __setattr__(self, key, val):
         if key in Dict.__reserved_names__:
@@ -84,4 +84,128 @@ class Dict(_dict):
 
     def __dir__(self):
         names = [k for k in self.keys() if isidentifier(k)]
-        return Dict.__reserved_names__ + names
+        return sorted(Dict.__reserved_names__) + names
+
+
+class Event(MutableMapping):
+    """ The object that represents an event, as emitted by components.
+
+    Like a :class:`Dict <flexx.event.Dict>`, the fields of an event
+    can be get/set as attributes as well as items. The common fields
+    (type, source, new_value, old_value, mutation, index and objects)
+    are stored in slots, so that creating an event is cheap. Other
+    fields are stored in a separate dict, which is only created when
+    needed. As with ``Dict``, keys that are not valid identifiers or
+    that are methods of the event class (e.g. 'items' or 'get') can
+    only be get/set in the classic way.
+    """
+
+    __slots__ = ('type', 'source', 'new_value', 'old_value', 'mutation',
+                 'index', 'objects', '_extra')
+
+    __fields__ = __slots__[:-1]
+
+    def __init__(self, info=None, **kwargs):
+        _object_setattr(self, '_extra', None)  # other fields, lazily created
+        if info is not None:
+            if isinstance(info, Event):
+                for key in Event.__fields__:
+                    try:
+                        _object_setattr(self, key, getattr(info, key))
+                    except AttributeError:
+                        pass
+                if info._extra:
+                    _object_setattr(self, '_extra', dict(info._extra))
+            else:
+                for key, val in info.items():
+                    self[key] = val
+        for key, val in kwargs.items():
+            self[key] = val
+
+    def __repr__(self):
+        items = []
+        for key, val in self.items():
+            if isidentifier(key):
+                items.append('%s=%r' % (key, val))
+            else:
+                items.append('(%r, %r)' % (key, val))
+        return 'Event(%s)' % ', '.join(items)
+
+    def __getattr__(self, key):
+        # Only called when normal attribute lookup fails
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        raise AttributeError(key)
+
+    def __setattr__(self, key, val):
+        if key in _event_fields:
+            _object_setattr(self, key, val)
+        elif key in _event_reserved_names:
+            raise AttributeError('Reserved name, this key can only ' +
+                                 'be set via ``ev[%r] = X``' % key)
+        else:
+            self[key] = val
+
+    def __delattr__(self, key):
+        if key in _event_fields:
+            _object_delattr(self, key)
+        else:
+            try:
+                del self[key]
+            except KeyError:
+                raise AttributeError(key)
+
+    def __getitem__(self, key):
+        if key in _event_fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, val):
+        if key in _event_fields:
+            _object_setattr(self, key, val)
+        else:
+            if self._extra is None:
+                _object_setattr(self, '_extra', {})
+            self._extra[key] = val
+
+    def __delitem__(self, key):
+        if key in _event_fields:
+            try:
+                _object_delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        if key in _event_fields:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in Event.__fields__:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return (len(self._extra or ()) +
+                sum(hasattr(self, key) for key in Event.__fields__))
+
+    def copy(self):
+        return Event(self)
+
+
+_object_setattr = object.__setattr__
+_object_delattr = object.__delattr__
+_event_fields = frozenset(Event.__fields__)
+_event_reserved_names = frozenset(dir(Event))
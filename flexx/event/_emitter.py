@@ -4,7 +4,7 @@ Implements the emitter decorator, class and desciptor.
 
 import weakref
 
-from ._action import BaseDescriptor
+from ._action import BaseDescriptor, InstanceDoc
 
 
 def emitter(func):
@@ -67,6 +67,9 @@ class Emitter:
     directly; use ``event.emitter()`` instead.
     """
 
+    # Use slots, since there can be many instances
+    __slots__ = ('_ob1', '_func', '_func_once', '_name', '_doc', '__weakref__')
+
     def __init__(self, ob, func, name, doc):
         assert callable(func)
 
@@ -75,7 +78,7 @@ class Emitter:
         self._func = func
         self._func_once = func
         self._name = name
-        self.__doc__ = doc
+        self._doc = doc
 
     def __repr__(self):
         cname = self.__class__.__name__
@@ -96,3 +99,6 @@ class Emitter:
             ev = func(ob, *args)
             if ev is not None:
                 ob.emit(self._name, ev)
+
+
+Emitter.__doc__ = InstanceDoc(Emitter.__doc__, lambda ob: ob._doc)
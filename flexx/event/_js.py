@@ -24,14 +24,15 @@ from pscript.parser2 import get_class_definition
 from flexx.event import _property
 from flexx.event._loop import Loop
 from flexx.event._action import ActionDescriptor
-from flexx.event._reaction import ReactionDescriptor, Reaction
+from flexx.event._reaction import (ReactionDescriptor, Reaction,
+                                   _compile_connection_strings)
 from flexx.event._attribute import Attribute
 from flexx.event._property import Property
 from flexx.event._emitter import EmitterDescriptor
 from flexx.event._component import Component, _mutate_array_js, _mutate_dict_js
 
 
-Object = console = setTimeout = loop = logger = arguments = None  # fool pyflake
+Object = console = setTimeout = Date = loop = logger = arguments = None  # fool pyflake
 undefined = 'UNDEFINED'
 reprs = json.dumps
 
@@ -113,14 +114,47 @@ class LoopJS:  # pragma: no cover
     integrate_pyside = undefined
     _integrate_qt = undefined
     _thread_match = undefined
+    start_profiling = undefined
+    stop_profiling = undefined
+    get_profile_stats = undefined
+    transaction = undefined
+    _coalesce_mutation = undefined
+    _end_transaction = undefined
 
     def __init__(self):
         self._active_components = []
+        self._time_budget = 0
+        self._profiler = None
+        self._production = False  # set by the session
         self.reset()
 
     def _call_soon_func(self, func):
         setTimeout(func, 0)
 
+    def _call_soon_func_local(self, func):
+        setTimeout(func, 0)
+
+    def _call_later_func(self, delay, func):
+        setTimeout(func, delay * 1000)
+
+    def _time(self):
+        return Date.now() / 1000
+
+    def _push_timer(self, timer):
+        # Keep the timers sorted (new timers usually go at the end)
+        timers = self._pending_timers
+        i = len(timers)
+        while i > 0 and timers[i - 1][0] > timer[0]:
+            i -= 1
+        timers.splice(i, 0, timer)
+
+    def _pop_due_timers(self, now):
+        timers = self._pending_timers
+        n = 0
+        while n < len(timers) and timers[n][0] <= now:
+            n += 1
+        return timers.splice(0, n)
+
     def _iter_callback(self):
         self._scheduled_call_to_iter = False
         return self.iter()
@@ -141,7 +175,7 @@ class ComponentJS:  # pragma: no cover
         self._disposed = False
 
         # Init some internal variables
-        self.__handlers = {}  # reactions connecting to this component
+        self.__handlers = {}  # reactions connecting to this component, lazily
         self.__pending_events = []
         self.__anonymous_reactions = []
         self.__initial_mutation = False
@@ -153,12 +187,10 @@ class ComponentJS:  # pragma: no cover
         # Create emitters
         for i in range(len(self.__emitters__)):
             name = self.__emitters__[i]
-            self.__handlers[name] = []
             self.__create_emitter(self[name], name)
         # Create properties
         for i in range(len(self.__properties__)):
             name = self.__properties__[i]
-            self.__handlers[name] = []
             self.__create_property(name)
         # Create attributes
         for i in range(len(self.__attributes__)):
@@ -294,7 +326,8 @@ class ComponentJS:  # pragma: no cover
     def __create_property(self, name):
         private_name = '_' + name + '_value'
         def getter():
-            loop.register_prop_access(self, name)
+            if loop._tracking_prop_access is True:
+                loop.register_prop_access(self, name)
             return self[private_name]
         def setter(x):
             raise AttributeError('Cannot set property %r; properties can only '
@@ -344,8 +377,9 @@ class ComponentJS:  # pragma: no cover
         reaction._id = RawJS("'r' + Component.prototype._REACTION_COUNT")
         reaction._name = name
         reaction._mode = mode
+        reaction._interval = reaction_func._interval or 0
         reaction._ob1 = lambda : that  # no weakref in JS
-        reaction._init(connection_strings, self)
+        reaction._init(connection_strings)
 
         return reaction
 
@@ -359,7 +393,7 @@ OK_MAGICS = (
              # Functions that make sense
              '__init__', '__enter__', '__exit__',
              # For flexx.ui
-             '__proxy_properties__',
+             '__proxy_properties__', '__property_sync__', '__property_diff__',
              )
 
 
@@ -398,6 +432,7 @@ def _create_js_class(PyClass, JSClass):
         jscode = _clean_code_of_thread_stuff(jscode)
     # Almost done
     jscode = jscode.replace('new Dict()', '{}').replace('new Dict(', '_pyfunc_dict(')
+    jscode = jscode.replace('new Event()', '{}').replace('new Event(', '_pyfunc_dict(')
     mc.meta['std_functions'].add('dict')
     return mc.attach_meta(jscode)
 
@@ -429,6 +464,7 @@ def _clean_code_of_thread_stuff(code):
     # Some final tweaks
     jscode = jscode.replace('this._ensure_thread_', '//this._ensure_thread_')
     jscode = jscode.replace('threading.get_ident()', '0')
+    jscode = jscode.replace('_pyfunc_op_equals(0, this._thread_id)', 'true')
     jscode = jscode.replace('._local.', '.')
     jscode = jscode.replace('this._thread_match(true);\n', '')
     jscode = jscode.replace('if (_pyfunc_truthy(this._thread_match(false)))', '')
@@ -518,6 +554,9 @@ def create_js_component_class(cls, cls_name, base_class='Component.prototype'):
             # Add mode and connection strings
             funcs_code.append(prototype_prefix + funcname +
                               '._mode = ' + reprs(val._mode))
+            if val._mode in ('throttle', 'debounce'):
+                funcs_code.append(prototype_prefix + funcname +
+                                  '._interval = ' + reprs(val._interval))
             if val._connection_strings:
                 funcs_code.append(prototype_prefix + funcname +
                                   '._connection_strings = ' +
@@ -637,7 +676,8 @@ def gen_prop_classes(mc):
 # Generate the code
 mc = MetaCollector()
 JS_FUNCS = (mc.py2js(_mutate_array_js) + '\nvar mutate_array = _mutate_array_js;\n' +
-            mc.py2js(_mutate_dict_js))
+            mc.py2js(_mutate_dict_js) + '\n' +
+            mc.py2js(_compile_connection_strings))
 JS_LOOP = mc.update(_create_js_class(Loop, LoopJS)) + '\nvar loop = new Loop();\n'
 JS_COMPONENT = mc.update(_create_js_class(Component, ComponentJS))
 JS_PROP = gen_prop_classes(mc)
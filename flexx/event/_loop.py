@@ -6,10 +6,13 @@ Implementation of Flexx' event loop based on asyncio.
 # These are there to avoid inefficient JS code as this code is transpiled
 # using PScript. This code is quite performance crirical.
 
+import time
+import heapq
 import asyncio
 import threading
 
 from . import logger
+from .. import config
 
 def this_is_js():
     return False
@@ -36,6 +39,8 @@ class Loop:
     def __init__(self):
         self._lock = threading.RLock()
         self._thread_id = threading.get_ident()
+        self._time_budget = 0
+        self._profiler = None
         # self._call_soon_func = lambda x: None
 
         # Keep track of a stack of "active" components for use within Component
@@ -52,21 +57,173 @@ class Loop:
         """
         self._in_iter = False
         self._scheduled_call_to_iter = False
+        self._iter_deadline = 0
+        self._reactions_interrupted = False  # by the time budget
 
         self._processing_action = None
         self._processing_reaction = None
+        self._tracking_prop_access = False  # True while running auto reactions
         self._prop_access = {}
         self._pending_calls = []
         self._pending_actions = []
         self._pending_reactions = []
         self._pending_reaction_ids = {}
+        self._pending_hooks = []
+        self._pending_hook_ids = {}
+        self._pending_timers = []  # heap of [time, count, func, args]
+        self._timer_count = 0
+        self._timed_reactions = {}  # id -> [reaction, events, due time]
+        self._transaction = None  # (component, name) -> old value
+        self._transaction_depth = 0
+        self._dispose_sweep = None  # reaction id -> reaction
+        self._reset_pending_run()
+
+    def _reset_pending_run(self):
+        # The tail of _pending_reactions is characterized by two "runs":
+        # the items from none_start onwards all have no representing event,
+        # and the items from run_start onwards have no representing event,
+        # or one that matches run_source and run_type.
+        self._pending_none_start = 0
+        self._pending_run_start = 0
+        self._pending_run_source = None  # None never matches
+        self._pending_run_type = ''
 
     def has_pending(self):
         """ Get whether there are any pending actions, reactions, or calls.
         """
         return (len(self._pending_reactions) > 0 or
                 len(self._pending_actions) > 0 or
-                len(self._pending_calls) > 0)
+                len(self._pending_calls) > 0 or
+                len(self._pending_hooks) > 0)
+
+    def set_time_budget(self, budget):
+        """ Set the maximum time (in seconds) that a single loop iteration
+        may spend on processing actions and reactions. When an iteration
+        exceeds this budget, the remaining items are left in the queue and
+        another iteration is scheduled, so that the underlying event loop
+        (e.g. asyncio) can handle other work in between. Reactions are
+        never processed while actions are pending. Zero (the default) means
+        no budget.
+        """
+        budget = float(budget)
+        if not budget >= 0:
+            raise ValueError('Loop time budget must be a nonnegative number.')
+        self._time_budget = budget
+
+    ## Profiling
+
+    def start_profiling(self, slow_threshold=0):
+        """ Start recording statistics of the processed actions and
+        reactions: call counts and durations per handler and per component
+        class, and the queue lengths per iteration. Handlers that take
+        longer than ``slow_threshold`` seconds are logged (zero means
+        don't log). Any previously recorded statistics are discarded.
+        Profiling has no overhead when it is not enabled. Python only.
+        """
+        from ._profiler import LoopProfiler
+        self._profiler = LoopProfiler(slow_threshold)
+
+    def stop_profiling(self):
+        """ Stop recording statistics, and return the last recorded
+        statistics (or None if profiling was not enabled).
+        """
+        stats = self.get_profile_stats()
+        self._profiler = None
+        return stats
+
+    def get_profile_stats(self, as_json=False):
+        """ Get the statistics recorded since ``start_profiling()`` as a dict,
+        or as a JSON string if ``as_json`` is True. Returns None if profiling
+        is not enabled.
+        """
+        if self._profiler is None:
+            return None
+        elif as_json:
+            return self._profiler.to_json()
+        else:
+            return self._profiler.get_stats()
+
+    ## Transactions
+
+    def transaction(self):
+        """ Get a context manager that coalesces property events. Inside
+        the context, properties are mutated as usual, but their events are
+        held back. When the (outermost) context exits, a single event is
+        emitted for each mutated property, with the value from before the
+        first mutation as ``old_value``, and the final value as
+        ``new_value`` (no event is emitted if these are equal). This is
+        intended for bulk updates inside an action, e.g. loading a
+        document or resetting a form. Partial mutations (e.g. 'insert')
+        are only coalesced for properties that were set earlier in the
+        transaction. Actions that are invoked inside the context (but not
+        from an action) are applied when it exits. Python only.
+
+        The transaction state is held by the loop (not per thread), because
+        properties are only mutated from the loop's thread. Therefore a
+        transaction can only be entered from that thread; entering it from
+        another thread raises a RuntimeError.
+
+        .. code-block:: python
+
+            @event.action
+            def reset(self):
+                with event.loop.transaction():
+                    for item in self.items:
+                        item.set_value(0)
+        """
+        return LoopTransaction(self)
+
+    def _coalesce_mutation(self, component, name, old_value, partial=False):
+        # Called by Component._mutate() during a transaction. Returns
+        # whether the event is coalesced (i.e. should not be emitted now).
+        key = component, name
+        if key in self._transaction:
+            return True  # keep the first old value
+        elif partial is True:
+            return False  # the old value is mutated in-place, so emit now
+        self._transaction[key] = old_value
+        return True
+
+    def _end_transaction(self):
+        # Emit the coalesced events; the transaction is done even if
+        # emitting fails, because the properties are already mutated.
+        pending, self._transaction = self._transaction, None
+        for (component, name), old_value in pending.items():
+            if component._disposed:
+                continue
+            new_value = component.__property_values__[
+                component.__property_index__[name]]
+            if hasattr(old_value, 'dtype') and hasattr(new_value, 'dtype'):
+                import numpy as np
+                is_equal = np.array_equal(old_value, new_value)
+            else:
+                is_equal = (type(old_value) is type(new_value) and
+                            old_value == new_value)
+            if not is_equal:
+                component.emit(name, dict(new_value=new_value, old_value=old_value,
+                                          mutation='set'))
+
+    ## Disposing
+
+    def _dispose_many(self, components):
+        """ Dispose multiple components (e.g. a subtree of widgets) in
+        one go. The reactions that are connected to these components are
+        cleaned up in a single sweep at the end, rather than once for each
+        component. Can be nested; the sweep is done by the outermost call.
+        """
+        is_outer = self._dispose_sweep is None
+        if is_outer:
+            self._dispose_sweep = {}
+        try:
+            for i in range(len(components)):
+                if components[i]._disposed is False:
+                    components[i]._dispose()
+        finally:
+            if is_outer:
+                reactions = self._dispose_sweep
+                self._dispose_sweep = None
+                for reaction in reactions.values():
+                    reaction._clear_disposed_refs()
 
     def __enter__(self):
         return self
@@ -120,10 +277,14 @@ class Loop:
     ## Adding to queues
 
     def _schedule_iter(self):
-        # Make sure to call this with the lock
+        # Make sure to call this with the lock, or from the loop's thread
         if self._scheduled_call_to_iter is False:
             self._scheduled_call_to_iter = True
-            self._call_soon_func(self._iter_callback)
+            if threading.get_ident() == self._thread_id:
+                # Fast path: no need to wake up the loop from another thread
+                self._call_soon_func_local(self._iter_callback)
+            else:
+                self._call_soon_func(self._iter_callback)
 
     def call_soon(self, func, *args):
         """ Arrange for a callback to be called as soon as possible.
@@ -144,24 +305,59 @@ class Loop:
         ``asyncio.get_event_loop().call_later()``.
         """
         # We keep track of pending calls locally to our event system, which
-        # gives more control, e.g. during testing.
-        with self._lock:
+        # gives more control, e.g. during testing. The lock is only needed
+        # when called from another thread (list.append() itself is atomic).
+        if threading.get_ident() == self._thread_id:
             self._pending_calls.append((func, args))
             self._schedule_iter()
+        else:
+            with self._lock:
+                self._pending_calls.append((func, args))
+                self._schedule_iter()
 
-    # def call_later(self, delay, func, *args)
-    # This would be nice, but we'd have to implement more sophisticated
-    # scheduling. Unless we'd just call asyncio's call_later, but I am
-    # reluctant to do that while this code is still more or less independent of
-    # asyncio.
+    def call_later(self, delay, func, *args):
+        """ Arrange for a callback to be called after the given delay
+        (in seconds). Like ``call_soon()``, this method is thread-safe,
+        and the callback is called in the thread corresponding with the loop.
+
+        The callback is called in the first loop iteration after the delay
+        has passed, before pending calls, actions and reactions are processed.
+        """
+        with self._lock:
+            self._timer_count += 1
+            timer = [self._time() + delay, self._timer_count, func, args]
+            self._push_timer(timer)
+            self._call_later_func(delay, self._iter_callback)
+
+    def _time(self):
+        return time.monotonic()
+
+    def _call_later_func(self, delay, func):
+        if threading.get_ident() == self._thread_id:
+            self._asyncio_loop.call_later(delay, func)
+        else:
+            self._call_soon_func(self._asyncio_loop.call_later, delay, func)
+
+    def _push_timer(self, timer):
+        heapq.heappush(self._pending_timers, timer)
+
+    def _pop_due_timers(self, now):
+        timers = []
+        while self._pending_timers and self._pending_timers[0][0] <= now:
+            timers.append(heapq.heappop(self._pending_timers))
+        return timers
 
     def add_action_invokation(self, action, args):
         """ Schedule the handling of an action. Automatically called when
         an action object is called.
         """
-        with self._lock:
+        if threading.get_ident() == self._thread_id:
             self._pending_actions.append((action, args))
             self._schedule_iter()
+        else:
+            with self._lock:
+                self._pending_actions.append((action, args))
+                self._schedule_iter()
 
     def add_reaction_event(self, reaction, ev):
         """ Schulde the handling of a reaction. Automatically called by
@@ -171,58 +367,139 @@ class Loop:
         # In principal, the mechanics of adding items to the queue is not complex,
         # but this code is performance critical, so we apply several tricks
         # to make this code run fast.
-        # _pending_reactions is a list of tuples (reaction, representing event, events)
+        # _pending_reactions is a list of lists:
+        # [reaction, representing event, events, index in the queue]
 
         pending_reactions = self._pending_reactions
 
         mode = reaction.get_mode()
 
+        if mode == 'throttle' or mode == 'debounce':
+            self._add_timed_reaction_event(reaction, mode, ev)
+            return
+
+        # Reactions are always added from the loop thread, so no need for a lock
+        self._thread_match(True)
+
+        if mode == 'normal':
+            # Normally, we try to consolidate the events by
+            # appending the event to the last item of this reaction in the
+            # queue, but we don't want to break the order, i.e. we can only
+            # skip over items of which the events are the same as the
+            # current. Each queue item has a representing event, and we
+            # keep track of the homogeneous runs at the tail of the queue,
+            # so that we don't have to scan the queue.
+            item = self._pending_reaction_ids.get(reaction._id, None)
+            if item is not None:
+                i = item[3] + 1  # index of the next item
+                if i >= self._pending_none_start or (
+                        i >= self._pending_run_start and
+                        self._pending_run_source is ev['source'] and
+                        self._pending_run_type == ev['type']):
+                    # We can simply append the event
+                    item[2].append(ev)
+                    ev2 = item[1]  # representing event
+                    if ev2 is not None and not (ev2['source'] is ev['source'] and
+                                                ev2['type'] == ev['type']):
+                        # Mark that the events are heterogeneous
+                        item[1] = {'source': None}
+                        if i >= self._pending_none_start:
+                            # This is now the last item that has a
+                            # representing event, which matches nothing
+                            self._pending_run_start = i - 1
+                            self._pending_run_source = None
+                        else:
+                            self._pending_run_start = i
+                    return
+
+        else:
+            # For greedy and auto reactions, we consolidate by not adding
+            # to the queue if the corresponding reaction is already
+            # present. We use _pending_reaction_ids for this.
+            # We even omit the event objects themselves when we think they
+            # don't matter (when the number of connection strings is zero).
+            if reaction._id in self._pending_reaction_ids:
+                if len(reaction._connections) > 0:
+                    self._pending_reaction_ids[reaction._id][2].append(ev)
+                return
+
+        # Add new item to queue
+        i = len(pending_reactions)
+        if len(reaction._connections) > 0:
+            new_item = [reaction, ev, [ev], i]
+            if not (self._pending_run_source is ev['source'] and
+                    self._pending_run_type == ev['type']):
+                self._pending_run_start = self._pending_none_start
+                self._pending_run_source = ev['source']
+                self._pending_run_type = ev['type']
+            self._pending_none_start = i + 1
+        else:
+            new_item = [reaction, None, [], i]
+        pending_reactions.append(new_item)
+        self._pending_reaction_ids[reaction._id] = new_item
 
+        self._schedule_iter()
+
+    def _add_reactions_hook(self, component):
+        """ Friend method of Component. Schedule a call to the component's
+        ``_registered_reactions_hook()`` at the end of the loop iteration,
+        so that many changes to its reactions result in a single call.
+        """
         with self._lock:
             self._thread_match(True)
-
-            if mode == 'normal':
-                # Normally, we try to consolidate the events by
-                # appending the event to the existing item in the queue, but
-                # we don't want to break the order, i.e. we can only skip over
-                # events that are the same as the current. Each queue item has
-                # a reference event to make this skipping more efficient.
-                i = len(pending_reactions)
-                while i > 0:
-                    i -= 1
-                    ev2 = pending_reactions[i][1]  # representing event
-                    if pending_reactions[i][0] is reaction:
-                        # We can simply append the event
-                        pending_reactions[i][2].append(ev)
-                        if not (ev2['source'] is ev['source'] and
-                                ev2['type'] == ev['type']):
-                            # Mark that the events are heterogeneous
-                            pending_reactions[i][1] = {'source': None}
-                        return
-                    # Only continue if all events of the next item match the current
-                    if not (ev2 is None or
-                            (ev2['source'] is ev['source'] and ev2.type == ev.type)):
-                        break
-
+            if component._id not in self._pending_hook_ids:
+                self._pending_hook_ids[component._id] = True
+                self._pending_hooks.append(component)
+                self._schedule_iter()
+
+    def _add_timed_reaction_event(self, reaction, mode, ev):
+        # Events for throttle and debounce reactions are collected (like
+        # greedy reactions), and the reaction is added to the queue when its
+        # timer fires. For debounce, each event postpones the call. For
+        # throttle, there is at least the reaction's interval between calls.
+        with self._lock:
+            now = self._time()
+            item = self._timed_reactions.get(reaction._id, None)
+            if item is None:
+                if mode == 'debounce':
+                    due = now + reaction._interval
+                else:
+                    due = max(now, reaction._last_call_time + reaction._interval)
+                item = [reaction, [ev], due]
+                self._timed_reactions[reaction._id] = item
+                self.call_later(due - now, self._fire_timed_reaction, reaction)
             else:
-                # For greedy and auto reactions, we consolidate by not adding
-                # to the queue if the corresponding reaction is already
-                # present. We use _pending_reaction_ids for this.
-                # We even omit the event objects themselves when we think they
-                # don't matter (when the number of connection strings is zero).
-                if reaction._id in self._pending_reaction_ids:
-                    if len(reaction._connections) > 0:
-                        self._pending_reaction_ids[reaction._id][2].append(ev)
-                    return
+                item[1].append(ev)
+                if mode == 'debounce':
+                    item[2] = now + reaction._interval
 
-            # Add new item to queue
-            if len(reaction._connections) > 0:
-                new_item = [reaction, ev, [ev]]
-            else:
-                new_item = [reaction, None, []]
-            pending_reactions.append(new_item)
-            self._pending_reaction_ids[reaction._id] = new_item
+    def _discard_timed_reaction(self, reaction):
+        """ Friend method of Reaction. Drop the pending events of a
+        throttle or debounce reaction, e.g. when it is disposed.
+        """
+        with self._lock:
+            self._timed_reactions.pop(reaction._id, None)
 
+    def _fire_timed_reaction(self, reaction):
+        with self._lock:
+            item = self._timed_reactions.get(reaction._id, None)
+            if item is None:
+                return  # e.g. after a reset, or when the reaction was disposed
+            ob = reaction._ob1()
+            if ob is None or ob._disposed:
+                self._timed_reactions.pop(reaction._id)
+                return
+            now = self._time()
+            if item[2] > now:
+                # Postponed
+                self.call_later(item[2] - now, self._fire_timed_reaction, reaction)
+                return
+            self._timed_reactions.pop(reaction._id)
+            reaction._last_call_time = now
+            # Add to the queue, like a greedy reaction without representing event
+            new_item = [reaction, None, item[1], len(self._pending_reactions)]
+            self._pending_reactions.append(new_item)
+            self._pending_reaction_ids[reaction._id] = new_item
             self._schedule_iter()
 
     def register_prop_access(self, component, prop_name):
@@ -285,12 +562,49 @@ class Loop:
                                'is processing.')
 
         self._in_iter = True
+        if self._time_budget > 0:
+            self._iter_deadline = self._time() + self._time_budget
+        if self._profiler is not None:
+            self._profiler.record_queues(calls=len(self._pending_calls),
+                                         actions=len(self._pending_actions),
+                                         reactions=len(self._pending_reactions))
         try:
+            self._process_timers()
             self._process_calls()
-            self._process_actions()
-            self._process_reactions()
+            # When the time budget is exceeded, the next phases are left
+            # for the next iteration. The reactions that were left are
+            # processed before any new actions, so that they see the state
+            # from the action phase that triggered them.
+            done = True
+            if self._reactions_interrupted is True:
+                done = self._process_reactions()
+                if done is True:
+                    self._process_reactions_hooks()
+            if done is True and self._process_actions() is True:
+                if self._process_reactions() is True:
+                    self._process_reactions_hooks()
         finally:
             self._in_iter = False
+            self._iter_deadline = 0
+
+    def _budget_exceeded(self):
+        # Check whether the current iteration is past its deadline, and if so,
+        # make sure that there is another iteration.
+        if self._time() > self._iter_deadline:
+            with self._lock:
+                self._schedule_iter()
+            return True
+        return False
+
+    def _process_timers(self):
+        """ Move the callbacks of timers that are due to the pending calls.
+        """
+        with self._lock:
+            self._thread_match(True)
+            if len(self._pending_timers) > 0:
+                timers = self._pop_due_timers(self._time())
+                for i in range(len(timers)):
+                    self._pending_calls.append((timers[i][2], timers[i][3]))
 
     def _process_calls(self):
         """ Process pending function calls.
@@ -310,7 +624,8 @@ class Loop:
                 logger.exception(err)
 
     def _process_actions(self, n=None):
-        """ Process all (or just one) pending actions.
+        """ Process all (or just one) pending actions. Returns False if
+        the time budget was exceeded before all actions were processed.
         """
         # Select pending
         with self._lock:
@@ -323,18 +638,31 @@ class Loop:
                 self._pending_actions = self._pending_actions[n:]
 
         # Process
+        profiler = self._profiler
         for i in range(len(pending_actions)):
             action, args = pending_actions[i]
             self._processing_action = action
             try:
-                action(*args)
+                if profiler is None:
+                    action(*args)
+                else:
+                    profiler.call_action(action, args)
             except Exception as err:
                 logger.exception(err)
             finally:
                 self._processing_action = None
+            if (self._iter_deadline > 0 and i < len(pending_actions) - 1 and
+                    self._budget_exceeded() is True):
+                # Put the remaining actions back at the front of the queue
+                with self._lock:
+                    self._pending_actions = (pending_actions[i + 1:] +
+                                             self._pending_actions)
+                return False
+        return True
 
     def _process_reactions(self):
-        """ Process all pending reactions.
+        """ Process all pending reactions. Returns False if the time
+        budget was exceeded before all reactions were processed.
         """
         # Select pending
         with self._lock:
@@ -342,20 +670,30 @@ class Loop:
             pending_reactions = self._pending_reactions
             self._pending_reactions = []
             self._pending_reaction_ids = {}
+            self._reset_pending_run()
+        self._reactions_interrupted = False
 
         # Process
+        profiler = self._profiler
         for ir in range(len(pending_reactions)):
-            reaction, _, events = pending_reactions[ir]
+            item = pending_reactions[ir]
+            reaction = item[0]
+            events = item[2]
             # Call reaction
             if len(events) > 0 or reaction.get_mode() == 'auto':
                 self._prop_access = {}
                 self._processing_reaction = reaction
+                self._tracking_prop_access = reaction.get_mode() == 'auto'
                 try:
-                    reaction(*events)
+                    if profiler is None:
+                        reaction(*events)
+                    else:
+                        profiler.call_reaction(reaction, events)
                 except Exception as err:
                     logger.exception(err)
                 finally:
                     self._processing_reaction = None
+                    self._tracking_prop_access = False
             # Reconnect auto reaction. The _update_implicit_connections()
             # method is pretty efficient if connections has not changed.
             try:
@@ -370,6 +708,50 @@ class Loop:
                 logger.exception(err)
             finally:
                 self._prop_access = {}
+            if (self._iter_deadline > 0 and ir < len(pending_reactions) - 1 and
+                    self._budget_exceeded() is True):
+                self._requeue_reactions(pending_reactions[ir + 1:])
+                self._reactions_interrupted = True
+                return False
+        return True
+
+    def _requeue_reactions(self, items):
+        # Put unprocessed reaction items back at the front of the queue,
+        # before the items that were added in the meantime.
+        with self._lock:
+            n = len(items)
+            new_items = self._pending_reactions
+            for i in range(len(new_items)):
+                new_items[i][3] += n
+            self._pending_none_start += n
+            self._pending_run_start += n
+            # Let new events consolidate with the last item of each
+            # reaction (the tail run markers keep this consistent).
+            for i in range(n - 1, -1, -1):
+                item = items[i]
+                item[3] = i
+                if item[0]._id not in self._pending_reaction_ids:
+                    self._pending_reaction_ids[item[0]._id] = item
+            self._pending_reactions = items + new_items
+
+    def _process_reactions_hooks(self):
+        """ Call the reactions hook of components whose reactions changed.
+        """
+        # Select pending
+        with self._lock:
+            self._thread_match(True)
+            components = self._pending_hooks
+            self._pending_hooks = []
+            self._pending_hook_ids = {}
+
+        # Process
+        for i in range(len(components)):
+            component = components[i]
+            if component._disposed is False:
+                try:
+                    component._registered_reactions_hook()
+                except Exception as err:
+                    logger.exception(err)
 
     ## Integration
 
@@ -384,13 +766,18 @@ class Loop:
         By calling this without calling reset(), it should be possible
         to hot-swap the system from one loop (and/or thread) to another
         (though this is currently not tested).
+
+        This also applies ``flexx.config.production``.
         """
         if loop is None:
             loop = asyncio.get_event_loop()
         with self._lock:
             self._thread_id = threading.get_ident()
+            self._production = bool(config.production)
             self._local._active_components = []
+            self._asyncio_loop = loop
             self._call_soon_func = loop.call_soon_threadsafe
+            self._call_soon_func_local = loop.call_soon
             self._call_soon_func(self._iter_callback)
             if reset:
                 self.reset()
@@ -477,4 +864,33 @@ class Loop:
     #     self._call_soon_func(self.iter)
 
 
+class LoopTransaction:
+    """ Context manager returned by ``Loop.transaction()``. Transactions
+    can be nested; the events are emitted when the outermost one exits.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+
+    def __enter__(self):
+        if not self._loop._thread_match(False):
+            raise RuntimeError('A loop transaction can only be used from '
+                               'the thread that the loop runs in.')
+        if self._loop._transaction_depth == 0:
+            self._loop._transaction = {}
+        self._loop._transaction_depth += 1
+        return self
+
+    def __exit__(self, type, value, traceback):
+        loop = self._loop
+        try:
+            if (loop._transaction_depth == 1 and loop._in_iter is False and
+                    not loop._local._active_components):
+                loop._process_actions()  # apply actions invoked from here
+        finally:
+            loop._transaction_depth -= 1
+            if loop._transaction_depth == 0:
+                loop._end_transaction()
+
+
 loop = Loop()
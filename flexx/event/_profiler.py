@@ -0,0 +1,124 @@
+"""
+Implementation of the (Python-only) profiler of the event loop.
+"""
+
+import json
+from time import perf_counter
+
+from . import logger
+
+
+class LoopProfiler:
+    """ Records statistics about the actions and reactions processed by
+    the event loop. Created via ``loop.start_profiling()``.
+
+    For each handler (an action or reaction, identified by the name of
+    its component class and its own name) and for each component class,
+    the number of calls, the number of events (for reactions), and the
+    cumulative and maximum duration are recorded. Per loop iteration,
+    the lengths of the queues of calls, actions and reactions are recorded.
+
+    Handlers that take longer than ``slow_threshold`` seconds are logged
+    as a warning. A threshold of zero disables this.
+    """
+
+    def __init__(self, slow_threshold=0):
+        slow_threshold = float(slow_threshold)
+        if not slow_threshold >= 0:
+            raise ValueError('Profiler slow_threshold must be a nonnegative number.')
+        self._slow_threshold = slow_threshold
+        self._start_time = perf_counter()
+        self._iterations = 0
+        self._slow_calls = 0
+        self._queues = {}  # name -> [last, max, total]
+        self._handlers = {}  # name -> [kind, count, events, total, max]
+        self._classes = {}  # class name -> [count, total, max]
+
+    def record_queues(self, **lengths):
+        """ Record the lengths of the queues at the start of an iteration.
+        """
+        self._iterations += 1
+        for name, n in lengths.items():
+            stats = self._queues.get(name, None)
+            if stats is None:
+                stats = self._queues[name] = [0, 0, 0]
+            stats[0] = n
+            stats[1] = max(stats[1], n)
+            stats[2] += n
+
+    def call_action(self, action, args):
+        """ Invoke an action and record its duration.
+        """
+        t0 = perf_counter()
+        try:
+            action(*args)
+        finally:
+            self._record('action', action._ob1(), action._name,
+                         perf_counter() - t0, 0)
+
+    def call_reaction(self, reaction, events):
+        """ Invoke a reaction and record its duration.
+        """
+        t0 = perf_counter()
+        try:
+            reaction(*events)
+        finally:
+            self._record('reaction', reaction._ob1(), reaction._name,
+                         perf_counter() - t0, len(events))
+
+    def _record(self, kind, ob, name, duration, nevents):
+        cls_name = 'None' if ob is None else ob.__class__.__name__
+        fullname = cls_name + '.' + name
+        # Per handler
+        stats = self._handlers.get(fullname, None)
+        if stats is None:
+            stats = self._handlers[fullname] = [kind, 0, 0, 0.0, 0.0]
+        stats[1] += 1
+        stats[2] += nevents
+        stats[3] += duration
+        stats[4] = max(stats[4], duration)
+        # Per component class
+        stats = self._classes.get(cls_name, None)
+        if stats is None:
+            stats = self._classes[cls_name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+        # Report slow handlers
+        if self._slow_threshold > 0 and duration >= self._slow_threshold:
+            self._slow_calls += 1
+            if kind == 'action':
+                logger.warning('Slow action %s took %0.3f s' % (fullname, duration))
+            else:
+                logger.warning('Slow reaction %s took %0.3f s for %i events' %
+                               (fullname, duration, nevents))
+
+    def get_stats(self):
+        """ Get a dict with the recorded statistics. All durations are
+        in seconds.
+        """
+        n = max(1, self._iterations)
+        queues = {}
+        for name, stats in self._queues.items():
+            queues[name] = dict(last=stats[0], max=stats[1], mean=stats[2] / n)
+        handlers = {}
+        for name, stats in self._handlers.items():
+            handlers[name] = dict(kind=stats[0], count=stats[1], events=stats[2],
+                                  total_time=stats[3], max_time=stats[4])
+        classes = {}
+        for name, stats in self._classes.items():
+            classes[name] = dict(count=stats[0], total_time=stats[1],
+                                 max_time=stats[2])
+        return dict(duration=perf_counter() - self._start_time,
+                    iterations=self._iterations,
+                    slow_threshold=self._slow_threshold,
+                    slow_calls=self._slow_calls,
+                    queues=queues,
+                    handlers=handlers,
+                    classes=classes,
+                    )
+
+    def to_json(self):
+        """ Get the recorded statistics as a JSON string.
+        """
+        return json.dumps(self.get_stats(), indent=2, sort_keys=True)
@@ -24,6 +24,16 @@ class Property(BaseDescriptor):
             automatically created that can be used to set the property.
             Default False.
         doc (str): The documentation string for this property (optional).
+        sync (str): For properties of ``PyComponent`` and ``JsComponent``
+            classes: when to send changes to the proxy object at the other
+            side. Can be 'eager' (always), 'on_demand' (only when the proxy
+            has reactions for it, or when it calls ``fetch_properties()``),
+            or 'never'. Default None, which means the class'
+            ``PROPERTY_SYNC`` is used (which is 'eager' by default).
+        diff (bool): For ``ListProp``, ``TupleProp`` and ``DictProp`` of
+            ``PyComponent`` and ``JsComponent`` classes: if True, setting
+            the property sends only the difference with the previous value
+            to the proxy object at the other side. Default False.
 
     Example usage:
 
@@ -56,8 +66,9 @@ class Property(BaseDescriptor):
 
     _default = None
     _data = None  # Configurable data
+    _diffable = False  # Whether the diff argument is supported
 
-    def __init__(self, *args, doc='', settable=False):
+    def __init__(self, *args, doc='', settable=False, sync=None, diff=False):
         self._consume_args(*args)
         # Set doc
         if not isinstance(doc, str):
@@ -65,6 +76,16 @@ class Property(BaseDescriptor):
         self._doc = doc
         # Set settable
         self._settable = bool(settable)
+        # Set sync policy
+        if sync not in (None, 'eager', 'on_demand', 'never'):
+            raise ValueError('event.Property() sync must be "eager", '
+                             '"on_demand" or "never", not %r.' % sync)
+        self._sync = sync
+        # Set diff
+        if diff and not self._diffable:
+            raise TypeError('event.%s() does not support diff.' %
+                            self.__class__.__name__)
+        self._diff = bool(diff)
 
         self._set_name('anonymous_property')
 
@@ -79,6 +100,7 @@ class Property(BaseDescriptor):
 
     def _set_name(self, name):
         self._name = name  # or func.__name__
+        self._private_name = '_' + name + '_value'
         self.__doc__ = self._format_doc(self.__class__.__name__, name, self._doc)
 
     def _set_data(self, data):
@@ -92,9 +114,9 @@ class Property(BaseDescriptor):
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        private_name = '_' + self._name + '_value'
-        loop.register_prop_access(instance, self._name)
-        return getattr(instance, private_name)
+        if loop._tracking_prop_access is True:
+            loop.register_prop_access(instance, self._name)
+        return instance.__property_values__[instance.__property_index__[self._name]]
 
     def make_mutator(self):
         flx_name = self._name
@@ -192,6 +214,7 @@ class TupleProp(Property):
     """
 
     _default = ()
+    _diffable = True
 
     def _validate(self, value, name, data):
         if not isinstance(value, (tuple, list)):
@@ -218,6 +241,7 @@ class ListProp(Property):
     """
 
     _default = []
+    _diffable = True
 
     def _validate(self, value, name, data):
         if not isinstance(value, (tuple, list)):
@@ -235,6 +259,7 @@ class DictProp(Property):
     """
 
     _default = {}
+    _diffable = True
 
     def _validate(self, value, name, data):
         if not isinstance(value, dict):
@@ -9,9 +9,8 @@ Implements the reaction decorator, class and desciptor.
 import weakref
 import inspect
 
-from ._loop import this_is_js
-from ._action import BaseDescriptor
-from ._dict import Dict
+from ._loop import loop, this_is_js
+from ._action import BaseDescriptor, InstanceDoc
 from . import logger
 
 
@@ -28,7 +27,7 @@ def looks_like_method(func):
         return False
 
 
-def reaction(*connection_strings, mode='normal'):
+def reaction(*connection_strings, mode='normal', interval=0.1):
     """ Decorator to turn a method of a Component into a
     :class:`Reaction <flexx.event.Reaction>`.
 
@@ -50,6 +49,9 @@ def reaction(*connection_strings, mode='normal'):
     connection strings, the mode is "auto": the reaction will automatically
     trigger when any of the properties used in the function changes.
     See :func:`get_mode() <flexx.event.Reaction.get_mode>` for details.
+    For the time-based modes "throttle" and "debounce", the ``interval``
+    (in seconds) specifies the minimal time between calls, or the quiet
+    time before a call, respectively.
     
     Connection string follow the following syntax rules:
     
@@ -81,8 +83,13 @@ def reaction(*connection_strings, mode='normal'):
     if not isinstance(mode, str):
         raise TypeError('Reaction mode must be a string.')
     mode = mode.lower()
-    if mode not in ('normal', 'greedy', 'auto'):
-        raise TypeError('Reaction mode must "normal", "greedy" or "auto".')
+    if mode not in ('normal', 'greedy', 'auto', 'throttle', 'debounce'):
+        raise TypeError('Reaction mode must "normal", "greedy", "auto", '
+                        '"throttle" or "debounce".')
+    if not (isinstance(interval, (int, float)) and interval >= 0):
+        raise TypeError('Reaction interval must be a nonnegative number.')
+    if mode in ('throttle', 'debounce') and not connection_strings:
+        raise TypeError('Reactions with mode %r need connection strings.' % mode)
 
     # Extract function if we can
     func = None
@@ -100,7 +107,8 @@ def reaction(*connection_strings, mode='normal'):
         if not looks_like_method(func):
             raise TypeError('reaction() decorator requires a method '
                             '(first arg must be self).')
-        return ReactionDescriptor(func, mode, connection_strings)
+        return ReactionDescriptor(func, mode, connection_strings,
+                                  interval=interval)
 
     if func is not None:
         return _connect(func)
@@ -108,17 +116,85 @@ def reaction(*connection_strings, mode='normal'):
         return _connect
 
 
+def _compile_connection_strings(connection_strings, name):
+    """ Parse and validate connection strings (PScript compatible). Returns
+    a list of (fullname, parts, type, force) tuples, where type includes
+    the label, which defaults to the given reaction name. The result does
+    not depend on the component, so it can be shared by all instances.
+    """
+
+    ichars = '0123456789_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+    plan = []
+
+    # Notes on connection strings:
+    # * The string can have a "!" at the start to suppress warnings for
+    #   connections to unknown event types.
+    # * The string can have a label suffix separated by a colon. The
+    #   label may consist of any chars.
+    # * Connection strings consist of parts separated by dots.
+    # * Each part can end with one star ('*'), indicating that connections
+    #   should be made for each item in the list, or two stars, indicating
+    #   that connections should be made *recursively* for each item in the
+    #   list (a.k.a. a deep connector).
+    # * Stripped of '*', each part must be a valid identifier.
+    # * An extreme example: "!foo.bar*.spam.eggs**:meh"
+    for ic in range(len(connection_strings)):
+        fullname = connection_strings[ic]
+        # Separate label and exclamation mark from the string path
+        force = fullname.startswith('!')
+        s, _, label = fullname.lstrip('!').partition(':')
+        s0 = s
+        # Backwards compat: "foo.*.bar* becomes "foo*.bar"
+        if '.*.' in s + '.':
+            s = s.replace('.*', '*')
+            if loop._production is False:
+                console.warn('Connection string syntax "foo.*.bar" is deprecated, '
+                             'use "%s" instead of "%s":.' % (s, s0))
+        # Help put exclamation at the start
+        if '!' in s:
+            s = s.replace('!', '')
+            force = True
+            if loop._production is False:
+                console.warn('Exclamation marks in connection strings must come at '
+                             'the very start, use "!%s" instead of "%s".' % (s, s0))
+        # Check that all parts are identifiers
+        parts = s.split('.')
+        for ipart in range(len(parts)):
+            part = parts[ipart].rstrip('*')
+            is_identifier = len(part) > 0
+            for i in range(len(part)):
+                is_identifier = is_identifier and (part[i] in ichars)
+            if is_identifier is False:
+                raise ValueError('Connection string %r contains '
+                                 'non-identifier part %r' % (s, part))
+        type = parts[-1].rstrip('*') + ':' + (label or name)
+        plan.append((fullname, parts, type, force))
+    return plan
+
+
+class _Connection:
+    """ The state of one connection of a reaction (Python only; in JS
+    this is a plain object).
+    """
+
+    __slots__ = ('fullname', 'parts', 'type', 'force', 'objects')
+
+
 class ReactionDescriptor(BaseDescriptor):
     """ Class descriptor for reactions.
     """
 
-    def __init__(self, func, mode, connection_strings, ob=None):
+    def __init__(self, func, mode, connection_strings, ob=None, interval=0):
         self._name = func.__name__
         self._func = func
         self._mode = mode
+        self._interval = interval
         if len(connection_strings) == 0:
             self._mode = 'auto'
         self._connection_strings = connection_strings
+        self._connection_plan = None
+        self._private_name = '_' + self._name + '_reaction'
         self._ob = None if ob is None else weakref.ref(ob)
         self.__doc__ = self._format_doc('reaction', self._name, func.__doc__)
 
@@ -126,15 +202,15 @@ class ReactionDescriptor(BaseDescriptor):
         if instance is None:
             return self
 
-        private_name = '_' + self._name + '_reaction'
-        try:
-            reaction = getattr(instance, private_name)
-        except AttributeError:
+        reaction = instance.__dict__.get(self._private_name, None)
+        if reaction is None:
             reaction = Reaction(instance if self._ob is None else self._ob(),
                                 (self._func, instance),
                                 self._mode,
-                                self._connection_strings)
-            setattr(instance, private_name, reaction)
+                                self._connection_strings,
+                                self.get_connection_plan(),
+                                self._interval)
+            instance.__dict__[self._private_name] = reaction
 
         # Make the reaction use *our* func one time. In most situations
         # this is the same function that the reaction has, but not when
@@ -143,6 +219,16 @@ class ReactionDescriptor(BaseDescriptor):
         reaction._use_once(self._func)
         return reaction
 
+    def get_connection_plan(self):
+        """ Get the parsed connection strings, as a tuple of
+        (fullname, parts, type, force) tuples. These are compiled once
+        (normally by the ComponentMeta) and shared by all instances.
+        """
+        if self._connection_plan is None:
+            plan = _compile_connection_strings(self._connection_strings, self._name)
+            self._connection_plan = tuple(plan)
+        return self._connection_plan
+
     @property
     def local_connection_strings(self):
         """ List of connection strings that are local to the object.
@@ -159,7 +245,14 @@ class Reaction:
 
     _count = 0
 
-    def __init__(self, ob, func, mode, connection_strings):
+    # Use slots, since there can be many instances. The docstring is
+    # created on demand, see the bottom of this module.
+    __slots__ = ('_id', '_ob1', '_ob2', '_func', '_func_once', '_mode', '_interval',
+                 '_name', '_connections', '_implicit_connections', '_last_call_time',
+                 '__weakref__')
+
+    def __init__(self, ob, func, mode, connection_strings, plan=None,
+                 interval=0):
         Reaction._count += 1
         self._id = 'r%i' % Reaction._count  # to ensure a consistent event order
 
@@ -182,71 +275,41 @@ class Reaction:
 
         # Store func, name, and docstring (e.g. for sphinx docs)
         assert callable(func)
-        assert mode in ('normal', 'greedy', 'auto')
+        assert mode in ('normal', 'greedy', 'auto', 'throttle', 'debounce')
         self._func = func
         self._func_once = func
         self._mode = mode
+        self._interval = interval
         self._name = func.__name__
-        self.__doc__ = BaseDescriptor._format_doc('reaction', self._name, func.__doc__)
 
-        self._init(connection_strings)
+        self._init(connection_strings, plan)
 
-    def _init(self, connection_strings):
+    def _init(self, connection_strings, plan=None):
         """ Init of this reaction that is compatible with PScript.
         """
 
-        ichars = '0123456789_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
-
         # Init explicit connections: (connection-object, type) tuples
         self._connections = []
         # Init implicit connections: (component, type) tuples
         self._implicit_connections = []
+        # For throttle mode
+        self._last_call_time = 0
 
-        # Notes on connection strings:
-        # * The string can have a "!" at the start to suppress warnings for
-        #   connections to unknown event types.
-        # * The string can have a label suffix separated by a colon. The
-        #   label may consist of any chars.
-        # * Connection strings consist of parts separated by dots.
-        # * Each part can end with one star ('*'), indicating that connections
-        #   should be made for each item in the list, or two stars, indicating
-        #   that connections should be made *recursively* for each item in the
-        #   list (a.k.a. a deep connector).
-        # * Stripped of '*', each part must be a valid identifier.
-        # * An extreme example: "!foo.bar*.spam.eggs**:meh"
-        for ic in range(len(connection_strings)):
-            fullname = connection_strings[ic]
-            # Separate label and exclamation mark from the string path
-            force = fullname.startswith('!')
-            s, _, label = fullname.lstrip('!').partition(':')
-            s0 = s
-            # Backwards compat: "foo.*.bar* becomes "foo*.bar"
-            if '.*.' in s + '.':
-                s = s.replace('.*', '*')
-                console.warn('Connection string syntax "foo.*.bar" is deprecated, '
-                             'use "%s" instead of "%s":.' % (s, s0))
-            # Help put exclamation at the start
-            if '!' in s:
-                s = s.replace('!', '')
-                force = True
-                console.warn('Exclamation marks in connection strings must come at '
-                             'the very start, use "!%s" instead of "%s".' % (s, s0))
-            # Check that all parts are identifiers
-            parts = s.split('.')
-            for ipart in range(len(parts)):
-                part = parts[ipart].rstrip('*')
-                is_identifier = len(part) > 0
-                for i in range(len(part)):
-                    is_identifier = is_identifier and (part[i] in ichars)
-                if is_identifier is False:
-                    raise ValueError('Connection string %r contains '
-                                     'non-identifier part %r' % (s, part))
+        # Parse connection strings, unless we're given a precompiled plan
+        if not plan:
+            plan = _compile_connection_strings(connection_strings, self._name)
+
+        for ic in range(len(plan)):
+            fullname, parts, type, force = plan[ic]
             # Init connection
-            d = Dict()  # don't do Dict(foo=x) bc PScript only supports that for dict
+            if this_is_js():
+                d = {}
+            else:
+                d = _Connection()
             self._connections.append(d)
             d.fullname = fullname  # original, used in logs, so is searchable
             d.parts = parts
-            d.type = parts[-1].rstrip('*') + ':' + (label or self._name)
+            d.type = type
             d.force = force
             d.objects = []
 
@@ -274,6 +337,10 @@ class Reaction:
           automatically triggered when any of these properties changes. Like
           'greedy' there is at most one call per event loop iteration.
           Reactions with zero connection strings always have mode 'auto'.
+        * 'throttle': like 'greedy', but there is at least the reaction's
+          interval between calls. Events that occur in between are collected.
+        * 'debounce': like 'greedy', but the reaction is called when no events
+          have occurred for the duration of its interval.
 
         The 'normal' mode generally offers the most consistent behaviour.
         The 'greedy' mode allows the event system to make some optimizations.
@@ -328,11 +395,14 @@ class Reaction:
         """ Disconnect all connections so that there are no more references
         to components.
         """
+        if self._mode == 'throttle' or self._mode == 'debounce':
+            loop._discard_timed_reaction(self)
         if len(self._connections) == 0 and len(self._implicit_connections) == 0:
             return
         if not this_is_js():
             self._ob1 = lambda: None
-            logger.debug('Disposing reaction %r ' % self)
+            if loop._production is False:
+                logger.debug('Disposing reaction %r ', self)
         while len(self._implicit_connections):
             ob, type = self._implicit_connections.pop(0)
             ob.disconnect(type, self)
@@ -350,6 +420,19 @@ class Reaction:
         # Init - each connection is a (component, type) tuple
         old_conns = self._implicit_connections
         new_conns = connections
+
+        # In the steady state, the reaction uses the same properties each
+        # time, so we first check that, which is much cheaper than reconnecting.
+        if len(old_conns) == len(new_conns):
+            same = True
+            for i in range(len(new_conns)):
+                if not (old_conns[i][0] is new_conns[i][0] and
+                        old_conns[i][1] == new_conns[i][1]):
+                    same = False
+                    break
+            if same is True:
+                return
+
         self._implicit_connections = new_conns
 
         # Reconnect in a smart way
@@ -369,11 +452,35 @@ class Reaction:
                 if connection.objects[i][0] is ob:
                     connection.objects.pop(i)
 
-    def reconnect(self, index):
-        """ (re)connect the index'th connection.
+    def _clear_disposed_refs(self):
+        """ Clear all references to disposed Component instances. This is
+        called by the loop after disposing multiple components at once.
+        """
+        connections = self._implicit_connections
+        self._implicit_connections = []
+        for i in range(len(connections)):
+            if connections[i][0]._disposed is False:
+                self._implicit_connections.append(connections[i])
+        for ic in range(len(self._connections)):
+            connection = self._connections[ic]
+            objects = connection.objects
+            connection.objects = []
+            for i in range(len(objects)):
+                if objects[i][0]._disposed is False:
+                    connection.objects.append(objects[i])
+
+    def reconnect(self, index, ev=None):
+        """ (re)connect the index'th connection. If the event that caused
+        the reconnect is given, only the affected part is reconnected when
+        possible.
         """
         connection = self._connections[index]
 
+        # Try to only reconnect the subtree under the changed component
+        if ev is not None:
+            if self._reconnect_subtree(index, ev) is True:
+                return
+
         # Prepare disconnecting
         old_objects = connection.objects  # (ob, type) tuples
         connection.objects = []
@@ -391,9 +498,91 @@ class Reaction:
         # Reconnect in a smart way
         self._connect_and_disconnect(old_objects, new_objects, connection.force)
 
-    def _connect_and_disconnect(self, old_objects, new_objects, force=False):
+    def _reconnect_subtree(self, index, ev):
+        """ Reconnect the part of the index'th connection that corresponds
+        to the children of the component that emitted the given event, for
+        deep connectors (e.g. "children**.foo"). Returns True on success, or
+        False if a full reconnect is needed.
+        """
+        connection = self._connections[index]
+        ob = ev.source
+        name = ev.type
+
+        # The changed property must only occur in the path as deep connector
+        ipart = -1
+        for i in range(len(connection.parts)):
+            part = connection.parts[i]
+            if part.rstrip('*') == name:
+                if ipart >= 0 or part != name + '**':
+                    return False
+                ipart = i
+        if ipart < 0:
+            return False
+
+        # Get old and new children from the mutation
+        mutation = ev.get('mutation', None)
+        new_children = getattr(ob, name, None)
+        if mutation == 'set':
+            old_children = ev.get('old_value', None)
+        elif mutation == 'insert':
+            n = len(ev.objects)
+            old_children = new_children[:ev.index] + new_children[ev.index + n:]
+        else:
+            return False
+        if not (isinstance(old_children, (tuple, list)) and
+                isinstance(new_children, (tuple, list))):
+            return False
+
+        # Find the connection for the changed property, the objects
+        # corresponding to its children come right after
+        objects = connection.objects
+        reconnect_type = name + ':reconnect_' + str(index)
+        i1 = -1
+        for i in range(len(objects)):
+            if objects[i][0] is ob and objects[i][1] == reconnect_type:
+                if i1 >= 0:
+                    return False  # the component occurs multiple times
+                i1 = i + 1
+        if i1 < 0:
+            return False
+
+        # Get the objects for the old children, and verify that they match.
+        # They won't if the connections were made after the mutation.
+        path = [name + '***'] + list(connection.parts[ipart + 1:])
+        old_objects = self._seek_event_objects(index, path, old_children)
+        i2 = i1 + len(old_objects)
+        if i2 > len(objects):
+            return False
+        for i in range(len(old_objects)):
+            if not (objects[i1 + i][0] is old_objects[i][0] and
+                    objects[i1 + i][1] == old_objects[i][1]):
+                return False
+
+        # Splice in the objects for the new children
+        new_objects = self._seek_event_objects(index, path, new_children)
+        connection.objects = objects[:i1] + new_objects + objects[i2:]
+        self._connect_and_disconnect(old_objects, new_objects, connection.force,
+                                     objects[:i1] + objects[i2:])
+        return True
+
+    def _seek_event_objects(self, index, path, obs):
+        """ Get the (ob, type) tuples for the given path, for a list of objects.
+        """
+        connection = self._connections[index]
+        objects = connection.objects
+        connection.objects = []
+        try:
+            for i in range(len(obs)):
+                self._seek_event_object(index, path, obs[i])
+            return connection.objects
+        finally:
+            connection.objects = objects
+
+    def _connect_and_disconnect(self, old_objects, new_objects, force=False,
+                                other_objects=None):
         """ Update connections by disconnecting old and connecting new,
-        but try to keep connections that do not change.
+        but try to keep connections that do not change. Connections in
+        other_objects (if given) are kept as well.
         """
 
         # Keep track of what connections we skip, i.e. which we should not remove.
@@ -415,6 +604,15 @@ class Reaction:
             should_stay[new_objects[i2][0].id + '-' + new_objects[i2][1]] = True
             i2 -= 1
             i3 -= 1
+        if other_objects is not None and i1 <= i3:
+            # Check (by component first) whether the old ones occur elsewhere
+            candidates = {}
+            for i in range(i1, i3+1):
+                candidates[old_objects[i][0]._id] = True
+            for i in range(len(other_objects)):
+                ob, type = other_objects[i]
+                if ob._id in candidates:
+                    should_stay[ob.id + '-' + type] = True
         # Disconnect remaining old
         for i in range(i1, i3+1):
             ob, type = old_objects[i]
@@ -462,7 +660,7 @@ class Reaction:
         # Look inside?
         if len(selector) and selector in '***' and isinstance(new_ob, (tuple, list)):
             if len(selector) > 1:
-                path = [obname + '***'] + path  # recurse (avoid insert for space)
+                path = [obname + '***'] + list(path)  # recurse (avoid insert for space)
             for isub in range(len(new_ob)):
                 self._seek_event_object(index, path, new_ob[isub])
             return
@@ -472,3 +670,8 @@ class Reaction:
                 .replace("{name}", obname))
         else:
             return self._seek_event_object(index, path, new_ob)
+
+
+Reaction.__doc__ = InstanceDoc(
+    Reaction.__doc__,
+    lambda ob: BaseDescriptor._format_doc('reaction', ob._name, ob._func.__doc__))
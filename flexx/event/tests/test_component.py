@@ -352,6 +352,74 @@ def test_component_event_types():
     print(c.get_event_types())
 
 
+def test_component_compact_storage():  # Py only
+
+    c = Bar()
+    loop.iter()
+
+    # Handler lists are only created when a reaction registers
+    assert c._Component__handlers == {}
+    assert c.get_event_types() == ['a_emitter', 'a_prop']
+    assert c.get_event_handlers('a_prop') == []
+    h = c.reaction('a_prop', lambda *events: None)
+    assert list(c._Component__handlers) == ['a_prop']
+    assert c.get_event_types() == ['a_emitter', 'a_prop']
+
+    # Actions, emitters and reactions have no per-instance dict
+    for ob in (h, c.a_action, c.a_emitter):
+        assert not hasattr(ob, '__dict__')
+
+    # But they still have their own docs
+    assert 'reaction' in event.Reaction.__doc__
+    assert 'action' in event.Action.__doc__
+    assert 'emitter' in event.Emitter.__doc__.lower()
+    assert c.a_action.__doc__ != event.Action.__doc__
+    assert c.a_emitter.__doc__ != event.Emitter.__doc__
+
+
+
+class HookCounter(event.Component):
+
+    hook_count = 0
+    used_types = ''
+
+    def _registered_reactions_hook(self):
+        used_event_types = super()._registered_reactions_hook()
+        self.hook_count += 1
+        self.used_types = ' '.join(sorted(used_event_types))
+        return used_event_types
+
+
+@run_in_both(HookCounter)
+def test_component_reactions_hook_is_batched():
+    """
+    1 bar foo
+    0
+    1 bar
+    """
+    c = HookCounter()
+    loop.iter()
+    c.hook_count = 0
+
+    # Many changes in one iteration result in one call
+    reactions = []
+    for i in range(10):
+        reactions.append(c.reaction(lambda *events: None, '!foo'))
+        reactions.append(c.reaction(lambda *events: None, '!bar'))
+    loop.iter()
+    print(c.hook_count, c.used_types)
+
+    # No changes, no calls
+    c.hook_count = 0
+    loop.iter()
+    print(c.hook_count)
+
+    for i in range(0, 20, 2):
+        reactions[i].dispose()
+    loop.iter()
+    print(c.hook_count, c.used_types)
+
+
 
 class Foo2(event.Component):
 
@@ -566,6 +634,32 @@ def test_component_active1():
     print(len(loop.get_active_components()))
 
 
+@run_in_both(Foo, CompCheckActive)
+def test_component_active_production():
+    """
+    1
+    2
+    done
+    """
+    loop.iter()
+    # In production mode, the check is skipped
+    loop._production = True
+    try:
+        Foo()
+        print(len(loop._pending_calls))
+        loop.iter()
+        f = Foo()
+        with f:
+            CompCheckActive(True)  # no errors
+    finally:
+        loop._production = False
+    loop.iter()
+    Foo()
+    print(len(loop._pending_calls))
+    loop.iter()
+    print('done')
+
+
 @run_in_both(Foo, Bar)
 def test_component_active2():
     """
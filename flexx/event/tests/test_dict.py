@@ -86,4 +86,87 @@ def test_dir_and_repr():
     assert 42 not in names
 
 
+def test_event():
+
+    ev = event.Event(dict(new_value=3, foo=4), type='bar')
+    assert ev.type == 'bar' and ev['type'] == 'bar'
+    assert ev.new_value == 3 and ev['new_value'] == 3
+    assert ev.foo == 4 and ev['foo'] == 4
+
+    # Unset fields are not there
+    assert 'old_value' not in ev
+    assert ev.get('old_value', 5) == 5
+    assert not hasattr(ev, 'old_value')
+    with raises(KeyError):
+        ev['old_value']
+    with raises(KeyError):
+        ev['spam']
+
+    # Set fields and custom keys, in both ways
+    ev.source = None
+    ev['old_value'] = 2
+    ev.spam = 5
+    ev[42] = 6
+    assert len(ev) == 7
+    assert list(ev.keys()) == ['type', 'source', 'new_value', 'old_value',
+                               'foo', 'spam', 42]
+    d = dict(type='bar', source=None, new_value=3, old_value=2, foo=4, spam=5)
+    d[42] = 6
+    assert ev == d
+
+    del ev.spam
+    del ev['old_value']
+    assert 'spam' not in ev and 'old_value' not in ev
+
+    # Copy
+    ev2 = event.Event(ev)
+    ev2.type = 'eggs'
+    ev2.foo = 5
+    assert ev.type == 'bar' and ev.foo == 4
+    assert ev2.new_value == 3
+
+    r = repr(ev)
+    assert r.startswith('Event(') and "type='bar'" in r and '(42, 6)' in r
+
+
+def test_event_emitted():
+
+    class Foo(event.Component):
+        bar = event.IntProp(settable=True)
+
+    foo = Foo()
+    info = dict(x=3)
+    ev = foo.emit('spam', info)
+    assert isinstance(ev, event.Event)
+    assert ev.source is foo and ev.type == 'spam' and ev.x == 3
+    assert info == dict(x=3)  # info is copied
+
+    # Property events only use the common fields
+    ev = foo.emit('bar', dict(new_value=4, old_value=3, mutation='set'))
+    assert set(ev.keys()) == {'type', 'source', 'new_value', 'old_value',
+                              'mutation'}
+    assert ev._extra is None
+
+
+def test_event_reserved_keys():
+
+    class Foo(event.Component):
+        pass
+
+    # Keys that are also method names do not break the event
+    foo = Foo()
+    ev = foo.emit('spam', {'items': [1, 2], 'get': 3})
+    assert ev['items'] == [1, 2] and ev['get'] == 3
+    assert callable(ev.items) and ev.get('get') == 3
+    assert sorted(ev.keys()) == ['get', 'items', 'source', 'type']
+    r = repr(ev)
+    assert 'items=[1, 2]' in r and 'get=3' in r
+    with raises(AttributeError):
+        ev.items = 4
+    ev['items'] = 4
+    assert ev['items'] == 4
+    del ev['items']
+    assert 'items' not in ev
+
+
 run_tests_if_main()
@@ -209,6 +209,53 @@ def test_disposing_disconnects4():
     print('xx')
 
 
+class MyComponent5(event.Component):
+
+    children = event.ListProp(settable=True)
+
+    @event.reaction('children*.foo')
+    def on_foo_explicit(self, *events):
+        print('explicit', len(events))
+
+    @event.reaction
+    def on_foo_implicit(self):
+        print('implicit', len([c.foo for c in self.children]))
+
+
+@run_in_both(MyComponent5, MyComponent1)
+def test_disposing_many():
+    """
+    implicit 4
+    4 4
+    explicit 2
+    implicit 4
+    - true true
+    2 2
+    explicit 1
+    implicit 4
+    """
+    m = MyComponent5()
+    children = [MyComponent1(), MyComponent1(), MyComponent1(), MyComponent1()]
+    m.set_children(children)
+    loop.iter()
+    print(len(m.on_foo_explicit._connections[0].objects) - 1,
+          len(m.on_foo_implicit._implicit_connections) - 1)
+
+    children[0].set_foo(1)
+    children[1].set_foo(1)
+    loop.iter()
+
+    # The reactions are cleaned up when the outermost call is done
+    loop._dispose_many([children[0], children[1]])
+    print('-', loop._dispose_sweep is None, children[1]._disposed)
+    print(len(m.on_foo_explicit._connections[0].objects) - 1,
+          len(m.on_foo_implicit._implicit_connections) - 1)
+
+    children[1].set_foo(2)
+    children[2].set_foo(2)
+    loop.iter()
+
+
 ## In JS ...
 
 
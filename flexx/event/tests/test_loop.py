@@ -177,6 +177,103 @@ def test_loop_cannot_call_iter():
     loop.iter()
 
 
+class Budgeted(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+
+    @event.action
+    def step(self, i):
+        loop._fake_now += 1
+        print('action', i)
+        self._mutate_foo(i + 1)
+
+    @event.reaction('foo')
+    def on_foo(self, *events):
+        loop._fake_now += 1
+        print('reaction', ' '.join([str(ev.new_value) for ev in events]))
+
+
+@run_in_both(Budgeted)
+def test_loop_time_budget():
+    """
+    reaction 0
+    reaction 0
+    reaction 0
+    action 0
+    action 1
+    - true
+    action 2
+    reaction 1
+    - true
+    reaction 2
+    reaction 3
+    reaction 9
+    - false
+    """
+    loop._fake_now = 0
+    bs = [Budgeted(), Budgeted(), Budgeted()]
+    loop.iter()
+
+    loop._time = lambda: loop._fake_now
+    loop.set_time_budget(1.5)
+    try:
+        for i in range(3):
+            bs[i].step(i)
+        loop.iter()
+        print('-', loop.has_pending())
+        loop.iter()
+        print('-', loop.has_pending())
+        bs[2].set_foo(9)
+        loop.iter()
+        print('-', loop.has_pending())
+    finally:
+        loop.set_time_budget(0)
+        del loop._time
+
+
+class BudgetedChain(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+    bar = event.IntProp(0, settable=True)
+
+    @event.reaction('foo')
+    def r1_set_bar(self, *events):
+        loop._fake_now += 2
+        self.set_bar(self.foo * 10)
+
+    @event.reaction('foo')
+    def r2_show_bar(self, *events):
+        print('bar', self.bar)
+
+
+@run_in_both(BudgetedChain)
+def test_loop_time_budget_reaction_order():
+    """
+    bar 0
+    - true
+    bar 0
+    - 10 false
+    """
+    # The action invoked by the first reaction must not be applied before
+    # the second reaction, even if these are processed in separate iterations.
+    loop._fake_now = 0
+    c = BudgetedChain()
+    loop.iter()
+
+    loop._time = lambda: loop._fake_now
+    loop.set_time_budget(1.5)
+    try:
+        c.set_foo(1)
+        loop.iter()
+        print('-', loop.has_pending())
+        loop.iter()
+        loop.iter()
+        print('-', c.bar, loop.has_pending())
+    finally:
+        loop.set_time_budget(0)
+        del loop._time
+
+
 ## Tests for only Python
 
 
@@ -216,6 +313,166 @@ def test_loop_asyncio():
     assert len(res) == 2
 
 
+def test_loop_time_budget_validation():
+    with raises(ValueError):
+        loop.set_time_budget(-1)
+    with raises(ValueError):
+        loop.set_time_budget('foo')
+    loop.set_time_budget(0)
+    assert loop._time_budget == 0
+
+
+class Transacted(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+    bar = event.ListProp([], settable=True)
+
+    def init(self):
+        self.events = []
+
+    @event.action
+    def bulk(self, n):
+        with loop.transaction():
+            for i in range(n):
+                self._mutate_foo(i)
+
+    @event.reaction('foo', 'bar')
+    def on_change(self, *events):
+        for ev in events:
+            self.events.append((ev.type, ev.mutation,
+                                ev.get('old_value'), ev.get('new_value')))
+
+
+def test_loop_transaction():
+    m1, m2 = Transacted(), Transacted()
+    loop.iter()
+    m1.events[:] = []
+    m2.events[:] = []
+
+    # One event per property, with the net change; the invoked actions
+    # are applied when the transaction exits
+    with loop.transaction():
+        for i in range(10):
+            m1.set_foo(i + 1)
+            m2.set_foo(i + 2)
+        assert m1.foo == 0
+    loop.iter()
+    assert m1.foo == 10 and m2.foo == 11
+    assert m1.events == [('foo', 'set', 0, 10)]
+    assert m2.events == [('foo', 'set', 0, 11)]
+
+    # Inside an action; no event if the value ends up the same
+    m1.events[:] = []
+    m1.bulk(11)
+    loop.iter()
+    assert m1.foo == 10
+    assert m1.events == []
+    m1.bulk(4)
+    loop.iter()
+    assert m1.events == [('foo', 'set', 10, 3)]
+
+    # Nested transactions emit when the outermost one exits
+    m1.events[:] = []
+    with m1:
+        with loop.transaction():
+            with loop.transaction():
+                m1._mutate_foo(20)
+            assert loop._transaction is not None
+            m1._mutate_foo(21)
+        assert loop._transaction is None
+    loop.iter()
+    assert m1.events == [('foo', 'set', 3, 21)]
+
+    # Partial mutations are coalesced if the property was set earlier ...
+    m1.events[:] = []
+    with m1:
+        with loop.transaction():
+            m1._mutate_bar([1, 2])
+            m1._mutate_bar([3], 'insert', 2)
+    loop.iter()
+    assert m1.events == [('bar', 'set', [], [1, 2, 3])]
+
+    # ... otherwise they are emitted as usual
+    m1.events[:] = []
+    with m1:
+        with loop.transaction():
+            m1._mutate_bar([4], 'insert', 3)
+    loop.iter()
+    assert m1.bar == [1, 2, 3, 4]
+    assert m1.events == [('bar', 'insert', None, None)]
+
+
+def test_loop_transaction_other_thread():
+    import threading
+
+    errors = []
+    def func():
+        try:
+            with loop.transaction():
+                pass
+        except RuntimeError as err:
+            errors.append(err)
+
+    t = threading.Thread(target=func)
+    t.start()
+    t.join()
+    assert len(errors) == 1 and 'thread' in str(errors[0])
+    assert loop._transaction is None and loop._transaction_depth == 0
+
+
+def test_loop_call_later_asyncio():
+    import asyncio
+
+    aio_loop = asyncio.new_event_loop()
+    loop.integrate(aio_loop, reset=False)
+
+    res = []
+    def callback(i):
+        res.append(i)
+
+    loop.call_later(0.1, callback, 1)
+    loop.call_later(0.01, callback, 2)
+    loop.call_later(0.05, callback, 3)
+    aio_loop.run_until_complete(asyncio.sleep(0.03))
+    assert res == [2]
+    aio_loop.run_until_complete(asyncio.sleep(0.15))
+    assert res == [2, 3, 1]
+
+
+def test_loop_same_thread_fast_path():
+    import asyncio
+    import threading
+
+    aio_loop = asyncio.new_event_loop()
+    loop.integrate(aio_loop, reset=False)
+
+    # Track use of the thread-safe call_soon (which writes to the self-pipe)
+    threadsafe_calls = []
+    ori_call_soon_func = loop._call_soon_func
+    def call_soon_func(*args):
+        threadsafe_calls.append(args)
+        return ori_call_soon_func(*args)
+    loop._call_soon_func = call_soon_func
+
+    res = []
+    try:
+        # From the loop's thread
+        loop.call_soon(res.append, 1)
+        assert len(threadsafe_calls) == 0
+        aio_loop.run_until_complete(asyncio.sleep(0.01))
+        assert res == [1]
+
+        # From another thread
+        t = threading.Thread(target=loop.call_soon, args=(res.append, 2))
+        t.start()
+        t.join()
+        assert len(threadsafe_calls) == 1
+        aio_loop.run_until_complete(asyncio.sleep(0.01))
+        assert res == [1, 2]
+    finally:
+        loop._call_soon_func = ori_call_soon_func
+
+
 def xx_disabled_test_integrate():
 
     res = []
@@ -0,0 +1,123 @@
+"""
+Test the event loop profiler.
+"""
+
+import json
+import time
+
+from flexx.util.testing import run_tests_if_main, raises
+
+from flexx import event
+from flexx.event._profiler import LoopProfiler
+
+loop = event.loop
+
+
+class ProfiledComponent(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+
+    @event.action
+    def sleep(self, t):
+        time.sleep(t)
+
+    @event.reaction('foo')
+    def on_foo(self, *events):
+        pass
+
+
+def test_profiler_disabled():
+    loop.reset()
+    assert loop._profiler is None
+    assert loop.get_profile_stats() is None
+    assert loop.stop_profiling() is None
+
+
+def test_profiler_stats():
+    loop.reset()
+    c = ProfiledComponent()
+    loop.iter()
+
+    loop.start_profiling()
+    try:
+        c.set_foo(1)
+        c.set_foo(2)
+        loop.iter()
+        c.sleep(0.01)
+        loop.iter()
+        stats = loop.get_profile_stats()
+    finally:
+        assert loop.stop_profiling() is not None
+    assert loop._profiler is None
+
+    assert stats['iterations'] == 2
+    assert stats['queues']['actions'] == dict(last=1, max=2, mean=1.5)
+    assert stats['queues']['reactions']['max'] == 0
+
+    handlers = stats['handlers']
+    assert handlers['ProfiledComponent.set_foo']['kind'] == 'action'
+    assert handlers['ProfiledComponent.set_foo']['count'] == 2
+    assert handlers['ProfiledComponent.on_foo']['kind'] == 'reaction'
+    assert handlers['ProfiledComponent.on_foo']['count'] == 1
+    assert handlers['ProfiledComponent.on_foo']['events'] == 2
+    sleep_stats = handlers['ProfiledComponent.sleep']
+    assert sleep_stats['count'] == 1
+    assert 0.01 <= sleep_stats['max_time'] == sleep_stats['total_time']
+
+    classes = stats['classes']
+    assert classes['ProfiledComponent']['count'] == 4
+    assert classes['ProfiledComponent']['max_time'] == sleep_stats['max_time']
+
+    # Stats are not recorded anymore
+    c.set_foo(3)
+    loop.iter()
+    assert loop.get_profile_stats() is None
+
+
+def test_profiler_slow_threshold():
+    loop.reset()
+    c = ProfiledComponent()
+    loop.iter()
+
+    with raises(ValueError):
+        loop.start_profiling(-1)
+
+    logged = []
+    handler = lambda *args: logged.append(args)
+    loop.start_profiling(slow_threshold=0.05)
+    event.logger.warning, ori = handler, event.logger.warning
+    try:
+        c.sleep(0.001)
+        c.sleep(0.06)
+        loop.iter()
+    finally:
+        event.logger.warning = ori
+        stats = loop.stop_profiling()
+
+    assert stats['slow_calls'] == 1
+    assert len(logged) == 1
+    assert 'Slow action ProfiledComponent.sleep' in logged[0][0]
+
+
+def test_profiler_json():
+    loop.reset()
+    c = ProfiledComponent()
+    loop.iter()
+
+    loop.start_profiling()
+    try:
+        c.set_foo(1)
+        loop.iter()
+        text = loop.get_profile_stats(as_json=True)
+    finally:
+        loop.stop_profiling()
+
+    stats = json.loads(text)
+    assert stats['handlers']['ProfiledComponent.on_foo']['count'] == 1
+
+    # Can also be used standalone
+    profiler = LoopProfiler()
+    assert json.loads(profiler.to_json())['iterations'] == 0
+
+
+run_tests_if_main()
@@ -715,4 +715,39 @@ def test_property_python_only():
     assert 'anyprop' in repr(m.__class__.anyprop2).lower()
 
 
+def test_property_access_tracking():
+    # Property access is only registered during auto reactions
+
+    class MyObject2(event.Component):
+        foo = event.IntProp(3, settable=True)
+        bar = event.IntProp(4, settable=True)
+
+        @event.reaction('foo')
+        def normal_reaction(self, *events):
+            self.bar
+
+        @event.reaction
+        def auto_reaction(self):
+            self.foo
+
+    registered = []
+    ori = loop.register_prop_access
+    loop.register_prop_access = lambda *args: registered.append(args[1])
+    try:
+        m = MyObject2()
+        m.foo
+        loop.iter()
+    finally:
+        del loop.register_prop_access
+    assert loop.register_prop_access == ori
+    assert registered == ['foo']
+
+    # The indices and validators are precomputed per class
+    assert MyObject2.foo._private_name == '_foo_value'  # used in JS
+    assert set(MyObject2.__property_info__) == {'foo', 'bar'}
+    index, validator = MyObject2.__property_info__['foo']
+    assert index == MyObject2.__properties__.index('foo')
+    assert validator('5') == 5
+
+
 run_tests_if_main()
@@ -110,6 +110,103 @@ def test_reaction_order4():
 
 ## Labels
 
+class MyObject_timed(event.Component):
+
+    foo = event.IntProp(settable=True)
+
+    @event.reaction('!foo', mode='throttle', interval=1)
+    def r_throttle(self, *events):
+        print('throttle ' + ' '.join([str(ev.new_value) for ev in events]))
+
+    @event.reaction('!foo', mode='debounce', interval=1)
+    def r_debounce(self, *events):
+        print('debounce ' + ' '.join([str(ev.new_value) for ev in events]))
+
+
+@run_in_both(MyObject_timed)
+def test_reaction_throttle_and_debounce():
+    """
+    throttle 0
+    -
+    throttle 1
+    -
+    throttle 2 3
+    -
+    debounce 0 1 2 3
+    -
+    throttle 4
+    -
+    debounce 4
+    """
+    t = [100]
+    loop._time = lambda: t[0]
+    try:
+        m = MyObject_timed()
+        loop.iter()
+        loop.iter()  # throttle fires right away
+        print('-')
+
+        # Throttle calls at most once per interval, debounce waits for quiet
+        for i in range(1, 4):
+            t[0] += 0.6
+            m.set_foo(i)
+            loop.iter()
+            loop.iter()
+        print('-')
+
+        t[0] += 0.9
+        loop.iter()
+        loop.iter()
+        print('-')
+        t[0] += 0.2
+        loop.iter()
+        loop.iter()
+        print('-')
+
+        # After quiet time, throttle is immediate again
+        t[0] += 10
+        m.set_foo(4)
+        loop.iter()
+        loop.iter()
+        print('-')
+        t[0] += 1
+        loop.iter()
+        loop.iter()
+    finally:
+        del loop._time
+
+
+@run_in_both(MyObject_timed)
+def test_reaction_throttle_and_debounce_dispose():
+    """
+    throttle 0
+    -
+    true
+    done
+    """
+    t = [100]
+    loop._time = lambda: t[0]
+    try:
+        m = MyObject_timed()
+        loop.iter()
+        loop.iter()
+        print('-')
+
+        # Pending calls are dropped when the component is disposed
+        t[0] += 0.5
+        m.set_foo(1)
+        loop.iter()
+        m.dispose()
+        loop.iter()
+        print(m._disposed)
+        t[0] += 10
+        loop.iter()
+        loop.iter()
+        print('done')
+    finally:
+        del loop._time
+
+
 class MyObject_labeled(event.Component):
 
     @event.reaction('!a')
@@ -507,6 +604,46 @@ def test_reaction_descriptor_has_local_connection_strings():
     assert m.__class__.r1.local_connection_strings == ['!a']
 
 
+def test_reaction_connection_plan_is_shared():
+
+    class Foo(event.Component):
+        a = event.IntProp(settable=True)
+
+        @event.reaction('!a', 'a:meh')
+        def r1(self, *events):
+            pass
+
+    # The plan is compiled when the class is created
+    plan = Foo.r1._connection_plan
+    assert plan == (('!a', ['a'], 'a:r1', True), ('a:meh', ['a'], 'a:meh', False))
+
+    # And it is used by all instances
+    foo1, foo2 = Foo(), Foo()
+    assert foo1.r1 is not foo2.r1
+    assert Foo.r1.get_connection_plan() is plan
+    assert foo1.r1._connections[0].parts is foo2.r1._connections[0].parts
+    assert foo1.r1.get_connection_info() == [('!a', ['a:r1']), ('a:meh', ['a:meh'])]
+
+
+def test_reaction_timed_dispose_releases_component():
+    import gc
+    import weakref
+
+    m = MyObject_timed()
+    loop.iter()
+    m.set_foo(1)
+    loop.iter()
+    assert len(loop._timed_reactions) == 2
+
+    # The pending events (which refer to m) are dropped on dispose
+    m.dispose()
+    assert len(loop._timed_reactions) == 0
+    ref = weakref.ref(m)
+    del m
+    gc.collect()
+    assert ref() is None
+
+
 
 
 ## Meta-ish tests that are similar for property/emitter/action/reaction
@@ -578,6 +578,89 @@ def test_issue_460_and_more():
     loop.iter()
 
 
+class DeepNode(event.Component):
+
+    val = event.IntProp(settable=True)
+    children = event.ListProp(settable=True)
+
+    @event.action
+    def insert_child(self, index, child):
+        self._mutate_children([child], 'insert', index)
+
+    @event.action
+    def remove_child(self, index):
+        self._mutate_children(1, 'remove', index)
+
+
+@run_in_both(DeepNode)
+def test_deep_reconnect_incremental():
+    """
+    11 11
+    [1, 2, 3]
+    17 17
+    [4, 5, 6]
+    13 13
+    [7, 8]
+    """
+    # Reconnecting a deep connector only updates the changed subtree, so
+    # compare with a full reconnect to see that it is done right.
+
+    root = DeepNode()
+    a, b, c = DeepNode(), DeepNode(), DeepNode()
+    root.set_children([a, b])
+    a.set_children([DeepNode(), c])
+    loop.iter()
+
+    res = []
+    def func(*events):
+        for ev in events:
+            res.append(ev.new_value)
+    handler = root.reaction(func, 'children**.val')
+    loop.iter()
+
+    def check():
+        n1 = len(handler.get_connection_info()[0][1])
+        handler.reconnect(0)
+        n2 = len(handler.get_connection_info()[0][1])
+        print(n1, n2)
+
+    # Set
+    d = DeepNode()
+    with loop:
+        b.set_children([d])
+    check()
+    with loop:
+        d.set_val(1)
+        c.set_val(2)
+        b.set_val(3)
+    print(res)
+
+    # Insert
+    e, f = DeepNode(), DeepNode()
+    e.set_children([f])
+    with loop:
+        a.insert_child(1, e)
+    with loop:
+        b.insert_child(0, DeepNode())
+    check()
+    with loop:
+        f.set_val(4)
+        c.set_val(5)
+        d.set_val(6)
+    print(res[3:])
+
+    # Remove (falls back to a full reconnect)
+    with loop:
+        a.remove_child(1)
+    check()
+    with loop:
+        f.set_val(40)  # no longer in the tree
+        c.set_val(7)
+        d.set_val(8)
+    print(res[6:])
+
+
+
 ## Python only
 
 class MyComponent(event.Component):
@@ -179,6 +179,57 @@ def test_reaction_auto2():
     print('end')
 
 
+class MyObject3b(event.Component):
+
+    foo = event.IntProp(settable=True)
+    bar = event.IntProp(7, settable=True)
+    use_bar = event.BoolProp(False, settable=True)
+
+    @event.reaction
+    def report(self, *events):
+        if self.use_bar:
+            print(self.foo, self.bar)
+        else:
+            print(self.foo)
+
+
+@run_in_both(MyObject3b)
+def test_reaction_auto_reconnect_only_when_needed():
+    """
+    0
+    2 true
+    0 7
+    3 false
+    1 7
+    3 true
+    1 8
+    3 true
+    """
+    m = MyObject3b()
+    loop.iter()
+    conns = m.report._implicit_connections
+    print(len(conns), m.report._implicit_connections is conns)
+
+    # Dependencies change: reconnect
+    m.set_use_bar(True)
+    loop.iter()
+    print(len(m.report._implicit_connections),
+          m.report._implicit_connections is conns)
+    conns = m.report._implicit_connections
+
+    # Dependencies are the same: no reconnect
+    m.set_foo(1)
+    loop.iter()
+    print(len(m.report._implicit_connections),
+          m.report._implicit_connections is conns)
+
+    # But they are still connected
+    m.set_bar(8)
+    loop.iter()
+    print(len(m.report._implicit_connections),
+          m.report._implicit_connections is conns)
+
+
 ## One liner
 
 class MyObject4(event.Component):
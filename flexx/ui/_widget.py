@@ -554,11 +554,33 @@ class Widget(app.JsComponent):
         # child ought to be disposed as well. It avoids memory leaks. If a
         # child is not supposed to be disposed, the developer should orphan the
         # child widget.
-        children = self.children
         # First dispose children (so they wont send messages back), then clear
-        # the children and dispose ourselves.
-        for child in children:
+        # the children and dispose ourselves. The local widgets in the subtree
+        # are collected first and disposed in one go, so that reactions
+        # connected to many of these widgets are cleaned up once, and the
+        # DISPOSE commands are combined. Other children (i.e. proxies, which
+        # are not a Widget in JS) are disposed via their dispose() method,
+        # because the other side leads.
+        subtree = []
+        proxies = []
+        todo = list(self.children)
+        while len(todo) > 0:
+            child = todo.pop()
+            if isinstance(child, Widget):
+                subtree.append(child)
+                for grandchild in child.children or ():
+                    todo.append(grandchild)
+            else:
+                proxies.append(child)
+        subtree.reverse()  # descendants before their parents
+        for child in proxies:
             child.dispose()
+        loop._dispose_many(subtree)
+        # Detach the disposed widgets from each-other. There are no reactions
+        # left to notify, so we can skip the actions.
+        for child in subtree:
+            child._parent_value = None
+            child._children_value = ()
         super().dispose()
         self.set_parent(None)
         self._children_value = ()
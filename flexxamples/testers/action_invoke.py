@@ -0,0 +1,66 @@
+"""
+Benchmark the invocation of actions from outside of the event loop.
+
+Invokes 100k actions (as e.g. a handler of incoming messages would),
+each followed by a loop iteration as asyncio would do, and also
+100k calls to ``loop.call_soon()``.
+
+Run with ``python -m flexxamples.testers.action_invoke``.
+"""
+
+import asyncio
+from time import perf_counter
+
+from flexx import event
+
+N_CALLS = 100000
+
+
+class Counter(event.Component):
+
+    count = event.IntProp(0)
+
+    @event.action
+    def increase(self):
+        self._mutate_count(self.count + 1)
+
+
+def benchmark_actions():
+    counter = Counter()
+    aio_loop = asyncio.get_event_loop()
+    aio_loop.run_until_complete(asyncio.sleep(0))
+
+    async def invoke():
+        for i in range(N_CALLS):
+            counter.increase()
+            await asyncio.sleep(0)  # let the loop do its iteration
+
+    t0 = perf_counter()
+    aio_loop.run_until_complete(invoke())
+    t1 = perf_counter()
+    assert counter.count == N_CALLS, counter.count
+    print('invoke %i actions: %0.3f s' % (N_CALLS, t1 - t0))
+
+
+def benchmark_call_soon():
+    aio_loop = asyncio.get_event_loop()
+    calls = []
+
+    async def invoke():
+        for i in range(N_CALLS):
+            event.loop.call_soon(calls.append, i)
+        await asyncio.sleep(0)
+
+    t0 = perf_counter()
+    aio_loop.run_until_complete(invoke())
+    aio_loop.run_until_complete(asyncio.sleep(0))
+    t1 = perf_counter()
+    assert len(calls) == N_CALLS, len(calls)
+    print('call_soon %i times: %0.3f s' % (N_CALLS, t1 - t0))
+
+
+if __name__ == '__main__':
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    event.loop.integrate()
+    benchmark_actions()
+    benchmark_call_soon()
@@ -0,0 +1,52 @@
+"""
+Benchmark the instantiation of components that have reactions.
+
+Creates a tree of 50k items that each have a handful of reactions,
+similar to the items in a TreeWidget.
+
+Run with ``python -m flexxamples.testers.component_init``.
+"""
+
+from time import perf_counter
+
+from flexx import event
+
+N_ITEMS = 50000
+
+
+class Item(event.Component):
+
+    text = event.StringProp('', settable=True)
+    checked = event.BoolProp(False, settable=True)
+    collapsed = event.BoolProp(False, settable=True)
+    children = event.ListProp([], settable=True)
+
+    @event.reaction('text', 'checked')
+    def _update_text(self, *events):
+        pass
+
+    @event.reaction('collapsed:mylabel')
+    def _update_collapsed(self, *events):
+        pass
+
+    @event.reaction('!children*.pointer_click')
+    def _handle_child_click(self, *events):
+        pass
+
+    @event.reaction('!children', '!children*.text')
+    def _handle_child_text(self, *events):
+        pass
+
+
+def benchmark_init():
+    t0 = perf_counter()
+    items = [Item(text='item %i' % i) for i in range(N_ITEMS)]
+    t1 = perf_counter()
+    event.loop.iter()
+    t2 = perf_counter()
+    print('init %i items: %0.3f s, first iter %0.3f s' %
+          (len(items), t1 - t0, t2 - t1))
+
+
+if __name__ == '__main__':
+    benchmark_init()
@@ -0,0 +1,67 @@
+"""
+Benchmark the reconnecting of deep connection strings.
+
+Builds a tree of 10k nodes with a reaction on the root that connects to
+``'children**.foo'``, and then adds and removes nodes at random places.
+
+Run with ``python -m flexxamples.testers.deep_reconnect``.
+"""
+
+import random
+from time import perf_counter
+
+from flexx import event
+
+N_CHILDREN = 100  # per level, for two levels
+N_CHANGES = 200
+
+
+class Node(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+    children = event.TupleProp((), settable=True)
+
+
+class Root(Node):
+
+    count = 0
+
+    @event.reaction('children**.foo')
+    def _on_foo(self, *events):
+        self.count += len(events)
+
+
+def benchmark_reconnect():
+    root = Root()
+    root.set_children([Node() for i in range(N_CHILDREN)])
+    event.loop.iter()
+    for node in root.children:
+        node.set_children([Node() for i in range(N_CHILDREN)])
+    event.loop.iter()
+    nodes = list(root.children)
+
+    rng = random.Random(0)
+    t0 = perf_counter()
+    for i in range(N_CHANGES):
+        node = rng.choice(nodes)
+        node.set_children(node.children + (Node(), ))
+        event.loop.iter()
+    t1 = perf_counter()
+    for i in range(N_CHANGES):
+        node = rng.choice(nodes)
+        node.set_children(node.children[1:])
+        event.loop.iter()
+    t2 = perf_counter()
+
+    # Check that the connections are still right
+    node = rng.choice(nodes).children[-1]
+    node.set_foo(1)
+    event.loop.iter()
+    assert root.count == 1
+
+    print('add %i nodes: %0.3f s, remove %i nodes: %0.3f s' %
+          (N_CHANGES, t1 - t0, N_CHANGES, t2 - t1))
+
+
+if __name__ == '__main__':
+    benchmark_reconnect()
@@ -0,0 +1,70 @@
+"""
+Benchmark the queueing of reaction events in the event loop.
+
+Emits 100k events across 1k components, in two scenarios:
+
+* broadcast: 1k components have a reaction to the same emitter,
+  which emits 100 events.
+* scatter: 1k components each have a reaction to their own emitter,
+  and events are emitted in random order.
+
+Run with ``python -m flexxamples.testers.event_queue``.
+"""
+
+import random
+from time import perf_counter
+
+from flexx import event
+
+N_COMPONENTS = 1000
+N_EVENTS = 100000
+
+
+class Emitter(event.Component):
+
+    @event.emitter
+    def tick(self, i):
+        return dict(i=i)
+
+
+class Listener(event.Component):
+
+    source = event.ComponentProp(None, settable=True)
+    count = 0
+
+    @event.reaction('source.tick')
+    def _on_tick(self, *events):
+        self.count += len(events)
+
+
+def run(name, emitters, listeners, sequence):
+    event.loop.iter()  # process connections
+    t0 = perf_counter()
+    for i, emitter in enumerate(sequence):
+        emitter.tick(i)
+    t1 = perf_counter()
+    event.loop.iter()
+    t2 = perf_counter()
+    count = sum(listener.count for listener in listeners)
+    assert count == N_EVENTS, count
+    print('%s: enqueue %0.3f s, process %0.3f s, %i queue items' %
+          (name, t1 - t0, t2 - t1, count))
+
+
+def benchmark_broadcast():
+    emitter = Emitter()
+    listeners = [Listener(source=emitter) for i in range(N_COMPONENTS)]
+    run('broadcast', [emitter], listeners, [emitter] * (N_EVENTS // N_COMPONENTS))
+
+
+def benchmark_scatter():
+    emitters = [Emitter() for i in range(N_COMPONENTS)]
+    listeners = [Listener(source=e) for e in emitters]
+    sequence = emitters * (N_EVENTS // N_COMPONENTS)
+    random.Random(0).shuffle(sequence)
+    run('scatter', emitters, listeners, sequence)
+
+
+if __name__ == '__main__':
+    benchmark_broadcast()
+    benchmark_scatter()
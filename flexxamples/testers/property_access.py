@@ -0,0 +1,61 @@
+"""
+Benchmark reading and mutating properties.
+
+Reads a property 1M times (outside of and inside of a reaction), and
+mutates a property 200k times.
+
+Run with ``python -m flexxamples.testers.property_access``.
+"""
+
+from time import perf_counter
+
+from flexx import event
+
+N_READS = 1000000
+N_WRITES = 200000
+
+
+class Item(event.Component):
+
+    foo = event.IntProp(0, settable=True)
+    bar = event.StringProp('', settable=True)
+
+    @event.action
+    def increase_foo(self, n):
+        for i in range(n):
+            self._mutate_foo(self.foo + 1)
+
+    @event.reaction('!read_in_reaction')
+    def _read_in_reaction(self, *events):
+        for i in range(N_READS):
+            self.foo
+
+
+def benchmark_read():
+    item = Item()
+    event.loop.iter()
+    t0 = perf_counter()
+    for i in range(N_READS):
+        item.foo
+    t1 = perf_counter()
+    item.emit('read_in_reaction', {})
+    event.loop.iter()
+    t2 = perf_counter()
+    print('read %i times: %0.3f s, in reaction: %0.3f s' %
+          (N_READS, t1 - t0, t2 - t1))
+
+
+def benchmark_write():
+    item = Item()
+    event.loop.iter()
+    t0 = perf_counter()
+    item.increase_foo(N_WRITES)
+    event.loop.iter()
+    t1 = perf_counter()
+    assert item.foo == N_WRITES
+    print('mutate %i times: %0.3f s' % (N_WRITES, t1 - t0))
+
+
+if __name__ == '__main__':
+    benchmark_read()
+    benchmark_write()